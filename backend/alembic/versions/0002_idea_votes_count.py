@@ -0,0 +1,38 @@
+"""denormalized votes_count on ideas
+
+Revision ID: 0002_idea_votes_count
+Revises: c7d6dedd526d
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002_idea_votes_count"
+down_revision = "c7d6dedd526d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("ideas", sa.Column("votes_count", sa.Integer(), nullable=False, server_default="0"))
+    # Backfill from the votes table; the application keeps it in sync from here on.
+    op.execute(
+        "UPDATE ideas SET votes_count = (SELECT COUNT(votes.id) FROM votes WHERE votes.idea_id = ideas.id)"
+    )
+    op.create_index(
+        "ix_ideas_votes_count",
+        "ideas",
+        [sa.text("votes_count DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ideas_votes_count", table_name="ideas")
+    with op.batch_alter_table("ideas") as batch_op:
+        batch_op.drop_column("votes_count")
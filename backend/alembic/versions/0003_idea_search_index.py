@@ -0,0 +1,61 @@
+"""full-text search index on ideas
+
+Revision ID: 0003_idea_search_index
+Revises: 0002_idea_votes_count
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0003_idea_search_index"
+down_revision = "0002_idea_votes_count"
+branch_labels = None
+depends_on = None
+
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS ideas_fts USING fts5("
+    "title, description, content='ideas', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS ideas_fts_ai AFTER INSERT ON ideas BEGIN "
+    "INSERT INTO ideas_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS ideas_fts_ad AFTER DELETE ON ideas BEGIN "
+    "INSERT INTO ideas_fts(ideas_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS ideas_fts_au AFTER UPDATE OF title, description ON ideas BEGIN "
+    "INSERT INTO ideas_fts(ideas_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO ideas_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    # index every existing row
+    "INSERT INTO ideas_fts(ideas_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS ideas_fts_au",
+    "DROP TRIGGER IF EXISTS ideas_fts_ad",
+    "DROP TRIGGER IF EXISTS ideas_fts_ai",
+    "DROP TABLE IF EXISTS ideas_fts",
+]
+
+PG_UPGRADE = [
+    "CREATE INDEX IF NOT EXISTS ix_ideas_search ON ideas USING gin ("
+    "to_tsvector('english'::regconfig, coalesce(ideas.title, '') || ' ' || coalesce(ideas.description, '')))",
+]
+
+PG_DOWNGRADE = ["DROP INDEX IF EXISTS ix_ideas_search"]
+
+
+def _run(statements: dict[str, list[str]]) -> None:
+    for stmt in statements.get(op.get_bind().dialect.name, []):
+        op.execute(stmt)
+
+
+def upgrade() -> None:
+    _run({"sqlite": SQLITE_UPGRADE, "postgresql": PG_UPGRADE})
+
+
+def downgrade() -> None:
+    _run({"sqlite": SQLITE_DOWNGRADE, "postgresql": PG_DOWNGRADE})
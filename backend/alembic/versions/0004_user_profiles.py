@@ -0,0 +1,60 @@
+"""user profiles on the main database, unique on user_id
+
+Revision ID: 0004_user_profiles
+Revises: 0003_idea_search_index
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004_user_profiles"
+down_revision = "0003_idea_search_index"
+branch_labels = None
+depends_on = None
+
+
+# Repeated profiles found in a pre-existing user_entries table are moved here rather than
+# deleted. The table's presence also tells downgrade() that user_entries predates 0004.
+ARCHIVE = "user_entries_duplicates_0004"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("user_entries"):
+        op.create_table(
+            "user_entries",
+            sa.Column("entry_id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.String(length=120), nullable=False),
+            sa.Column("first_name", sa.String(length=120), nullable=False),
+            sa.Column("last_name", sa.String(length=120), nullable=False),
+            sa.Column("phone_number", sa.String(length=20), nullable=True),
+            sa.Column("email", sa.String(length=120), nullable=True),
+            sa.Column("bio", sa.Text(), nullable=True),
+            sa.Column("age", sa.Integer(), nullable=False),
+            sa.Column("vibe", sa.String(length=120), nullable=True),
+            sa.PrimaryKeyConstraint("entry_id"),
+        )
+        op.create_index(op.f("ix_user_entries_entry_id"), "user_entries", ["entry_id"], unique=False)
+    else:
+        # a table created outside migrations may hold repeated profiles; keep the newest one
+        # per user_id and archive the others so that downgrade() can put them back
+        older = "entry_id NOT IN (SELECT max(entry_id) FROM user_entries GROUP BY user_id)"
+        op.execute(f"CREATE TABLE {ARCHIVE} AS SELECT * FROM user_entries WHERE {older}")
+        op.execute(f"DELETE FROM user_entries WHERE {older}")
+    op.create_index("ux_user_entries_user_id", "user_entries", ["user_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ux_user_entries_user_id", table_name="user_entries")
+    if sa.inspect(op.get_bind()).has_table(ARCHIVE):
+        # user_entries existed before 0004: restore the archived duplicates and keep the table
+        op.execute(f"INSERT INTO user_entries SELECT * FROM {ARCHIVE}")
+        op.drop_table(ARCHIVE)
+        return
+    op.drop_index(op.f("ix_user_entries_entry_id"), table_name="user_entries")
+    op.drop_table("user_entries")
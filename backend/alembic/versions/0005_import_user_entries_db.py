@@ -0,0 +1,104 @@
+"""move profiles from the legacy user_entries.db into the main database
+
+Revision ID: 0005_import_user_entries_db
+Revises: 0004_user_profiles
+Create Date: 2026-10-18
+
+Profiles used to live in a separate SQLite file written after the account commit, so a
+failed second write left accounts without a profile. This copies the legacy rows whose
+user_id matches an account (newest row per user_id, soft-deleted rows skipped), drops the
+orphans, and gives every account still lacking a profile the stock one.
+
+The legacy file defaults to app/DBS/user_entries.db; override it with
+``alembic -x user_entries_db=/path/to/user_entries.db upgrade head``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005_import_user_entries_db"
+down_revision = "0004_user_profiles"
+branch_labels = None
+depends_on = None
+
+
+DEFAULT_LEGACY_DB = Path(__file__).resolve().parents[2] / "app" / "DBS" / "user_entries.db"
+
+# Matches the createUser defaults used by signup.
+STOCK_PROFILE = {
+    "first_name": "First",
+    "last_name": "Last",
+    "phone_number": "0000000000",
+    "email": "stock@crowd.com",
+    "bio": "A crowd User",
+    "age": -1,
+    "vibe": "Stock",
+}
+
+user_entries = sa.table(
+    "user_entries",
+    sa.column("user_id", sa.String),
+    sa.column("first_name", sa.String),
+    sa.column("last_name", sa.String),
+    sa.column("phone_number", sa.String),
+    sa.column("email", sa.String),
+    sa.column("bio", sa.Text),
+    sa.column("age", sa.Integer),
+    sa.column("vibe", sa.String),
+)
+
+
+def _legacy_rows(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(user_entries)")}
+        if not columns:
+            return []
+        live = "WHERE deleted = 0" if "deleted" in columns else ""
+        rows = conn.execute(
+            f"SELECT * FROM user_entries WHERE entry_id IN "
+            f"(SELECT max(entry_id) FROM user_entries {live} GROUP BY user_id)"
+        ).fetchall()
+    finally:
+        conn.close()
+    fields = [name for name in STOCK_PROFILE if name != "age"]
+    return [
+        {
+            "user_id": row["user_id"],
+            **{name: row[name] if row[name] is not None else STOCK_PROFILE[name] for name in fields if name in columns},
+            "age": row["age"] if "age" in columns and row["age"] is not None else STOCK_PROFILE["age"],
+        }
+        for row in rows
+    ]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    account_ids = {str(i) for i in bind.execute(sa.text("SELECT id FROM users")).scalars()}
+    have_profile = set(bind.execute(sa.text("SELECT user_id FROM user_entries")).scalars())
+
+    path = Path(context.get_x_argument(as_dictionary=True).get("user_entries_db", DEFAULT_LEGACY_DB))
+    imported = [
+        {**STOCK_PROFILE, **row}
+        for row in _legacy_rows(path)
+        if row["user_id"] in account_ids and row["user_id"] not in have_profile
+    ]
+    have_profile |= {row["user_id"] for row in imported}
+    missing = [{"user_id": user_id, **STOCK_PROFILE} for user_id in sorted(account_ids - have_profile)]
+    if imported or missing:
+        op.bulk_insert(user_entries, imported + missing)
+
+
+def downgrade() -> None:
+    # data-only migration; the legacy file is left untouched by upgrade, so nothing to undo
+    pass
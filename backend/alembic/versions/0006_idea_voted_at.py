@@ -0,0 +1,27 @@
+"""ideas.voted_at for conditional GETs
+
+Revision ID: 0006_idea_voted_at
+Revises: 0005_import_user_entries_db
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006_idea_voted_at"
+down_revision = "0005_import_user_entries_db"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("ideas", sa.Column("voted_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("ideas") as batch_op:
+        batch_op.drop_column("voted_at")
@@ -0,0 +1,54 @@
+"""hourly vote rollups for sort=trending
+
+Revision ID: 0007_vote_rollups
+Revises: 0006_idea_voted_at
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007_vote_rollups"
+down_revision = "0006_idea_voted_at"
+branch_labels = None
+depends_on = None
+
+# Trending only looks back a couple of days; older history can be rolled up later with
+# `python -m app.scripts.rollup_votes --rebuild-hours N`.
+BACKFILL_HOURS = 30 * 24
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vote_rollups",
+        sa.Column("idea_id", sa.Integer(), sa.ForeignKey("ideas.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("hour", sa.Integer(), primary_key=True),
+        sa.Column("votes", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_vote_rollups_hour", "vote_rollups", ["hour", "idea_id", "votes"], unique=False)
+
+    since_hour = int(time.time() // 3600) - BACKFILL_HOURS
+    since = datetime.fromtimestamp(since_hour * 3600, timezone.utc).replace(tzinfo=None)
+    if op.get_bind().dialect.name == "postgresql":
+        hour = "CAST(EXTRACT(EPOCH FROM created_at) AS BIGINT) / 3600"
+    else:
+        hour = "CAST(strftime('%s', created_at) AS INTEGER) / 3600"
+    op.get_bind().execute(
+        sa.text(
+            f"INSERT INTO vote_rollups (idea_id, hour, votes) "
+            f"SELECT idea_id, {hour}, COUNT(id) FROM votes WHERE created_at >= :since GROUP BY idea_id, {hour}"
+        ),
+        {"since": since},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vote_rollups_hour", table_name="vote_rollups")
+    op.drop_table("vote_rollups")
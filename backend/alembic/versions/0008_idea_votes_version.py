@@ -0,0 +1,27 @@
+"""ideas.votes_version to order leaderboard vote snapshots
+
+Revision ID: 0008_idea_votes_version
+Revises: 0007_vote_rollups
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0008_idea_votes_version"
+down_revision = "0007_vote_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("ideas", sa.Column("votes_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("ideas") as batch_op:
+        batch_op.drop_column("votes_version")
@@ -1,94 +1,60 @@
 from __future__ import annotations
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 
-from ...core.db import get_db
-from ...schemas import IdeaCreate, IdeaUpdate, IdeaRead, PaginatedIdeas, VoteCreate, VoteCount
-from ...services.ideas import (
-    IdeaAlreadyExistsError,
-    IdeaNotFoundError,
-    DuplicateVoteError,
-    IdeaService,
-)
-from ...models.crowdDBModels import DBTableUser
+from ...core.db import get_read_db, get_write_db
 from ...models.CrowdAPIModels import createUser
 from ...models.Responsemodels import UserRead
-from fastapi import FastAPI, HTTPException
-from fastapi import APIRouter, Depends, Query
-# Create FastAPI instance
+from ...repositories.users import UserProfileRepository
+from ...schemas import UserBatchResponse
+from .params import batch_ids
+
 
 router = APIRouter()
-alchemyengineUsers = create_engine("sqlite:///./app/DBS/user_entries.db")
+
+
+def _profile_fields(user: createUser) -> dict:
+    return user.model_dump(exclude={"user_id"})
+
 
 @router.post("/userCreate")
-def create_user(user: createUser):
-    userObject = DBTableUser(
-        user_id=user.user_id,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        phone_number=user.phone_number,
-        email=user.email,
-        bio=user.bio,
-        age=user.age,
-        vibe=user.vibe
-    )
+def create_user(user: createUser, db: Session = Depends(get_write_db)):
+    repo = UserProfileRepository(db)
     try:
-        Session = sessionmaker(bind=alchemyengineUsers)
-        session = Session()
-        session.add(userObject)
-        session.commit() 
-        session.close()
-        return {"message": "User created successfully"}
-    except Exception as e:
-        # Log the error for debugging
-        print(f"Error creating user: {str(e)}")
-        raise HTTPException(status_code=400, detail=f"Error creating user: {str(e)}")
+        repo.create(user.user_id, **_profile_fields(user))
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Error creating user: profile already exists")
+    return {"message": "User created successfully"}
 
-@router.put("/user/modify/{user_id}")
-def modify_user(user_id: str, user: createUser):
-    try:
-        print(user_id)
-        print(user)
-        session = sessionmaker(bind=alchemyengineUsers)()
-        existing_user = session.query(DBTableUser).filter(DBTableUser.user_id == user_id).first()
-        if not existing_user:
-            session.close()
-            return {"message": "User not found"}
 
-        existing_user.first_name = user.first_name
-        existing_user.last_name = user.last_name
-        existing_user.phone_number = user.phone_number
-        existing_user.email = user.email
-        existing_user.bio = user.bio
-        existing_user.age = user.age
-        existing_user.vibe = user.vibe
+@router.put("/user/modify/{user_id}")
+def modify_user(user_id: str, user: createUser, db: Session = Depends(get_write_db)):
+    repo = UserProfileRepository(db)
+    existing_user = repo.get_by_user_id(user_id)
+    if not existing_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    repo.update(existing_user, **_profile_fields(user))
+    db.commit()
+    return {"message": "User updated successfully"}
+
+
+@router.get("/users:batch", response_model=UserBatchResponse)
+def get_users_batch(user_ids: list[str] = Depends(batch_ids), db: Session = Depends(get_read_db)):
+    found = {p.user_id: p for p in UserProfileRepository(db).get_many(user_ids)}
+    profiles = [found.get(user_id) for user_id in user_ids]
+    return {
+        "items": [UserRead.model_validate(p, from_attributes=True) if p is not None else None for p in profiles],
+        "missing": [user_id for user_id, p in zip(user_ids, profiles) if p is None],
+    }
 
-        session.commit()
-        session.close()
-        return {"message": "User updated successfully"}
-    except Exception as e:
-        return {"message": "Error updating user", "error": str(e)}
 
 @router.get("/user/{user_id}", response_model=UserRead)
-def get_user(user_id: str):
-    print(f"Fetching user with ID: {user_id}")
-    try:
-        session = sessionmaker(bind=alchemyengineUsers)()
-        user = session.query(DBTableUser).filter(DBTableUser.user_id == user_id).first()
-        session.close()
-        if user:
-            return {
-                "user_id": user.user_id,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-                "phone_number": user.phone_number,
-                "email": user.email,
-                "bio": user.bio,
-                "age": user.age,
-                "vibe": user.vibe
-            }
-        else:
-            return {"message": "User not found"}
-    except Exception as e:
-        return {"message": "Error getting user", "error": str(e)}
+def get_user(user_id: str, db: Session = Depends(get_read_db)):
+    user = UserProfileRepository(db).get_by_user_id(user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return UserRead.model_validate(user, from_attributes=True)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+from ...services.versions import collection_version
+
+
+def idea_validators(idea) -> tuple[str, datetime]:
+    """Strong ETag and Last-Modified for one idea, from the ORM row or its cached snapshot.
+
+    The tag covers every field of the representation: edits move updated_at and votes move
+    votes_count / voted_at, which stand in for a per-idea vote version.
+    """
+    voted_at = idea.voted_at.isoformat() if idea.voted_at else ""
+    raw = f"{idea.id}|{idea.updated_at.isoformat()}|{idea.votes_count}|{voted_at}"
+    etag = '"' + hashlib.blake2b(raw.encode(), digest_size=10).hexdigest() + '"'
+    return etag, max(d for d in (idea.updated_at, idea.voted_at) if d is not None).replace(tzinfo=timezone.utc)
+
+
+def collection_validators(request: Request) -> tuple[str, datetime]:
+    """ETag and Last-Modified for a list/top page: the collection version plus the query."""
+    token, changed_at = collection_version.current()
+    raw = f"{token}|{request.url.path}|{request.url.query}"
+    return '"c-' + hashlib.blake2b(raw.encode(), digest_size=10).hexdigest() + '"', changed_at
+
+
+def _if_modified_since(request: Request) -> Optional[datetime]:
+    value = request.headers.get("if-modified-since")
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """RFC 9110 evaluation: If-None-Match wins; If-Modified-Since only when it is absent."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        # weak comparison, so W/ tags from caches that recompress still match
+        return "*" in tags or any(t.removeprefix("W/") == etag for t in tags)
+    since = _if_modified_since(request)
+    # HTTP dates have whole-second precision
+    return since is not None and last_modified.replace(microsecond=0) <= since
+
+
+def validator_headers(etag: str, last_modified: datetime) -> dict[str, str]:
+    return {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified.astimezone(timezone.utc), usegmt=True),
+        # let browsers and the proxy store the body, but revalidate before each reuse
+        "Cache-Control": "no-cache",
+    }
+
+
+def conditional(
+    request: Request, response: Response, etag: str, last_modified: datetime, *, tag: bool = True
+) -> Optional[Response]:
+    """Returns a 304 to send as-is, or None after putting the validators on ``response``.
+
+    With ``tag=False`` the body about to be built may not match the validators (a lagging
+    replica read), so they are left off it; a client holding them still gets its 304.
+    """
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    if tag:
+        response.headers.update(headers)
+    return None
@@ -1,5 +1,10 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response, status
+from starlette.concurrency import run_in_threadpool
+
+from ...core import db as db_module
+from ...core import readiness
 from ...core.settings import get_settings
+from ...services.cache import response_cache
 
 router = APIRouter()
 
@@ -9,3 +14,22 @@ def health() -> dict[str, str]:
     s = get_settings()
     return {"status": "ok", "app": s.APP_NAME}
 
+
+@router.get("/health/ready")
+async def ready(response: Response) -> dict:
+    """Probe query and write-lock timings plus pool usage; 503 when over a READY_MAX_* threshold."""
+    s = get_settings()
+    if s.DB_MODE == "async":
+        db_module.get_async_sessionmaker()  # builds the async engine on first use
+        ok, report = await readiness.check_async(db_module.async_engine, s)
+    else:
+        ok, report = await run_in_threadpool(readiness.check, db_module.engine, s)
+    if not ok:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return report
+
+
+@router.get("/health/cache")
+def cache_stats() -> dict[str, int]:
+    """Size and hit/miss/eviction counters of this worker's response cache."""
+    return response_cache.stats()
@@ -1,39 +1,128 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional, Sequence
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
-from ...core.db import get_db
-from ...schemas import IdeaCreate, IdeaUpdate, IdeaRead, PaginatedIdeas, VoteCreate, VoteCount
+from ...core.db import get_read_db, get_write_db
+from ...core.query_budget import query_budget
+from ...repositories.pagination import InvalidCursorError
+from ...schemas import (
+    IdeaCreate,
+    IdeaUpdate,
+    IdeaRead,
+    IdeaBatchResponse,
+    PaginatedIdeas,
+    PaginatedIdeaFields,
+    IdeaFields,
+    VoteBatchCreate,
+    VoteBatchResponse,
+    VoteCreate,
+    VoteCount,
+)
+from .conditional import collection_validators, conditional, idea_validators
+from .params import batch_int_ids, idea_fields
+from .serialization import IDEA_FIELDS, idea_dict, json_response
 from ...services.ideas import (
     IdeaAlreadyExistsError,
     IdeaNotFoundError,
     DuplicateVoteError,
     IdeaService,
+    VoteNotFoundError,
 )
+from ...services.versions import may_lag
 
 
 router = APIRouter(prefix="/ideas", tags=["ideas"])
 
 
-@router.get("", response_model=PaginatedIdeas)
+# Response builders shared with the async router in ideas_async.py. The read builders
+# produce plain dicts for json_response; see serialization.py.
+def list_response(
+    items, total, estimated: bool, *, page: int, size: int, next_cursor, fields: Sequence[str] = IDEA_FIELDS
+) -> dict:
+    return {
+        "items": [idea_dict(i, fields) for i in items],
+        "total": total,
+        "total_is_estimate": estimated,
+        "page": page,
+        "size": size,
+        "next_cursor": next_cursor,
+    }
+
+
+def batch_response(ids: list[int], ideas) -> dict:
+    return {
+        "items": [idea_dict(i) if i is not None else None for i in ideas],
+        "missing": [idea_id for idea_id, idea in zip(ids, ideas) if idea is None],
+    }
+
+
+def vote_batch_response(payload: VoteBatchCreate, statuses: list[str]) -> dict:
+    results = [
+        {"idea_id": v.idea_id, "voter": v.voter, "status": status} for v, status in zip(payload.votes, statuses)
+    ]
+    return {
+        "results": results,
+        "created": statuses.count("created"),
+        "duplicate": statuses.count("duplicate"),
+        "not_found": statuses.count("not_found"),
+    }
+
+
+@router.get("", response_model=PaginatedIdeas | PaginatedIdeaFields)
+# page + total, or for sort=trending past the scored ideas: total, scored page, scored
+# count and unscored page (IdeaRepository._trending_page)
+@query_budget(4)
 def list_ideas(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
     q: str | None = None,
-    sort: str = Query("created_at", pattern="^(created_at|votes)$"),
+    sort: str = Query("created_at", pattern="^(created_at|votes|relevance|trending)$"),
     order: str = Query("desc", pattern="^(asc|desc)$"),
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(None, description="next_cursor from a previous page; takes precedence over page"),
+    include_total: bool = Query(True, description="set false to skip counting matches"),
+    total_mode: str = Query("exact", pattern="^(exact|estimated)$"),
+    fields: Optional[tuple[str, ...]] = Depends(idea_fields),
+    db: Session = Depends(get_read_db),
 ):
+    not_modified = conditional(request, response, *collection_validators(request), tag=not may_lag(db))
+    if not_modified:
+        return not_modified
+    service = IdeaService(db)
+    try:
+        items, total, next_cursor, estimated = service.list_ideas(
+            page=page,
+            size=size,
+            q=q,
+            sort=sort,
+            order=order,
+            cursor=cursor,
+            total_mode=total_mode if include_total else "none",
+            fields=fields,
+        )
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    body = list_response(
+        items, total, estimated, page=page, size=size, next_cursor=next_cursor, fields=fields or IDEA_FIELDS
+    )
+    return json_response(body, response)
+
+
+# GET /ideas:batch?ids=1,2,3 (the path is "/ideas" + ":batch")
+@router.get(":batch", response_model=IdeaBatchResponse)
+@query_budget(1)
+def get_ideas_batch(response: Response, ids: list[int] = Depends(batch_int_ids), db: Session = Depends(get_read_db)):
     service = IdeaService(db)
-    items, total = service.list_ideas(page=page, size=size, q=q, sort=sort, order=order)
-    # Map to schema, include attached votes_count
-    data = [IdeaRead.model_validate(i) for i in items]
-    return {"items": data, "total": total, "page": page, "size": size}
+    return json_response(batch_response(ids, service.get_ideas(ids)), response)
 
 
 @router.post("", response_model=IdeaRead, status_code=status.HTTP_201_CREATED)
-def create_idea(payload: IdeaCreate, db: Session = Depends(get_db)):
+@query_budget(3)
+def create_idea(payload: IdeaCreate, db: Session = Depends(get_write_db)):
     service = IdeaService(db)
     try:
         idea = service.create_idea(title=payload.title, description=payload.description)
@@ -42,18 +131,58 @@ def create_idea(payload: IdeaCreate, db: Session = Depends(get_db)):
     return IdeaRead.model_validate(idea)
 
 
+# budgeted per chunk, in IdeaService.vote_batch
+@router.post("/votes:batch", response_model=VoteBatchResponse)
+def vote_batch(payload: VoteBatchCreate, db: Session = Depends(get_write_db)):
+    service = IdeaService(db)
+    statuses = service.vote_batch([(v.idea_id, v.voter) for v in payload.votes])
+    return vote_batch_response(payload, statuses)
+
+
+# Declared before "/{idea_id}" so that "top" is not parsed as an idea id.
+@router.get("/top", response_model=list[IdeaRead] | list[IdeaFields])
+@query_budget(2)
+def top(
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1),
+    size: int = Query(10, ge=1, le=100),
+    cursor: str | None = Query(None, description="X-Next-Cursor from a previous page; takes precedence over page"),
+    fields: Optional[tuple[str, ...]] = Depends(idea_fields),
+    db: Session = Depends(get_read_db),
+):
+    not_modified = conditional(request, response, *collection_validators(request), tag=not may_lag(db))
+    if not_modified:
+        return not_modified
+    service = IdeaService(db)
+    try:
+        items, next_cursor = service.top_ideas(page=page, size=size, cursor=cursor, fields=fields)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # the body is a bare list, so the next cursor travels in a header
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return json_response([idea_dict(i, fields or IDEA_FIELDS) for i in items], response)
+
+
 @router.get("/{idea_id}", response_model=IdeaRead)
-def get_idea(idea_id: int, db: Session = Depends(get_db)):
+@query_budget(1)
+def get_idea(idea_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)):
     service = IdeaService(db)
     try:
         idea = service.get_idea(idea_id)
     except IdeaNotFoundError:
         raise HTTPException(status_code=404, detail="Not found")
-    return IdeaRead.model_validate(idea)
+    # compared on the ORM row, before any IdeaRead is built
+    not_modified = conditional(request, response, *idea_validators(idea))
+    if not_modified:
+        return not_modified
+    return json_response(idea_dict(idea), response)
 
 
 @router.put("/{idea_id}", response_model=IdeaRead)
-def update_idea(idea_id: int, payload: IdeaUpdate, db: Session = Depends(get_db)):
+@query_budget(4)
+def update_idea(idea_id: int, payload: IdeaUpdate, db: Session = Depends(get_write_db)):
     service = IdeaService(db)
     try:
         idea = service.update_idea(idea_id, title=payload.title, description=payload.description)
@@ -65,7 +194,8 @@ def update_idea(idea_id: int, payload: IdeaUpdate, db: Session = Depends(get_db)
 
 
 @router.delete("/{idea_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_idea(idea_id: int, db: Session = Depends(get_db)):
+@query_budget(4)
+def delete_idea(idea_id: int, db: Session = Depends(get_write_db)):
     service = IdeaService(db)
     try:
         service.delete_idea(idea_id)
@@ -75,7 +205,8 @@ def delete_idea(idea_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/{idea_id}/vote", status_code=status.HTTP_204_NO_CONTENT)
-def vote(idea_id: int, payload: VoteCreate, db: Session = Depends(get_db)):
+@query_budget(5)
+def vote(idea_id: int, payload: VoteCreate, db: Session = Depends(get_write_db)):
     service = IdeaService(db)
     try:
         service.vote(idea_id, voter=payload.voter)
@@ -86,19 +217,27 @@ def vote(idea_id: int, payload: VoteCreate, db: Session = Depends(get_db)):
     return None
 
 
+@router.delete("/{idea_id}/vote", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(4)
+def remove_vote(
+    idea_id: int,
+    voter: str = Query(..., min_length=1, max_length=120),
+    db: Session = Depends(get_write_db),
+):
+    service = IdeaService(db)
+    try:
+        service.remove_vote(idea_id, voter=voter)
+    except (IdeaNotFoundError, VoteNotFoundError):
+        raise HTTPException(status_code=404, detail="Not found")
+    return None
+
+
 @router.get("/{idea_id}/votes_count", response_model=VoteCount)
-def votes_count(idea_id: int, db: Session = Depends(get_db)):
+@query_budget(1)
+def votes_count(idea_id: int, db: Session = Depends(get_read_db)):
     service = IdeaService(db)
     try:
         count = service.votes_count(idea_id)
     except IdeaNotFoundError:
         raise HTTPException(status_code=404, detail="Not found")
     return {"idea_id": idea_id, "votes_count": count}
-
-
-@router.get("/top", response_model=list[IdeaRead])
-def top(page: int = Query(1, ge=1), size: int = Query(10, ge=1, le=100), db: Session = Depends(get_db)):
-    service = IdeaService(db)
-    items = service.top_ideas(page=page, size=size)
-    return [IdeaRead.model_validate(i) for i in items]
-
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.db import get_async_read_db, get_async_write_db
+from ...core.query_budget import query_budget
+from ...repositories.pagination import InvalidCursorError
+from ...schemas import (
+    IdeaCreate,
+    IdeaUpdate,
+    IdeaRead,
+    IdeaBatchResponse,
+    PaginatedIdeas,
+    PaginatedIdeaFields,
+    IdeaFields,
+    VoteBatchCreate,
+    VoteBatchResponse,
+    VoteCreate,
+    VoteCount,
+)
+from ...services.ideas import (
+    IdeaAlreadyExistsError,
+    IdeaNotFoundError,
+    DuplicateVoteError,
+    VoteNotFoundError,
+)
+from ...services.ideas_async import AsyncIdeaService
+from ...services.versions import may_lag
+from .ideas import batch_response, list_response, vote_batch_response
+from .conditional import collection_validators, conditional, idea_validators
+from .params import batch_int_ids, idea_fields
+from .serialization import IDEA_FIELDS, idea_dict, json_response
+
+
+# Same paths and contracts as ideas.py; mounted instead of it when DB_MODE=async.
+router = APIRouter(prefix="/ideas", tags=["ideas"])
+
+
+@router.get("", response_model=PaginatedIdeas | PaginatedIdeaFields)
+# page + total, or for sort=trending past the scored ideas: total, scored page, scored
+# count and unscored page (IdeaRepository._trending_page)
+@query_budget(4)
+async def list_ideas(
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1),
+    size: int = Query(10, ge=1, le=100),
+    q: str | None = None,
+    sort: str = Query("created_at", pattern="^(created_at|votes|relevance|trending)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: str | None = Query(None, description="next_cursor from a previous page; takes precedence over page"),
+    include_total: bool = Query(True, description="set false to skip counting matches"),
+    total_mode: str = Query("exact", pattern="^(exact|estimated)$"),
+    fields: Optional[tuple[str, ...]] = Depends(idea_fields),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    not_modified = conditional(request, response, *collection_validators(request), tag=not may_lag(db))
+    if not_modified:
+        return not_modified
+    service = AsyncIdeaService(db)
+    try:
+        items, total, next_cursor, estimated = await service.list_ideas(
+            page=page,
+            size=size,
+            q=q,
+            sort=sort,
+            order=order,
+            cursor=cursor,
+            total_mode=total_mode if include_total else "none",
+            fields=fields,
+        )
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    body = list_response(
+        items, total, estimated, page=page, size=size, next_cursor=next_cursor, fields=fields or IDEA_FIELDS
+    )
+    return json_response(body, response)
+
+
+@router.get(":batch", response_model=IdeaBatchResponse)
+@query_budget(1)
+async def get_ideas_batch(
+    response: Response, ids: list[int] = Depends(batch_int_ids), db: AsyncSession = Depends(get_async_read_db)
+):
+    service = AsyncIdeaService(db)
+    return json_response(batch_response(ids, await service.get_ideas(ids)), response)
+
+
+@router.post("", response_model=IdeaRead, status_code=status.HTTP_201_CREATED)
+@query_budget(3)
+async def create_idea(payload: IdeaCreate, db: AsyncSession = Depends(get_async_write_db)):
+    service = AsyncIdeaService(db)
+    try:
+        idea = await service.create_idea(title=payload.title, description=payload.description)
+    except IdeaAlreadyExistsError:
+        raise HTTPException(status_code=409, detail="Idea with this title already exists")
+    return IdeaRead.model_validate(idea)
+
+
+# budgeted per chunk, in IdeaService.vote_batch
+@router.post("/votes:batch", response_model=VoteBatchResponse)
+async def vote_batch(payload: VoteBatchCreate, db: AsyncSession = Depends(get_async_write_db)):
+    service = AsyncIdeaService(db)
+    statuses = await service.vote_batch([(v.idea_id, v.voter) for v in payload.votes])
+    return vote_batch_response(payload, statuses)
+
+
+@router.get("/top", response_model=list[IdeaRead] | list[IdeaFields])
+@query_budget(2)
+async def top(
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1),
+    size: int = Query(10, ge=1, le=100),
+    cursor: str | None = Query(None, description="X-Next-Cursor from a previous page; takes precedence over page"),
+    fields: Optional[tuple[str, ...]] = Depends(idea_fields),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    not_modified = conditional(request, response, *collection_validators(request), tag=not may_lag(db))
+    if not_modified:
+        return not_modified
+    service = AsyncIdeaService(db)
+    try:
+        items, next_cursor = await service.top_ideas(page=page, size=size, cursor=cursor, fields=fields)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return json_response([idea_dict(i, fields or IDEA_FIELDS) for i in items], response)
+
+
+@router.get("/{idea_id}", response_model=IdeaRead)
+@query_budget(1)
+async def get_idea(idea_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_read_db)):
+    service = AsyncIdeaService(db)
+    try:
+        idea = await service.get_idea(idea_id)
+    except IdeaNotFoundError:
+        raise HTTPException(status_code=404, detail="Not found")
+    # compared on the ORM row, before any IdeaRead is built
+    not_modified = conditional(request, response, *idea_validators(idea))
+    if not_modified:
+        return not_modified
+    return json_response(idea_dict(idea), response)
+
+
+@router.put("/{idea_id}", response_model=IdeaRead)
+@query_budget(4)
+async def update_idea(idea_id: int, payload: IdeaUpdate, db: AsyncSession = Depends(get_async_write_db)):
+    service = AsyncIdeaService(db)
+    try:
+        idea = await service.update_idea(idea_id, title=payload.title, description=payload.description)
+    except IdeaNotFoundError:
+        raise HTTPException(status_code=404, detail="Not found")
+    except IdeaAlreadyExistsError:
+        raise HTTPException(status_code=409, detail="Idea with this title already exists")
+    return IdeaRead.model_validate(idea)
+
+
+@router.delete("/{idea_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(4)
+async def delete_idea(idea_id: int, db: AsyncSession = Depends(get_async_write_db)):
+    service = AsyncIdeaService(db)
+    try:
+        await service.delete_idea(idea_id)
+    except IdeaNotFoundError:
+        raise HTTPException(status_code=404, detail="Not found")
+    return None
+
+
+@router.post("/{idea_id}/vote", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(5)
+async def vote(idea_id: int, payload: VoteCreate, db: AsyncSession = Depends(get_async_write_db)):
+    service = AsyncIdeaService(db)
+    try:
+        await service.vote(idea_id, voter=payload.voter)
+    except IdeaNotFoundError:
+        raise HTTPException(status_code=404, detail="Not found")
+    except DuplicateVoteError:
+        raise HTTPException(status_code=409, detail="Duplicate vote")
+    return None
+
+
+@router.delete("/{idea_id}/vote", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(4)
+async def remove_vote(
+    idea_id: int,
+    voter: str = Query(..., min_length=1, max_length=120),
+    db: AsyncSession = Depends(get_async_write_db),
+):
+    service = AsyncIdeaService(db)
+    try:
+        await service.remove_vote(idea_id, voter=voter)
+    except (IdeaNotFoundError, VoteNotFoundError):
+        raise HTTPException(status_code=404, detail="Not found")
+    return None
+
+
+@router.get("/{idea_id}/votes_count", response_model=VoteCount)
+@query_budget(1)
+async def votes_count(idea_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    service = AsyncIdeaService(db)
+    try:
+        count = await service.votes_count(idea_id)
+    except IdeaNotFoundError:
+        raise HTTPException(status_code=404, detail="Not found")
+    return {"idea_id": idea_id, "votes_count": count}
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ...core.metrics import metrics
+from ...services.cache import response_cache
+from ...services.vote_stream import vote_stream
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# response cache stats that only ever grow; the rest (size, max_entries) are gauges
+_CACHE_COUNTERS = {"hits", "misses", "evictions", "expirations"}
+
+
+def _worker_state() -> Iterable[str]:
+    for name, value in sorted(response_cache.stats().items()):
+        kind = "counter" if name in _CACHE_COUNTERS else "gauge"
+        metric = f"response_cache_{name}_total" if kind == "counter" else f"response_cache_{name}"
+        yield f"# TYPE {metric} {kind}"
+        yield f"{metric} {value}"
+    yield "# HELP vote_stream_subscribers Open live vote-count streams on this worker."
+    yield "# TYPE vote_stream_subscribers gauge"
+    yield f"vote_stream_subscribers {vote_stream.subscriber_count()}"
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics() -> PlainTextResponse:
+    """This worker's request, SQL, cache and stream metrics in Prometheus text format.
+
+    Every worker process keeps its own series; scrape each one (or aggregate by instance).
+    """
+    lines = [*metrics.render(), *_worker_state()]
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=PROMETHEUS_CONTENT_TYPE)
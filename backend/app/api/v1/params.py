@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import HTTPException, Query
+
+from ...schemas import IdeaRead
+
+# Upper bound for the multi-get endpoints (/ideas:batch, /users:batch); one IN query each.
+MAX_BATCH_IDS = 500
+_IDS_DESCRIPTION = f"comma-separated and/or repeated ids, at most {MAX_BATCH_IDS}"
+
+
+def batch_ids(ids: list[str] = Query(..., description=_IDS_DESCRIPTION)) -> list[str]:
+    values = [v.strip() for chunk in ids for v in chunk.split(",") if v.strip()]
+    if not values:
+        raise HTTPException(status_code=422, detail="ids must not be empty")
+    if len(values) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=422, detail=f"at most {MAX_BATCH_IDS} ids per request")
+    return values
+
+
+def batch_int_ids(ids: list[str] = Query(..., description=_IDS_DESCRIPTION)) -> list[int]:
+    try:
+        return [int(v) for v in batch_ids(ids)]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be integers")
+
+
+def idea_fields(
+    fields: Optional[str] = Query(
+        None,
+        description=f"comma-separated subset of {', '.join(IdeaRead.model_fields)}; only these columns "
+        "are loaded and returned (id is always included)",
+    ),
+) -> Optional[tuple[str, ...]]:
+    if fields is None:
+        return None
+    names = tuple(dict.fromkeys(["id", *(f.strip() for f in fields.split(",") if f.strip())]))
+    unknown = [name for name in names if name not in IdeaRead.model_fields]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"unknown fields: {', '.join(unknown)}")
+    return names
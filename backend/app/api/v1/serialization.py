@@ -0,0 +1,29 @@
+"""Single-pass JSON for the idea read endpoints.
+
+Rows come from the database (or the response cache) already typed, so these routes build
+plain dicts straight from their attributes and return them encoded with orjson. Returning
+a Response skips FastAPI's response_model validation and serialization; the routes keep
+``response_model`` so the OpenAPI schema is unchanged.
+"""
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+
+from ...schemas import IdeaRead
+
+IDEA_FIELDS = tuple(IdeaRead.model_fields)
+
+
+def idea_dict(idea: Any, fields: Sequence[str] = IDEA_FIELDS) -> dict[str, Any]:
+    """The IdeaRead fields (or just ``fields``) of a row or cached snapshot, unvalidated."""
+    return {field: getattr(idea, field) for field in fields}
+
+
+def json_response(content: Any, response: Response, status_code: int = 200) -> ORJSONResponse:
+    """Encode ``content`` with orjson, keeping headers set on the route's ``response``."""
+    out = ORJSONResponse(content, status_code=status_code)
+    out.raw_headers.extend(h for h in response.raw_headers if h[0] not in (b"content-length", b"content-type"))
+    return out
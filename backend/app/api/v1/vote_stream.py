@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, WebSocket
+from fastapi.responses import StreamingResponse
+
+from ...services.vote_stream import Subscription, vote_stream
+
+# Mounted in both DB modes: streams hold no database session while they wait.
+router = APIRouter(prefix="/ideas", tags=["ideas"])
+
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+@router.get(
+    "/{idea_id}/votes/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}, "description": "votes / deleted events"}},
+)
+async def stream_votes(idea_id: int):
+    """Server-sent events: the current count, then each change (at most one per interval).
+
+    A ``deleted`` event ends the stream; comment lines keep idle connections open.
+    """
+    sub = await vote_stream.subscribe(idea_id)
+    if sub is None:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    async def events():
+        try:
+            yield _sse("votes", {"idea_id": idea_id, "votes_count": sub.count})
+            async for count in sub.changes():
+                if count is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield _sse("votes", {"idea_id": idea_id, "votes_count": count})
+            if sub.deleted:
+                yield _sse("deleted", {"idea_id": idea_id})
+        finally:
+            vote_stream.unsubscribe(sub)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
+
+@router.websocket("/{idea_id}/votes/ws")
+async def websocket_votes(websocket: WebSocket, idea_id: int):
+    """WebSocket twin of /votes/stream: JSON messages, ``{"deleted": true}`` before closing."""
+    await websocket.accept()
+    sub = await vote_stream.subscribe(idea_id)
+    if sub is None:
+        await websocket.close(code=4404, reason="Not found")
+        return
+    sender = asyncio.create_task(_send_counts(websocket, sub))
+    try:
+        # the client never needs to talk; reading only notices when it goes away
+        while not sender.done():
+            receiver = asyncio.ensure_future(websocket.receive())
+            await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if not receiver.done():
+                receiver.cancel()
+            elif receiver.result()["type"] == "websocket.disconnect":
+                break
+    finally:
+        sender.cancel()
+        vote_stream.unsubscribe(sub)
+
+
+async def _send_counts(websocket: WebSocket, sub: Subscription) -> None:
+    await websocket.send_json({"idea_id": sub.idea_id, "votes_count": sub.count})
+    async for count in sub.changes():
+        if count is not None:  # WebSocket ping frames keep the connection alive; no app keepalive
+            await websocket.send_json({"idea_id": sub.idea_id, "votes_count": count})
+    if sub.deleted:
+        await websocket.send_json({"idea_id": sub.idea_id, "deleted": True})
+    await websocket.close()
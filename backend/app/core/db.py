@@ -1,21 +1,83 @@
 from __future__ import annotations
 
+import time
 from contextlib import contextmanager
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 
-from sqlalchemy import create_engine
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-from .settings import get_settings
+from .metrics import install_sql_hooks
+from .query_budget import install_budget_hooks
+from .settings import StorageProfile, get_settings
 
 
 class Base(DeclarativeBase):
     pass
 
 
-def _create_engine(url: str):
-    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
-    return create_engine(url, echo=False, future=True, connect_args=connect_args)
+def _engine_options(url: str, profile: StorageProfile) -> dict:
+    parsed = make_url(url)
+    options: dict = {"pool_pre_ping": profile.pool_pre_ping}
+    # in-memory SQLite uses a per-thread singleton pool, which has no size/overflow
+    if not (parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")):
+        options.update(pool_size=profile.pool_size, max_overflow=profile.max_overflow)
+    return options
+
+
+def _sqlite_pragmas(profile: StorageProfile, read_only: bool = False) -> list[str]:
+    pragmas = [
+        f"PRAGMA journal_mode={profile.journal_mode}",
+        f"PRAGMA synchronous={profile.synchronous}",
+        f"PRAGMA busy_timeout={profile.busy_timeout_ms}",
+        f"PRAGMA mmap_size={profile.mmap_size}",
+        f"PRAGMA cache_size={profile.cache_size}",
+        f"PRAGMA temp_store={profile.temp_store}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def _connect_args(url: str, read_only: bool) -> dict:
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        return {"check_same_thread": False}
+    if backend == "postgresql" and read_only:
+        return {"options": "-c default_transaction_read_only=on"}
+    return {}
+
+
+def _install_pragmas(sync_engine: Engine, profile: StorageProfile, read_only: bool = False) -> None:
+    if sync_engine.dialect.name != "sqlite":
+        return
+    pragmas = _sqlite_pragmas(profile, read_only)
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def _create_engine(url: str, profile: Optional[StorageProfile] = None, *, read_only: bool = False) -> Engine:
+    profile = profile or get_settings().storage_profile
+    engine = create_engine(
+        url, echo=False, future=True, connect_args=_connect_args(url, read_only), **_engine_options(url, profile)
+    )
+    _install_pragmas(engine, profile, read_only)
+    if get_settings().METRICS_ENABLED:
+        install_sql_hooks(engine)
+    if get_settings().QUERY_BUDGET_MODE != "off":
+        install_budget_hooks(engine)
+    return engine
 
 
 settings = get_settings()
@@ -23,6 +85,22 @@ engine = _create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False, class_=Session)
 
 
+# Read-only engine for pure read endpoints (DATABASE_READ_URL): a Postgres replica or a
+# query_only SQLite pool. Without it, reads share the primary engine.
+read_engine: Optional[Engine] = (
+    _create_engine(settings.DATABASE_READ_URL, read_only=True) if settings.DATABASE_READ_URL else None
+)
+ReadSessionLocal: Optional[sessionmaker[Session]] = (
+    sessionmaker(bind=read_engine, autoflush=False, autocommit=False, expire_on_commit=False, class_=Session)
+    if read_engine is not None
+    else None
+)
+
+# Set on responses to mutations; while it is valid that client's reads go to the primary,
+# so it sees its own writes even when the replica lags behind.
+READ_PRIMARY_COOKIE = "crowd_read_primary_until"
+
+
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
@@ -31,3 +109,121 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def mark_write(response: Response) -> None:
+    window = get_settings().READ_YOUR_WRITES_SECONDS
+    if window > 0:
+        until = f"{time.time() + window:.3f}"
+        response.set_cookie(READ_PRIMARY_COOKIE, until, max_age=max(int(window), 1), httponly=True, samesite="lax")
+
+
+def reads_from_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, "0")) > time.time()
+    except ValueError:
+        return False
+
+
+def get_write_db(response: Response) -> Generator[Session, None, None]:
+    """Primary session for mutations; starts the caller's read-your-writes window."""
+    mark_write(response)
+    yield from get_db()
+
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """Session for pure reads: the read engine, or the primary for recent writers."""
+    primary = reads_from_primary(request)
+    factory = SessionLocal if ReadSessionLocal is None or primary else ReadSessionLocal
+    db = factory()
+    # lets services skip shared read caches for this client's own-writes window
+    db.info["read_your_writes"] = primary
+    # and not fill them from a replica that may still lag behind a write
+    db.info["replica"] = factory is ReadSessionLocal
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Async stack (DB_MODE=async). Created on first use so the sync app never needs an async driver.
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+psycopg"}
+
+
+def async_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its async driver (aiosqlite / async psycopg)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"no async driver configured for {backend!r}")
+    return parsed.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def _create_async_engine(
+    url: str, profile: Optional[StorageProfile] = None, *, read_only: bool = False
+) -> AsyncEngine:
+    profile = profile or get_settings().storage_profile
+    options = _engine_options(url, profile)
+    if "pool_size" in options and make_url(url).get_backend_name() == "sqlite":
+        # aiosqlite defaults to NullPool (a fresh connection, and pragmas, per checkout)
+        options["poolclass"] = AsyncAdaptedQueuePool
+    connect_args = {} if make_url(url).get_backend_name() == "sqlite" else _connect_args(url, read_only)
+    engine = create_async_engine(async_url(url), echo=False, connect_args=connect_args, **options)
+    _install_pragmas(engine.sync_engine, profile, read_only)
+    if get_settings().METRICS_ENABLED:
+        install_sql_hooks(engine.sync_engine)
+    if get_settings().QUERY_BUDGET_MODE != "off":
+        install_budget_hooks(engine.sync_engine)
+    return engine
+
+
+async_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal: Optional[async_sessionmaker[AsyncSession]] = None
+async_read_engine: Optional[AsyncEngine] = None
+AsyncReadSessionLocal: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    global async_engine, AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        async_engine = _create_async_engine(get_settings().DATABASE_URL)
+        AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    return AsyncSessionLocal
+
+
+def get_async_read_sessionmaker() -> Optional[async_sessionmaker[AsyncSession]]:
+    global async_read_engine, AsyncReadSessionLocal
+    read_url = get_settings().DATABASE_READ_URL
+    if AsyncReadSessionLocal is None and read_url:
+        async_read_engine = _create_async_engine(read_url, read_only=True)
+        AsyncReadSessionLocal = async_sessionmaker(bind=async_read_engine, autoflush=False, expire_on_commit=False)
+    return AsyncReadSessionLocal
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def get_async_write_db(response: Response) -> AsyncGenerator[AsyncSession, None]:
+    mark_write(response)
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    primary = reads_from_primary(request)
+    factory = get_async_read_sessionmaker()
+    if factory is None or primary:
+        factory = get_async_sessionmaker()
+    async with factory() as db:
+        db.info["read_your_writes"] = primary
+        db.info["replica"] = factory is not get_async_sessionmaker()
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    global async_engine, AsyncSessionLocal, async_read_engine, AsyncReadSessionLocal
+    for engine in (async_engine, async_read_engine):
+        if engine is not None:
+            await engine.dispose()
+    async_engine, AsyncSessionLocal = None, None
+    async_read_engine, AsyncReadSessionLocal = None, None
@@ -0,0 +1,200 @@
+"""Per-route request metrics and per-request SQL accounting, in Prometheus text format.
+
+MetricsMiddleware times every HTTP request and labels it with the matched route template
+(``/api/v1/ideas/{idea_id}``, never the raw path), so the number of series stays bounded.
+The engine hooks from ``install_sql_hooks`` add each statement's count and duration to
+the request that ran it, found through a context variable that follows the request into
+the threadpool and into ``AsyncSession.run_sync``. Statements outside any request (vote
+buffer flushes, leaderboard reconciles) are reported under ``route="none"``.
+
+Recording is a few perf_counter calls and one short lock per request, cheap enough to
+leave on; METRICS_ENABLED=false removes the middleware, the hooks and the endpoint.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNMATCHED_ROUTE = "unmatched"
+NO_REQUEST = "none"
+
+
+class RequestSql:
+    """SQL statements and time spent by one request so far."""
+
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.seconds = 0.0
+
+
+_request_sql: ContextVar[Optional[RequestSql]] = ContextVar("request_sql", default=None)
+
+
+def current_request_sql() -> Optional[RequestSql]:
+    return _request_sql.get()
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, buckets: int) -> None:
+        self.counts = [0] * (buckets + 1)
+        self.total = 0.0
+        self.count = 0
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latency: dict[tuple[str, str], _Histogram] = {}
+            self._responses: dict[tuple[str, str, int], int] = {}
+            self._sql: dict[tuple[str, str], list] = {}
+            self._in_flight = 0
+
+    def request_started(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float, sql: RequestSql) -> None:
+        bucket = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._in_flight -= 1
+            histogram = self._latency.get((method, route))
+            if histogram is None:
+                histogram = self._latency[(method, route)] = _Histogram(len(self.buckets))
+            histogram.counts[bucket] += 1
+            histogram.total += seconds
+            histogram.count += 1
+            key = (method, route, status)
+            self._responses[key] = self._responses.get(key, 0) + 1
+            self._add_sql((method, route), sql.queries, sql.seconds)
+
+    def sql_outside_request(self, seconds: float) -> None:
+        with self._lock:
+            self._add_sql(("", NO_REQUEST), 1, seconds)
+
+    def _add_sql(self, key: tuple[str, str], queries: int, seconds: float) -> None:
+        totals = self._sql.get(key)
+        if totals is None:
+            totals = self._sql[key] = [0, 0.0]
+        totals[0] += queries
+        totals[1] += seconds
+
+    def render(self) -> Iterable[str]:
+        """The recorded series as Prometheus exposition lines."""
+        with self._lock:
+            latency = {key: (list(h.counts), h.total, h.count) for key, h in self._latency.items()}
+            responses = dict(self._responses)
+            sql = {key: tuple(totals) for key, totals in self._sql.items()}
+            in_flight = self._in_flight
+
+        yield "# HELP http_requests_in_flight HTTP requests being served, streams included."
+        yield "# TYPE http_requests_in_flight gauge"
+        yield f"http_requests_in_flight {in_flight}"
+
+        yield "# HELP http_requests_total HTTP responses by route template and status code."
+        yield "# TYPE http_requests_total counter"
+        for (method, route, status), count in sorted(responses.items()):
+            yield f'http_requests_total{{method="{method}",route="{_label(route)}",status="{status}"}} {count}'
+
+        yield "# HELP http_request_duration_seconds Time from request start to the end of the response."
+        yield "# TYPE http_request_duration_seconds histogram"
+        for (method, route), (counts, total, count) in sorted(latency.items()):
+            labels = f'method="{method}",route="{_label(route)}"'
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                yield f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+            yield f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {count}'
+            yield f"http_request_duration_seconds_sum{{{labels}}} {total:.6f}"
+            yield f"http_request_duration_seconds_count{{{labels}}} {count}"
+
+        yield "# HELP db_queries_total SQL statements executed, by the route that ran them."
+        yield "# TYPE db_queries_total counter"
+        for (method, route), (queries, _) in sorted(sql.items()):
+            yield f'db_queries_total{{method="{method}",route="{_label(route)}"}} {queries}'
+        yield "# HELP db_query_seconds_total Time spent executing SQL statements, by route."
+        yield "# TYPE db_query_seconds_total counter"
+        for (method, route), (_, seconds) in sorted(sql.items()):
+            yield f'db_query_seconds_total{{method="{method}",route="{_label(route)}"}} {seconds:.6f}'
+
+
+metrics = Metrics()
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no per-request task or body buffering) feeding ``metrics``."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        sql = RequestSql()
+        token = _request_sql.set(sql)
+        metrics.request_started()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_sql.reset(token)
+            # the router stores the matched route in the shared scope
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            metrics.request_finished(scope["method"], route, status, elapsed, sql)
+
+
+def install_sql_hooks(engine: Engine) -> None:
+    """Count every statement run on engine (a sync Engine, or an AsyncEngine's sync_engine)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        sql = _request_sql.get()
+        if sql is None:
+            metrics.sql_outside_request(elapsed)
+        else:
+            sql.queries += 1
+            sql.seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _failed(context):
+        # after_cursor_execute does not run for a failed statement
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
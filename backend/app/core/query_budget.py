@@ -0,0 +1,136 @@
+"""Per-request SQL statement budgets with repeated-statement (N+1) detection.
+
+A route declares the most statements one call may run::
+
+    @router.get("/{idea_id}")
+    @query_budget(1)
+    def get_idea(...): ...
+
+While the endpoint runs, the engine hooks from ``install_budget_hooks`` record the SQL
+text of every statement in the active budget, found through a context variable that
+follows sync endpoints into the threadpool and async ones into ``AsyncSession.run_sync``.
+On the way out the budget is checked: more than ``max_queries`` statements, or one SQL
+text executed more than ``max_repeats`` times (the same query with different parameters,
+i.e. a query in a loop), is a violation. An executemany is one round trip and counts once.
+
+QUERY_BUDGET_MODE decides what a violation does: "log" writes a warning, "raise" fails
+the request with QueryBudgetExceeded (the test suite runs this way, so a route that
+starts issuing more round trips fails its tests), "off" records nothing.
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+from collections import Counter
+from contextvars import ContextVar, Token
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryBudget:
+    """Single-use context manager that enforces a statement budget on the enclosed block.
+
+    Budgets nest: a statement counts against every budget that is active when it runs.
+    """
+
+    def __init__(self, max_queries: int, *, max_repeats: int = 1, name: str = "block"):
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.name = name
+        self.statements: list[str] = []
+        self.parent: Optional[QueryBudget] = None
+        self._token: Optional[Token] = None
+        self._mode = "off"
+
+    def __enter__(self) -> QueryBudget:
+        self._mode = get_settings().QUERY_BUDGET_MODE
+        if self._mode != "off":
+            self.parent = _active.get()
+            self._token = _active.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._token is None:
+            return
+        _active.reset(self._token)
+        self._token = None
+        # error responses (404, 409) are budgeted too; other exceptions propagate unchecked
+        if exc_type is None or issubclass(exc_type, HTTPException):
+            self.check()
+
+    def violations(self) -> list[str]:
+        found = []
+        if len(self.statements) > self.max_queries:
+            found.append(f"{len(self.statements)} statements, budget {self.max_queries}")
+        for statement, count in Counter(self.statements).most_common():
+            if count <= self.max_repeats:
+                break
+            found.append(f"{count}x {' '.join(statement.split())[:200]}")
+        return found
+
+    def check(self) -> None:
+        found = self.violations()
+        if not found:
+            return
+        message = f"query budget exceeded in {self.name}: " + "; ".join(found)
+        if self._mode == "raise":
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+_active: ContextVar[Optional[QueryBudget]] = ContextVar("query_budget", default=None)
+
+
+def query_budget(max_queries: int, *, max_repeats: int = 1) -> Callable[[F], F]:
+    """Decorate a route endpoint (sync or async) with a per-call statement budget.
+
+    Goes below the ``@router`` decorator; FastAPI still sees the endpoint's own signature.
+    """
+
+    def decorate(endpoint: F) -> F:
+        name = f"{endpoint.__module__}.{endpoint.__qualname__}"
+        if inspect.iscoroutinefunction(endpoint):
+
+            @functools.wraps(endpoint)
+            async def budgeted(*args, **kwargs):
+                with QueryBudget(max_queries, max_repeats=max_repeats, name=name):
+                    return await endpoint(*args, **kwargs)
+
+        else:
+
+            @functools.wraps(endpoint)
+            def budgeted(*args, **kwargs):
+                with QueryBudget(max_queries, max_repeats=max_repeats, name=name):
+                    return endpoint(*args, **kwargs)
+
+        # FastAPI resolves string annotations in the function's own globals, which a
+        # wrapper does not share; hand it the endpoint's evaluated signature instead
+        budgeted.__signature__ = inspect.signature(endpoint, eval_str=True)  # type: ignore[attr-defined]
+        return budgeted  # type: ignore[return-value]
+
+    return decorate
+
+
+def install_budget_hooks(engine: Engine) -> None:
+    """Record statements run on engine (a sync Engine, or an AsyncEngine's sync_engine)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        budget = _active.get()
+        while budget is not None:
+            budget.statements.append(statement)
+            budget = budget.parent
@@ -0,0 +1,110 @@
+"""Readiness probe: can this worker take more requests right now?
+
+``check`` looks at the primary engine's connection pool, then checks out a connection
+and times a ``SELECT 1`` (checkout included, so waiting on a busy pool shows up). On
+SQLite it also times ``BEGIN IMMEDIATE``, which waits for the database write lock,
+with ``busy_timeout`` lowered to the threshold so a locked file fails the probe quickly
+instead of holding it for the profile's full timeout. A saturated pool is reported
+without probing, since the checkout would block until a connection comes back.
+"""
+from __future__ import annotations
+
+import time
+
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .settings import Settings
+
+
+def pool_status(engine: Engine) -> dict:
+    """Checked-out and overflow connections; None for counts the pool class does not keep."""
+    pool = engine.pool
+    size = pool.size() if hasattr(pool, "size") else None
+    max_overflow = getattr(pool, "_max_overflow", None)
+    return {
+        "size": size,
+        "max_overflow": max_overflow,
+        "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+        # QueuePool.overflow() is negative until the pool has opened `size` connections
+        "overflow": max(pool.overflow(), 0) if hasattr(pool, "overflow") else None,
+    }
+
+
+def _ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def _lock_wait(conn: Connection, settings: Settings) -> tuple[float, bool]:
+    """Time to take the SQLite write lock, and whether it was taken within the threshold."""
+    restore = settings.storage_profile.busy_timeout_ms
+    conn.exec_driver_sql(f"PRAGMA busy_timeout={int(settings.READY_MAX_LOCK_WAIT_MS)}")
+    started = time.perf_counter()
+    try:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        conn.exec_driver_sql("ROLLBACK")
+        return _ms(started), True
+    except OperationalError:
+        return _ms(started), False
+    finally:
+        conn.exec_driver_sql(f"PRAGMA busy_timeout={restore}")
+
+
+def _probe(conn: Connection, settings: Settings, started: float, report: dict) -> None:
+    conn.exec_driver_sql("SELECT 1").scalar()
+    report["probe_ms"] = _ms(started)
+    if conn.dialect.name == "sqlite":
+        report["lock_wait_ms"], locked = _lock_wait(conn, settings)
+        if not locked:
+            report["failed"].append("write lock not acquired")
+
+
+def _saturated(pool: dict, settings: Settings) -> bool:
+    if pool["size"] is None or pool["checked_out"] is None:
+        return False
+    capacity = pool["size"] + max(pool["max_overflow"] or 0, 0)
+    return pool["checked_out"] >= capacity * settings.READY_MAX_POOL_USAGE
+
+
+def _report(pool: dict) -> dict:
+    return {"status": "ok", "probe_ms": None, "lock_wait_ms": None, "pool": pool, "failed": []}
+
+
+def _finish(report: dict, settings: Settings) -> tuple[bool, dict]:
+    if report["probe_ms"] is not None and report["probe_ms"] > settings.READY_MAX_PROBE_MS:
+        report["failed"].append(f"probe took over {settings.READY_MAX_PROBE_MS:g} ms")
+    if report["failed"]:
+        report["status"] = "unavailable"
+    return not report["failed"], report
+
+
+def check(engine: Engine, settings: Settings) -> tuple[bool, dict]:
+    """(ready, report) for a sync engine; runs blocking I/O, call it from the threadpool."""
+    report = _report(pool_status(engine))
+    if _saturated(report["pool"], settings):
+        report["failed"].append("connection pool saturated")
+        return _finish(report, settings)
+    started = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            _probe(conn, settings, started, report)
+    except SQLAlchemyError as exc:
+        report["failed"].append(f"probe failed: {type(exc).__name__}")
+    return _finish(report, settings)
+
+
+async def check_async(engine: AsyncEngine, settings: Settings) -> tuple[bool, dict]:
+    """``check`` for the AsyncEngine used when DB_MODE=async."""
+    report = _report(pool_status(engine.sync_engine))
+    if _saturated(report["pool"], settings):
+        report["failed"].append("connection pool saturated")
+        return _finish(report, settings)
+    started = time.perf_counter()
+    try:
+        async with engine.connect() as conn:
+            await conn.run_sync(_probe, settings, started, report)
+    except SQLAlchemyError as exc:
+        report["failed"].append(f"probe failed: {type(exc).__name__}")
+    return _finish(report, settings)
+
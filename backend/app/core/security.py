@@ -0,0 +1,68 @@
+"""scrypt password hashes: ``scrypt$<n>$<r>$<p>$<salt>$<hash>`` (base64url, unpadded).
+
+These are plain, picklable functions so they can run in a worker process; see
+app/services/passwords.py for the pool that the request handlers go through.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import os
+from typing import NamedTuple, Optional
+
+_SCHEME = "scrypt"
+_SALT_BYTES = 16
+_KEY_BYTES = 32
+
+
+class ScryptParams(NamedTuple):
+    n: int
+    r: int
+    p: int
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _derive(password: str, salt: bytes, params: ScryptParams) -> bytes:
+    n, r, p = params
+    # scrypt needs 128 * n * r bytes; leave headroom over OpenSSL's 32 MiB default cap
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + 1024 * 1024, dklen=_KEY_BYTES
+    )
+
+
+def hash_password(password: str, params: ScryptParams) -> str:
+    salt = os.urandom(_SALT_BYTES)
+    key = _derive(password, salt, params)
+    return "$".join([_SCHEME, str(params.n), str(params.r), str(params.p), _b64encode(salt), _b64encode(key)])
+
+
+def hash_params(stored: str) -> Optional[ScryptParams]:
+    """Cost parameters of a stored hash; None for anything that is not an scrypt hash."""
+    parts = stored.split("$")
+    if len(parts) != 6 or parts[0] != _SCHEME:
+        return None
+    try:
+        return ScryptParams(int(parts[1]), int(parts[2]), int(parts[3]))
+    except ValueError:
+        return None
+
+
+def verify_password(password: str, stored: str) -> bool:
+    params = hash_params(stored)
+    if params is None:
+        # rows written before hashing hold the password as submitted
+        return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+    _, _, _, _, salt, key = stored.split("$")
+    return hmac.compare_digest(_derive(password, _b64decode(salt), params), _b64decode(key))
+
+
+def needs_rehash(stored: str, params: ScryptParams) -> bool:
+    return hash_params(stored) != params
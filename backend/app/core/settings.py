@@ -1,15 +1,137 @@
 from functools import lru_cache
+from typing import Literal, Optional
+
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class StorageProfile(BaseModel):
+    """Connection pool sizing plus the SQLite pragmas applied to every new connection."""
+
+    pool_size: int
+    max_overflow: int
+    pool_pre_ping: bool
+    # SQLite only; ignored on other backends
+    journal_mode: str = "wal"
+    synchronous: str
+    busy_timeout_ms: int
+    mmap_size: int
+    cache_size: int  # negative values are KiB, as in PRAGMA cache_size
+    temp_store: str
+
+
+# Benchmark numbers for each profile are in the README (python -m app.scripts.bench_storage).
+STORAGE_PROFILES: dict[str, StorageProfile] = {
+    # fsync on every commit: a committed vote survives power loss
+    "durable": StorageProfile(
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+        synchronous="full",
+        busy_timeout_ms=5000,
+        mmap_size=0,
+        cache_size=-8_000,
+        temp_store="default",
+    ),
+    # WAL + synchronous=NORMAL: never corrupts, may lose the last commits on power loss (not on crash)
+    "balanced": StorageProfile(
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+        synchronous="normal",
+        busy_timeout_ms=5000,
+        mmap_size=128 * 1024 * 1024,
+        cache_size=-32_000,
+        temp_store="memory",
+    ),
+    # no fsync at all: an OS crash or power loss can lose or corrupt recent writes
+    "throughput": StorageProfile(
+        pool_size=20,
+        max_overflow=20,
+        pool_pre_ping=False,
+        synchronous="off",
+        busy_timeout_ms=10_000,
+        mmap_size=512 * 1024 * 1024,
+        cache_size=-128_000,
+        temp_store="memory",
+    ),
+}
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file='.env', env_file_encoding='utf-8', extra='ignore')
 
     APP_NAME: str = "Crowd Ideas API"
     DEBUG: bool = False
     DATABASE_URL: str = "sqlite:///./app.db"
+    # Optional read-only engine for pure read endpoints (replica, or a query_only SQLite pool).
+    DATABASE_READ_URL: Optional[str] = None
+    # After a mutation the client's reads stay on the primary this long (replica lag budget).
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    # "sync": def routes on the threadpool; "async": async routes on AsyncEngine (aiosqlite / async psycopg)
+    DB_MODE: Literal["sync", "async"] = "sync"
+    # Pool sizing and SQLite pragmas, see STORAGE_PROFILES.
+    STORAGE_PROFILE: Literal["durable", "balanced", "throughput"] = "balanced"
     CORS_ORIGINS: list[str] = ["*"] 
+    # Relevance bonus per vote when ranking search results (sort=relevance); 0 ranks on text alone.
+    SEARCH_VOTE_BOOST: float = 0.0
+    # sort=trending: votes from the last TRENDING_WINDOW_HOURS hourly buckets, each bucket's
+    # weight halving every TRENDING_HALF_LIFE_HOURS
+    TRENDING_WINDOW_HOURS: int = 48
+    TRENDING_HALF_LIFE_HOURS: float = 6.0
+    # How long a cached list total may be served before recounting; 0 disables the cache.
+    TOTALS_CACHE_TTL_SECONDS: float = 30.0
+    # List/top ETags come from an in-process collection version; it also changes this often so
+    # that writes handled by other workers are picked up. 0 = only on this process's writes.
+    COLLECTION_VERSION_TTL_SECONDS: float = 30.0
+    # Read-through cache for list/top/detail reads, invalidated by write events: "memory"
+    # (per-process LRU+TTL), "none", or "module:factory" for an external CacheBackend.
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    # Also bounds staleness from writes handled by other workers; 0 disables the cache.
+    RESPONSE_CACHE_TTL_SECONDS: float = 5.0
+    # Live vote counts (/ideas/{id}/votes/stream and /votes/ws): at most one push per idea per
+    # interval, SSE keepalive comments on idle streams, and a periodic re-read of every
+    # watched count to pick up votes handled by other workers.
+    VOTE_STREAM_INTERVAL_MS: int = 250
+    VOTE_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    VOTE_STREAM_RESYNC_SECONDS: float = 10.0
+    # GET /api/v1/health/ready answers 503 when the probe query (connection checkout included)
+    # or taking the SQLite write lock is slower than these, or when this share of the pool's
+    # connections (pool_size + max_overflow) is checked out.
+    READY_MAX_PROBE_MS: float = 250.0
+    READY_MAX_LOCK_WAIT_MS: float = 1000.0
+    READY_MAX_POOL_USAGE: float = 1.0
+    # Per-route latency/status and per-request SQL metrics, served at /api/v1/metrics.
+    METRICS_ENABLED: bool = True
+    # What a route running past its @query_budget statement count (or repeating one statement)
+    # does: "log" a warning, "raise" QueryBudgetExceeded (tests), or "off" (no recording).
+    QUERY_BUDGET_MODE: Literal["off", "log", "raise"] = "log"
+    # In-memory /ideas/top leaderboard: entries kept per worker and how often it is rebuilt from SQL.
+    LEADERBOARD_ENABLED: bool = True
+    LEADERBOARD_SIZE: int = 1000
+    LEADERBOARD_RECONCILE_SECONDS: float = 60.0
+    # Write-behind voting: queue votes in process and commit them as one multi-row insert
+    # per batch. A vote waits at most MAX_DELAY_MS in memory before it is written.
+    VOTE_BUFFER_ENABLED: bool = False
+    VOTE_BUFFER_MAX_DELAY_MS: int = 20
+    VOTE_BUFFER_MAX_BATCH: int = 500
+    # Single-statement create/update/delete/vote (INSERT ... ON CONFLICT / UPDATE ... RETURNING)
+    # relying on the unique constraints instead of lookups first. SQLite and Postgres only.
+    FAST_WRITES: bool = False
+    # POST /ideas/votes:batch commits once per chunk of this many votes.
+    VOTE_BATCH_CHUNK_SIZE: int = 500
+    # scrypt cost (n = CPU/memory cost, 128*n*r bytes per hash). Stored hashes with other
+    # parameters are upgraded on the next successful login.
+    PASSWORD_SCRYPT_N: int = 2**14
+    PASSWORD_SCRYPT_R: int = 8
+    PASSWORD_SCRYPT_P: int = 1
+    # Size of the process pool that hashes/verifies passwords; 0 hashes on the request thread.
+    PASSWORD_HASH_WORKERS: int = 2
+
+    @property
+    def storage_profile(self) -> StorageProfile:
+        return STORAGE_PROFILES[self.STORAGE_PROFILE]
 
 
 @lru_cache(maxsize=1)
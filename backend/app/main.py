@@ -1,9 +1,22 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
+from .core.db import dispose_async_engine
+from .core.metrics import MetricsMiddleware
 from .core.settings import get_settings
+from .services.ideas import vote_buffer
+from .services.passwords import password_hasher
+from .services.leaderboard import refresh_leaderboard, run_reconciler
+from .services.vote_stream import vote_stream
 from .api.v1.health import router as health_router
+from .api.v1.metrics import router as metrics_router
 from .api.v1.ideas import router as ideas_router
+from .api.v1.ideas_async import router as ideas_async_router
+from .api.v1.vote_stream import router as vote_stream_router
 from .api.v1.APIENDPOINTS import router as api_endpoints_router
 
 import sys
@@ -13,9 +26,27 @@ sys.path.insert(0, str(backend_dir))
 from get_users import router as users_router
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    tasks = []
+    if settings.LEADERBOARD_ENABLED:
+        # load the leaderboard before serving, then reconcile it against the DB periodically
+        await refresh_leaderboard()
+        tasks.append(asyncio.create_task(run_reconciler(settings.LEADERBOARD_RECONCILE_SECONDS)))
+    yield
+    for task in tasks:
+        task.cancel()
+    vote_stream.stop()
+    # write out any votes still waiting in the buffer before the worker exits
+    await run_in_threadpool(vote_buffer.stop)
+    await run_in_threadpool(password_hasher.shutdown)
+    await dispose_async_engine()
+
+
 def create_app() -> FastAPI:
     settings = get_settings()
-    app = FastAPI(title=settings.APP_NAME)
+    app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -23,11 +54,19 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
     )
+    if settings.METRICS_ENABLED:
+        # added last, so it wraps CORS too and times the whole request
+        app.add_middleware(MetricsMiddleware)
 
     api = FastAPI()
     app.include_router(health_router, prefix="/api/v1")
-    app.include_router(ideas_router, prefix="/api/v1")
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics_router, prefix="/api/v1")
+    # DB_MODE=async serves /ideas from coroutines on the async engine instead of the threadpool
+    app.include_router(ideas_async_router if settings.DB_MODE == "async" else ideas_router, prefix="/api/v1")
+    app.include_router(vote_stream_router, prefix="/api/v1")
     app.include_router(users_router, prefix="/api/v1")
     app.include_router(api_endpoints_router, prefix="/api/v1")
 
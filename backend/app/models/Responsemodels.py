@@ -18,6 +18,13 @@ class Idea(Base):
     description: Mapped[str] = mapped_column(Text, default="")
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Denormalized count of rows in `votes`, maintained in the same transaction as every vote write.
+    votes_count: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+    # Bumped by every votes_count change, in the same UPDATE; orders snapshots of the count
+    # whose commit callbacks arrive out of order (see services/leaderboard.py).
+    votes_version: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+    # Last vote/unvote; with updated_at it dates the idea's representation (Last-Modified).
+    voted_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
 
     votes: Mapped[list[Vote]] = relationship("Vote", back_populates="idea", cascade="all, delete-orphan")
 
@@ -38,6 +45,17 @@ class Vote(Base):
         UniqueConstraint("idea_id", "voter", name="uq_vote_idea_voter"),
     )
 
+class VoteRollup(Base):
+    """Net votes per idea per UTC hour, kept in step with `votes` for cheap recency queries."""
+
+    __tablename__ = "vote_rollups"
+
+    idea_id: Mapped[int] = mapped_column(ForeignKey("ideas.id", ondelete="CASCADE"), primary_key=True)
+    # hours since the Unix epoch (UTC)
+    hour: Mapped[int] = mapped_column(primary_key=True)
+    votes: Mapped[int] = mapped_column(default=0, nullable=False)
+
+
 class UserRead(BaseModel):
     user_id: str
     first_name: str
@@ -61,4 +79,8 @@ class User(Base):
 
 # Helpful index for ordering by creation time
 Index("ix_ideas_created", Idea.created_at.desc())
+# Serves sort=votes and /ideas/top as an index scan; id breaks ties deterministically
+Index("ix_ideas_votes_count", Idea.votes_count.desc(), Idea.id.desc())
+# sort=trending reads only the last few hours of buckets; covering, so no table lookups
+Index("ix_vote_rollups_hour", VoteRollup.hour, VoteRollup.idea_id, VoteRollup.votes)
 
@@ -1,4 +1,5 @@
-from .Responsemodels import Idea, Vote, User
-
-__all__ = ["Idea", "Vote", "User"]
+from .Responsemodels import Idea, Vote, VoteRollup, User
+from .crowdDBModels import DBTableUser
+from . import search as _search  # noqa: F401  registers the full-text index DDL
 
+__all__ = ["Idea", "Vote", "VoteRollup", "User", "DBTableUser"]
@@ -20,4 +20,9 @@ class DBTableUser(Base):
     email: Mapped[Optional[str]] = mapped_column(String(120), nullable=True)
     bio: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     age: Mapped[Optional[int]] = mapped_column(Integer, nullable=False)
-    vibe: Mapped[Optional[str]] = mapped_column(String(120), nullable=True)
\ No newline at end of file
+    vibe: Mapped[Optional[str]] = mapped_column(String(120), nullable=True)
+
+    __table_args__ = (
+        # one profile per account; /user/{user_id} is an index lookup
+        Index("ux_user_entries_user_id", "user_id", unique=True),
+    )
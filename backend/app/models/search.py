@@ -0,0 +1,47 @@
+"""Full-text search index over ideas.title/description.
+
+SQLite gets an external-content FTS5 table kept in sync by triggers; Postgres gets a GIN
+index on a tsvector expression. Both are created alongside the `ideas` table by
+``create_all`` and, for existing databases, by the 0003 migration.
+"""
+from __future__ import annotations
+
+from sqlalchemy import DDL, column, event, literal_column, table
+
+from .Responsemodels import Idea
+
+FTS_TABLE = "ideas_fts"
+TS_CONFIG = "english"
+
+# Lightweight handle for joining against the FTS5 table from ORM queries.
+ideas_fts = table(FTS_TABLE, column("rowid"), column("rank"))
+ideas_fts_match = literal_column(FTS_TABLE)
+
+SQLITE_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, description, content='ideas', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON ideas BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON ideas BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    # Only text edits touch the index; votes_count updates skip it.
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description ON ideas BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+]
+
+
+# Postgres matches an expression index only against the identical expression, so the
+# index DDL and the query share this literal SQL.
+PG_SEARCH_VECTOR = (
+    f"to_tsvector('{TS_CONFIG}'::regconfig, coalesce(ideas.title, '') || ' ' || coalesce(ideas.description, ''))"
+)
+PG_SEARCH_INDEX_DDL = f"CREATE INDEX IF NOT EXISTS ix_ideas_search ON ideas USING gin ({PG_SEARCH_VECTOR})"
+search_vector = literal_column(PG_SEARCH_VECTOR)
+
+for _stmt in SQLITE_FTS_DDL:
+    event.listen(Idea.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+event.listen(Idea.__table__, "after_create", DDL(PG_SEARCH_INDEX_DDL).execute_if(dialect="postgresql"))
+event.listen(Idea.__table__, "before_drop", DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite"))
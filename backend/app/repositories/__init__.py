@@ -1,4 +1,10 @@
 from .ideas import IdeaRepository, VoteRepository
+from .rollups import VoteRollupRepository
+from .users import UserProfileRepository
 
-__all__ = ["IdeaRepository", "VoteRepository"]
-
+__all__ = [
+    "IdeaRepository",
+    "VoteRepository",
+    "VoteRollupRepository",
+    "UserProfileRepository",
+]
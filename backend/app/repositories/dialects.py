@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# Dialects with INSERT ... ON CONFLICT and RETURNING, used by the single-statement write paths.
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def supports_fast_writes(db: Session) -> bool:
+    return db.get_bind().dialect.name in _UPSERT_INSERTS
+
+
+def upsert_insert(db: Session, model):
+    return _UPSERT_INSERTS[db.get_bind().dialect.name](model)
@@ -1,12 +1,39 @@
 from __future__ import annotations
 
-from typing import Iterable, Optional
+import re
+from datetime import datetime
+from typing import Iterable, Mapping, Optional, Sequence
 
-from sqlalchemy import Select, asc, desc, func, select
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    Subquery,
+    asc,
+    bindparam,
+    case,
+    delete,
+    desc,
+    false,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    text,
+    tuple_,
+    update,
+)
 from sqlalchemy.orm import Session
 
-from ..models import Idea, Vote
+from ..core.settings import get_settings
+from ..models import Idea, Vote, VoteRollup
+from ..models.search import TS_CONFIG, ideas_fts, ideas_fts_match, search_vector
+from .dialects import supports_fast_writes, upsert_insert
+from .rollups import current_hour
+from .pagination import Cursor, InvalidCursorError, decode_cursor, encode_cursor
 
+# Words are searched as prefixes; punctuation (and FTS query syntax) is dropped.
+_SEARCH_TERM = re.compile(r"[^\W_]+")
 
 class IdeaRepository:
     def __init__(self, db: Session):
@@ -18,9 +45,55 @@ class IdeaRepository:
         self.db.flush()
         return idea
 
+    def insert_returning(self, title: str, description: str) -> Optional[Idea]:
+        """INSERT ... ON CONFLICT (title) DO NOTHING RETURNING *; None if the title is taken."""
+        stmt = (
+            upsert_insert(self.db, Idea)
+            .values(title=title, description=description)
+            .on_conflict_do_nothing(index_elements=[Idea.title])
+            .returning(Idea)
+        )
+        return self.db.scalar(stmt)
+
+    def update_returning(
+        self, idea_id: int, *, title: Optional[str] = None, description: Optional[str] = None
+    ) -> Optional[Idea]:
+        """UPDATE ... RETURNING *; None if there is no such idea. A taken title raises IntegrityError."""
+        values = {k: v for k, v in (("title", title), ("description", description)) if v is not None}
+        if not values:
+            return self.get(idea_id)
+        stmt = (
+            update(Idea)
+            .where(Idea.id == idea_id)
+            .values(**values)
+            .returning(Idea)
+            .execution_options(synchronize_session=False)
+        )
+        return self.db.scalar(stmt)
+
+    def delete_by_id(self, idea_id: int) -> bool:
+        """Delete an idea and its votes without loading either into the session."""
+        self.db.execute(delete(Vote).where(Vote.idea_id == idea_id).execution_options(synchronize_session=False))
+        stmt = delete(Idea).where(Idea.id == idea_id).returning(Idea.id).execution_options(synchronize_session=False)
+        return self.db.scalar(stmt) is not None
+
     def get(self, idea_id: int) -> Optional[Idea]:
         return self.db.get(Idea, idea_id)
 
+    def get_many(self, idea_ids: Iterable[int]) -> list[Idea]:
+        ids = set(idea_ids)
+        if not ids:
+            return []
+        # populate_existing: ideas already in the session get the committed counts, not stale ones
+        stmt = select(Idea).where(Idea.id.in_(ids)).execution_options(populate_existing=True)
+        return list(self.db.scalars(stmt).all())
+
+    def existing_ids(self, idea_ids: Iterable[int]) -> set[int]:
+        ids = set(idea_ids)
+        if not ids:
+            return set()
+        return set(self.db.scalars(select(Idea.id).where(Idea.id.in_(ids))).all())
+
     def get_by_title(self, title: str) -> Optional[Idea]:
         stmt = select(Idea).where(Idea.title == title)
         return self.db.scalar(stmt)
@@ -34,12 +107,252 @@ class IdeaRepository:
         return idea
 
     def delete(self, idea: Idea) -> None:
-        self.db.delete(idea)
+        """Delete an idea and its votes with two statements, however many votes it has.
+
+        ``session.delete`` would load every vote for the relationship cascade first.
+        """
+        self.db.execute(delete(Vote).where(Vote.idea_id == idea.id).execution_options(synchronize_session=False))
+        self.db.execute(delete(Idea).where(Idea.id == idea.id).execution_options(synchronize_session=False))
+        self.db.expunge(idea)
 
     def votes_count(self, idea_id: int) -> int:
-        stmt = select(func.count(Vote.id)).where(Vote.idea_id == idea_id)
+        stmt = select(Idea.votes_count).where(Idea.id == idea_id)
         return int(self.db.scalar(stmt) or 0)
 
+    def votes_counts(self, idea_ids: Iterable[int]) -> dict[int, int]:
+        """votes_count per existing idea, in one IN query; unknown ids are left out."""
+        ids = set(idea_ids)
+        if not ids:
+            return {}
+        return dict(self.db.execute(select(Idea.id, Idea.votes_count).where(Idea.id.in_(ids))).tuples().all())
+
+    def adjust_votes_count(self, idea_id: int, delta: int) -> Optional[Idea]:
+        """Atomically add delta to votes_count; returns the updated idea (None if no such idea).
+
+        Callers commit it together with the vote row. updated_at is pinned so that voting
+        does not look like an edit of the idea; voted_at records the change instead.
+        """
+        stmt = (
+            update(Idea)
+            .where(Idea.id == idea_id)
+            .values(
+                votes_count=Idea.votes_count + delta,
+                votes_version=Idea.votes_version + 1,
+                updated_at=Idea.updated_at,
+                voted_at=datetime.utcnow(),
+            )
+            .returning(Idea)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        return self.db.scalar(stmt)
+
+    def adjust_votes_counts(self, deltas: Mapping[int, int]) -> None:
+        """Apply many counter deltas in one executemany round trip."""
+        if not deltas:
+            return
+        ideas = Idea.__table__
+        stmt = (
+            update(ideas)
+            .where(ideas.c.id == bindparam("b_id"))
+            .values(
+                votes_count=ideas.c.votes_count + bindparam("b_delta"),
+                votes_version=ideas.c.votes_version + 1,
+                updated_at=ideas.c.updated_at,
+                voted_at=datetime.utcnow(),
+            )
+        )
+        self.db.connection().execute(stmt, [{"b_id": k, "b_delta": v} for k, v in deltas.items()])
+
+    def _recounted_votes(self):
+        return select(func.count(Vote.id)).where(Vote.idea_id == Idea.id).correlate(Idea).scalar_subquery()
+
+    def find_votes_count_drift(self) -> list[tuple[int, int, int]]:
+        """Return (idea_id, stored, actual) for every idea whose votes_count disagrees with `votes`."""
+        actual = self._recounted_votes()
+        stmt = select(Idea.id, Idea.votes_count, actual).where(Idea.votes_count != actual).order_by(Idea.id)
+        return [(int(r[0]), int(r[1]), int(r[2])) for r in self.db.execute(stmt).all()]
+
+    def repair_votes_count(self) -> int:
+        """Recount votes_count from `votes` for drifted ideas. Returns the number of ideas fixed."""
+        actual = self._recounted_votes()
+        stmt = (
+            update(Idea)
+            .where(Idea.votes_count != actual)
+            .values(
+                votes_count=actual,
+                votes_version=Idea.votes_version + 1,
+                updated_at=Idea.updated_at,
+                voted_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = self.db.execute(stmt)
+        return int(result.rowcount or 0)
+
+    @staticmethod
+    def _sort_column(sort: str):
+        return Idea.votes_count if sort == "votes" else Idea.created_at
+
+    def _apply_search(self, stmt: Select, q: str) -> tuple[Select, ColumnElement]:
+        """Restrict stmt to ideas matching q via the full-text index; also return a relevance score.
+
+        Higher scores are better. SEARCH_VOTE_BOOST adds a per-vote bonus on top of text relevance.
+        """
+        terms = _SEARCH_TERM.findall(q)
+        if not terms:
+            return stmt.where(false()), literal(0.0)
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "sqlite":
+            match = " ".join(f'"{t}"*' for t in terms)
+            stmt = stmt.join(ideas_fts, ideas_fts.c.rowid == Idea.id).where(ideas_fts_match.op("MATCH")(match))
+            # FTS5's rank is bm25(), where more negative means more relevant
+            score: ColumnElement = -ideas_fts.c.rank
+        elif dialect == "postgresql":
+            query = func.to_tsquery(literal_column(f"'{TS_CONFIG}'::regconfig"), " & ".join(f"{t}:*" for t in terms))
+            stmt = stmt.where(search_vector.bool_op("@@")(query))
+            score = func.ts_rank(search_vector, query)
+        else:
+            like = f"%{q}%"
+            stmt = stmt.where((Idea.title.ilike(like)) | (Idea.description.ilike(like)))
+            score = literal(0.0)
+        boost = get_settings().SEARCH_VOTE_BOOST
+        if boost:
+            score = score + boost * Idea.votes_count
+        return stmt, score
+
+    def _trending_scores(self) -> Subquery:
+        """Subquery of (idea_id, score) for ideas with a positive time-decayed score.
+
+        Each hourly bucket of the last TRENDING_WINDOW_HOURS counts
+        ``0.5 ** (age / TRENDING_HALF_LIFE_HOURS)`` per vote, so only the window's rollup
+        rows are read, however long the vote history.
+        """
+        settings = get_settings()
+        window = max(settings.TRENDING_WINDOW_HOURS, 1)
+        half_life = settings.TRENDING_HALF_LIFE_HOURS
+        now = current_hour()
+        weight = case(
+            {now - age: 0.5 ** (age / half_life) for age in range(window)}, value=VoteRollup.hour, else_=0.0
+        )
+        score = func.sum(VoteRollup.votes * weight)
+        # grouping on an expression keeps SQLite on the hour index instead of walking the
+        # whole primary key in idea_id order
+        idea_id = VoteRollup.idea_id + 0
+        return (
+            select(idea_id.label("idea_id"), score.label("score"))
+            .where(VoteRollup.hour > now - window)
+            .group_by(idea_id)
+            .having(score > 0)
+            .subquery()
+        )
+
+    def _trending_page(self, stmt: Select, *, page: int, size: int, projected: bool) -> list:
+        """One offset page of stmt by trending score, then the unscored ideas newest first.
+
+        The scored ideas come from a join driven by the recent rollups and the rest from the
+        id index, so neither query sorts the whole ideas table.
+        """
+        fetch = self.db.execute if projected else self.db.scalars
+        recent = self._trending_scores()
+        offset = (page - 1) * size
+        scored = stmt.join(recent, recent.c.idea_id == Idea.id)
+        items = list(fetch(scored.order_by(desc(recent.c.score), desc(Idea.id)).offset(offset).limit(size)).all())
+        if len(items) == size:
+            return items
+        if items or not offset:
+            skip = 0
+        else:
+            counted = select(func.count()).select_from(scored.with_only_columns(Idea.id).subquery())
+            skip = offset - int(self.db.scalar(counted) or 0)
+        unscored = stmt.where(Idea.id.not_in(select(recent.c.idea_id))).order_by(desc(Idea.id))
+        return items + list(fetch(unscored.offset(max(skip, 0)).limit(size - len(items))).all())
+
+    def _paginate(
+        self,
+        stmt: Select,
+        *,
+        page: int,
+        size: int,
+        sort: str,
+        order: str,
+        cursor: Optional[str],
+        score: Optional[ColumnElement] = None,
+        projected: bool = False,
+    ) -> tuple[list, Optional[str]]:
+        """Order by (sort column, id) and return one page plus the cursor for the next one.
+
+        With a cursor the page starts right after the encoded (value, id) position, so the
+        database walks the index from there instead of skipping ``(page - 1) * size`` rows.
+        sort="relevance" orders by the search score (``order="desc"`` puts the best match
+        first) and only supports page offsets.
+        ``projected`` statements select columns rather than the entity and yield Row tuples.
+        """
+        fetch = self.db.execute if projected else self.db.scalars
+        if sort == "relevance":
+            if cursor is not None:
+                raise InvalidCursorError("cursor pagination is not available for sort=relevance")
+            direction = desc if order == "desc" else asc
+            stmt = stmt.order_by(direction(score), direction(Idea.id)).offset((page - 1) * size).limit(size)
+            return list(fetch(stmt).all()), None
+        col = self._sort_column(sort)
+        key = tuple_(col, Idea.id)
+        if cursor is not None:
+            after = decode_cursor(cursor, sort=sort, order=order)
+            bound = tuple_(after.value, after.id)
+            stmt = stmt.where(key < bound if order == "desc" else key > bound)
+        if order == "desc":
+            stmt = stmt.order_by(desc(col), desc(Idea.id))
+        else:
+            stmt = stmt.order_by(asc(col), asc(Idea.id))
+        if cursor is None:
+            stmt = stmt.offset((page - 1) * size)
+
+        # one extra row tells us whether a next page exists
+        items = list(fetch(stmt.limit(size + 1)).all())
+        next_cursor = None
+        if len(items) > size:
+            items = items[:size]
+            last = items[-1]
+            value = last.votes_count if sort == "votes" else last.created_at
+            next_cursor = encode_cursor(Cursor(sort=sort, order=order, value=value, id=last.id))
+        return items, next_cursor
+
+    @staticmethod
+    def _select(columns: Optional[Sequence[str]], sort: str) -> Select:
+        """select(Idea), or just the named columns plus the id and sort key that paging needs."""
+        if columns is None:
+            return select(Idea)
+        names = dict.fromkeys(["id", *columns, "votes_count" if sort == "votes" else "created_at"])
+        return select(*(getattr(Idea, name) for name in names))
+
+    def _filtered(
+        self, q: Optional[str], columns: Optional[Sequence[str]] = None, sort: str = "created_at"
+    ) -> tuple[Select, Optional[ColumnElement]]:
+        stmt: Select = self._select(columns, sort)
+        if q:
+            return self._apply_search(stmt, q)
+        return stmt, None
+
+    def count_matching(self, q: Optional[str] = None) -> int:
+        stmt, _ = self._filtered(q)
+        total_stmt = select(func.count()).select_from(stmt.with_only_columns(Idea.id).subquery())
+        return int(self.db.scalar(total_stmt) or 0)
+
+    def estimate_count(self) -> Optional[int]:
+        """Cheap approximate number of ideas, or None when no estimate is available.
+
+        Postgres reads the planner's row estimate; SQLite uses the highest rowid, an upper
+        bound that only drifts by the number of deleted ideas.
+        """
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            estimate = self.db.scalar(text("SELECT reltuples FROM pg_class WHERE oid = 'ideas'::regclass"))
+            # -1 until the table has been vacuumed/analyzed at least once
+            return int(estimate) if estimate is not None and estimate >= 0 else None
+        if dialect == "sqlite":
+            return int(self.db.scalar(select(func.max(Idea.id))) or 0)
+        return None
+
     def list_paginated(
         self,
         *,
@@ -48,51 +361,59 @@ class IdeaRepository:
         q: Optional[str] = None,
         sort: str = "created_at",
         order: str = "desc",
-    ) -> tuple[list[Idea], int]:
+        cursor: Optional[str] = None,
+        with_total: bool = True,
+        columns: Optional[Sequence[str]] = None,
+    ) -> tuple[list, Optional[int], Optional[str]]:
+        """One page of ideas and the next cursor, plus the total when ``with_total``.
+
+        With ``columns`` (Idea attribute names) only those columns are loaded and the items
+        are Row tuples instead of Idea entities.
+        """
         page = max(page, 1)
         size = max(min(size, 100), 1)
+        if not q and sort == "relevance":
+            sort = "created_at"
 
-        votes_ct = select(func.count(Vote.id)).where(Vote.idea_id == Idea.id).correlate(Idea).scalar_subquery()
-
-        stmt: Select = select(Idea, votes_ct.label("votes_count"))
+        total = self.count_matching(q) if with_total else None
 
-        if q:
-            like = f"%{q}%"
-            stmt = stmt.where((Idea.title.ilike(like)) | (Idea.description.ilike(like)))
+        if sort == "trending":
+            if cursor is not None:
+                raise InvalidCursorError("cursor pagination is not available for sort=trending")
+            stmt = self._select(columns, sort)
+            if q:
+                # a precomputed id set rather than a join, so the rollup scores drive the query
+                matching, _ = self._apply_search(select(Idea.id), q)
+                stmt = stmt.where(Idea.id.in_(matching.correlate(None)))
+            return self._trending_page(stmt, page=page, size=size, projected=columns is not None), total, None
 
-        total_stmt = select(func.count()).select_from(stmt.subquery())
-        total = int(self.db.scalar(total_stmt) or 0)
+        stmt, score = self._filtered(q, columns, sort)
 
-        if sort == "votes":
-            order_clause = desc("votes_count") if order == "desc" else asc("votes_count")
-        else:
-            col = Idea.created_at
-            order_clause = desc(col) if order == "desc" else asc(col)
-
-        stmt = stmt.order_by(order_clause).offset((page - 1) * size).limit(size)
+        items, next_cursor = self._paginate(
+            stmt,
+            page=page,
+            size=size,
+            sort=sort,
+            order=order,
+            cursor=cursor,
+            score=score,
+            projected=columns is not None,
+        )
+        return items, total, next_cursor
 
-        rows = self.db.execute(stmt).all()
-        items = [row[0] for row in rows]
-        # attach a transient attribute for votes_count to map into schema
-        for row, item in zip(rows, items):
-            setattr(item, "votes_count", int(row[1]))
-        return items, total
+    def top_n(self, limit: int) -> list[Idea]:
+        stmt = select(Idea).order_by(desc(Idea.votes_count), desc(Idea.id)).limit(limit)
+        return list(self.db.scalars(stmt).all())
 
-    def top(self, *, page: int, size: int) -> list[Idea]:
+    def top(
+        self, *, page: int, size: int, cursor: Optional[str] = None, columns: Optional[Sequence[str]] = None
+    ) -> tuple[list, Optional[str]]:
         page = max(page, 1)
         size = max(min(size, 100), 1)
-        votes_ct = select(func.count(Vote.id)).where(Vote.idea_id == Idea.id).correlate(Idea).scalar_subquery()
-        stmt = (
-            select(Idea, votes_ct.label("votes_count"))
-            .order_by(desc("votes_count"))
-            .offset((page - 1) * size)
-            .limit(size)
+        stmt = self._select(columns, "votes")
+        return self._paginate(
+            stmt, page=page, size=size, sort="votes", order="desc", cursor=cursor, projected=columns is not None
         )
-        rows = self.db.execute(stmt).all()
-        items = [row[0] for row in rows]
-        for row, item in zip(rows, items):
-            setattr(item, "votes_count", int(row[1]))
-        return items
 
 
 class VoteRepository:
@@ -105,7 +426,34 @@ class VoteRepository:
         self.db.flush()
         return vote
 
+    def insert_ignoring_duplicate(self, idea_id: int, voter: Optional[str]) -> bool:
+        """INSERT ... ON CONFLICT (idea_id, voter) DO NOTHING; False if the voter already voted."""
+        stmt = (
+            upsert_insert(self.db, Vote)
+            .values(idea_id=idea_id, voter=voter)
+            .on_conflict_do_nothing(index_elements=[Vote.idea_id, Vote.voter])
+            .returning(Vote.id)
+        )
+        return self.db.scalar(stmt) is not None
+
     def exists_for_voter(self, idea_id: int, voter: str) -> bool:
         stmt = select(Vote.id).where(Vote.idea_id == idea_id, Vote.voter == voter)
         return self.db.scalar(stmt) is not None
 
+    def create_many(self, rows: list[dict]) -> None:
+        """Insert {"idea_id", "voter"} rows as one multi-row executemany."""
+        if rows:
+            self.db.execute(insert(Vote), rows)
+
+    def existing_pairs(self, pairs: Iterable[tuple[int, str]]) -> set[tuple[int, str]]:
+        wanted = set(pairs)
+        if not wanted:
+            return set()
+        stmt = select(Vote.idea_id, Vote.voter).where(tuple_(Vote.idea_id, Vote.voter).in_(wanted))
+        return {(int(r[0]), r[1]) for r in self.db.execute(stmt).all()}
+
+    def delete_for_voter(self, idea_id: int, voter: str) -> Optional[datetime]:
+        """Delete the voter's vote; returns its created_at, or None if there was none."""
+        stmt = delete(Vote).where(Vote.idea_id == idea_id, Vote.voter == voter).returning(Vote.created_at)
+        return self.db.scalar(stmt)
+
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Position after the last row of a page: the sort key value plus the id tiebreaker."""
+
+    sort: str
+    order: str
+    value: Any
+    id: int
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    value = cursor.value.isoformat() if isinstance(cursor.value, datetime) else cursor.value
+    raw = json.dumps([cursor.sort, cursor.order, value, cursor.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, *, sort: str, order: str) -> Cursor:
+    """Decode an opaque cursor, checking it was issued for the same sort/order."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        c_sort, c_order, value, idea_id = json.loads(raw)
+        if c_sort == "created_at":
+            value = datetime.fromisoformat(value)
+        elif not isinstance(value, int):
+            raise TypeError(value)
+        if not isinstance(idea_id, int):
+            raise TypeError(idea_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise InvalidCursorError("malformed cursor") from exc
+    if (c_sort, c_order) != (sort, order):
+        raise InvalidCursorError("cursor was issued for a different sort order")
+    return Cursor(sort=c_sort, order=c_order, value=value, id=idea_id)
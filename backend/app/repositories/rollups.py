@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Mapping, Optional
+
+from sqlalchemy import BigInteger, ColumnElement, Integer, bindparam, cast, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..models import Vote, VoteRollup
+from .dialects import supports_fast_writes, upsert_insert
+
+
+def current_hour() -> int:
+    """The current UTC hour bucket (hours since the Unix epoch)."""
+    return int(time.time() // 3600)
+
+
+def hour_start(hour: int) -> datetime:
+    """The naive UTC datetime at which an hour bucket begins (created_at columns are naive UTC)."""
+    return datetime.fromtimestamp(hour * 3600, timezone.utc).replace(tzinfo=None)
+
+
+def hour_of(moment: datetime) -> int:
+    """The hour bucket a naive UTC datetime (e.g. a vote's created_at) falls in."""
+    return int(moment.replace(tzinfo=timezone.utc).timestamp() // 3600)
+
+
+def _hour_of(db: Session, column) -> ColumnElement:
+    if db.get_bind().dialect.name == "postgresql":
+        seconds = cast(func.extract("epoch", column), BigInteger)
+    else:
+        seconds = cast(func.strftime("%s", column), Integer)
+    return seconds // 3600
+
+
+class VoteRollupRepository:
+    """Hourly per-idea vote counts (vote_rollups).
+
+    Vote writes call ``record`` in their own transaction, so trending reads a few hundred
+    bucket rows instead of scanning `votes`. ``rebuild`` recomputes recent buckets from the
+    surviving `votes` rows for backfills and repairs.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record(self, deltas: Mapping[int, int], hour: Optional[int] = None) -> None:
+        """Add per-idea vote deltas (unvotes are negative) to an hour's bucket; the caller commits."""
+        hour = current_hour() if hour is None else hour
+        rows = [{"idea_id": idea_id, "hour": hour, "votes": d} for idea_id, d in deltas.items() if d]
+        if not rows:
+            return
+        table = VoteRollup.__table__
+        if supports_fast_writes(self.db):
+            stmt = upsert_insert(self.db, table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.idea_id, table.c.hour], set_={"votes": table.c.votes + stmt.excluded.votes}
+            )
+            self.db.connection().execute(stmt, rows)
+            return
+        # no upsert: find the existing buckets, then one executemany each for updates and inserts
+        existing = set(
+            self.db.scalars(select(table.c.idea_id).where(table.c.hour == hour, table.c.idea_id.in_(deltas)))
+        )
+        bumps = [{"b_idea_id": r["idea_id"], "b_votes": r["votes"]} for r in rows if r["idea_id"] in existing]
+        if bumps:
+            stmt = (
+                update(table)
+                .where(table.c.idea_id == bindparam("b_idea_id"), table.c.hour == hour)
+                .values(votes=table.c.votes + bindparam("b_votes"))
+            )
+            self.db.connection().execute(stmt, bumps)
+        new = [r for r in rows if r["idea_id"] not in existing]
+        if new:
+            self.db.execute(insert(table), new)
+
+    def delete_for_idea(self, idea_id: int) -> None:
+        self.db.execute(delete(VoteRollup).where(VoteRollup.idea_id == idea_id))
+
+    def rebuild(self, since_hour: int) -> int:
+        """Replace every bucket from ``since_hour`` on with counts from `votes`; returns the rows written."""
+        self.db.execute(delete(VoteRollup).where(VoteRollup.hour >= since_hour))
+        hour = _hour_of(self.db, Vote.created_at)
+        counts = (
+            select(Vote.idea_id, hour.label("hour"), func.count(Vote.id))
+            .where(Vote.created_at >= hour_start(since_hour))
+            .group_by(Vote.idea_id, hour)
+        )
+        result = self.db.execute(insert(VoteRollup).from_select(["idea_id", "hour", "votes"], counts))
+        return int(result.rowcount or 0)
+
+    def prune(self, before_hour: int) -> int:
+        """Drop buckets older than ``before_hour``; returns the number of rows deleted."""
+        result = self.db.execute(delete(VoteRollup).where(VoteRollup.hour < before_hour))
+        return int(result.rowcount or 0)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models import DBTableUser
+
+
+class UserProfileRepository:
+    """Profile rows in ``user_entries``, looked up through the unique ``user_id`` index."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_user_id(self, user_id: str) -> Optional[DBTableUser]:
+        return self.db.scalar(select(DBTableUser).where(DBTableUser.user_id == user_id))
+
+    def get_many(self, user_ids: Iterable[str]) -> list[DBTableUser]:
+        ids = set(user_ids)
+        if not ids:
+            return []
+        return list(self.db.scalars(select(DBTableUser).where(DBTableUser.user_id.in_(ids))).all())
+
+    def create(self, user_id: str, **fields: Any) -> DBTableUser:
+        profile = DBTableUser(user_id=user_id, **fields)
+        self.db.add(profile)
+        self.db.flush()
+        return profile
+
+    def update(self, profile: DBTableUser, **fields: Any) -> DBTableUser:
+        for key, value in fields.items():
+            setattr(profile, key, value)
+        self.db.flush()
+        return profile
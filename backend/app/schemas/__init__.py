@@ -1,4 +1,20 @@
-from .idea import IdeaCreate, IdeaUpdate, IdeaRead, VoteCreate, VoteCount, PaginatedIdeas
+from .idea import (
+    IdeaCreate,
+    IdeaUpdate,
+    IdeaRead,
+    VoteCreate,
+    VoteCount,
+    PaginatedIdeas,
+    IdeaFields,
+    PaginatedIdeaFields,
+    IdeaBatchResponse,
+    VoteBatchItem,
+    VoteBatchCreate,
+    VoteBatchResult,
+    VoteBatchResponse,
+)
+
+from .user import UserBatchResponse
 
 __all__ = [
     "IdeaCreate",
@@ -7,5 +23,13 @@ __all__ = [
     "VoteCreate",
     "VoteCount",
     "PaginatedIdeas",
+    "IdeaFields",
+    "PaginatedIdeaFields",
+    "IdeaBatchResponse",
+    "VoteBatchItem",
+    "VoteBatchCreate",
+    "VoteBatchResult",
+    "VoteBatchResponse",
+    "UserBatchResponse",
 ]
 
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -35,6 +35,34 @@ class VoteCreate(BaseModel):
     voter: Optional[str] = Field(default=None, max_length=120)
 
 
+class VoteBatchItem(BaseModel):
+    idea_id: int
+    voter: Optional[str] = Field(default=None, max_length=120)
+
+
+class VoteBatchCreate(BaseModel):
+    votes: list[VoteBatchItem] = Field(min_length=1, max_length=10000)
+
+
+class VoteBatchResult(BaseModel):
+    idea_id: int
+    voter: Optional[str] = None
+    status: Literal["created", "duplicate", "not_found"]
+
+
+class VoteBatchResponse(BaseModel):
+    results: list[VoteBatchResult]
+    created: int
+    duplicate: int
+    not_found: int
+
+
+class IdeaBatchResponse(BaseModel):
+    # one entry per requested id, in request order; null where the idea does not exist
+    items: list[Optional[IdeaRead]]
+    missing: list[int]
+
+
 class VoteCount(BaseModel):
     idea_id: int
     votes_count: int
@@ -42,7 +70,25 @@ class VoteCount(BaseModel):
 
 class PaginatedIdeas(BaseModel):
     items: list[IdeaRead]
-    total: int
+    # None when the client asked for include_total=false
+    total: Optional[int] = None
+    total_is_estimate: bool = False
     page: int
     size: int
+    # Opaque keyset cursor for the page after this one; None on the last page.
+    next_cursor: Optional[str] = None
+
+
+class IdeaFields(BaseModel):
+    # An IdeaRead projected by ?fields=: the id plus only the requested keys are present.
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    votes_count: Optional[int] = None
+
+
+class PaginatedIdeaFields(PaginatedIdeas):
+    items: list[IdeaFields]
 
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+from ..models.Responsemodels import UserRead
+
+
+class UserBatchResponse(BaseModel):
+    # one entry per requested user_id, in request order; null where there is no profile
+    items: list[Optional[UserRead]]
+    missing: list[str]
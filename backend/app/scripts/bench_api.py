@@ -0,0 +1,240 @@
+"""Latency and throughput of the main API routes, in process, with JSON baselines.
+
+Usage, from the backend directory, against a database loaded by app.scripts.seed_bench:
+
+    DATABASE_URL=sqlite:///./bench.db python -m app.scripts.bench_api --save benchmarks/sqlite-100k.json
+    DATABASE_URL=sqlite:///./bench.db python -m app.scripts.bench_api --compare benchmarks/sqlite-100k.json
+    DATABASE_URL=sqlite:///./bench.db python -m app.scripts.bench_api --only list --requests 500
+
+Requests go through the ASGI app (lifespan included) over httpx's in-process transport, so
+routing, dependencies, caching and serialization are measured but no sockets are. Each
+scenario sends --requests requests from --concurrency clients: GET /ideas for every
+sort/order/q combination, /ideas/top, /ideas/{id}, then the writes (vote, create).
+Pages (1 to PAGES) and ids (any seeded id) are drawn from a seeded RNG. The response
+cache is off (RESPONSE_CACHE_BACKEND=none) unless --cache is given, so the timings are
+the queries' own rather than cache hits. Writes add rows; reseed for strictly comparable runs. --compare exits 1 when a p50 or throughput drifts past --tolerance,
+or a p99 past --p99-tolerance, in the wrong direction.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import sqlite3
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+import httpx
+from sqlalchemy import func, select
+
+from ..core import db as db_module
+from ..core.settings import get_settings
+from ..main import create_app
+from ..models import Idea, Vote
+
+SORTS = ("created_at", "votes", "relevance", "trending")
+ORDERS = ("desc", "asc")
+QUERIES = (None, "garden")
+# pages are drawn from 1..PAGES: deep enough that repeats are rare and offsets vary
+PAGES = 250
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+def scenarios(max_id: int, rng: random.Random) -> dict[str, Request]:
+    """Name -> coroutine sending request number n; read scenarios first, writes last."""
+    token = uuid.uuid4().hex[:8]
+    found: dict[str, Request] = {}
+    for sort in SORTS:
+        for order in ORDERS:
+            for q in QUERIES:
+                params = {"sort": sort, "order": order, "size": 20, **({"q": q} if q else {})}
+
+                async def list_ideas(client, n, params=params):
+                    return await client.get("/api/v1/ideas", params={**params, "page": rng.randint(1, PAGES)})
+
+                found[f"list sort={sort} order={order} q={q or '-'}"] = list_ideas
+
+    async def top(client, n):
+        return await client.get("/api/v1/ideas/top", params={"size": 20, "page": rng.randint(1, PAGES)})
+
+    async def get_idea(client, n):
+        return await client.get(f"/api/v1/ideas/{rng.randint(1, max_id)}")
+
+    async def vote(client, n):
+        return await client.post(f"/api/v1/ideas/{rng.randint(1, max_id)}/vote", json={"voter": f"bench-{token}-{n}"})
+
+    async def create_idea(client, n):
+        return await client.post("/api/v1/ideas", json={"title": f"Bench {token} {n}", "description": "benchmark"})
+
+    found.update({"top": top, "get_idea": get_idea, "vote": vote, "create_idea": create_idea})
+    return found
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    return ordered[min(len(ordered) - 1, max(math.ceil(pct / 100 * len(ordered)) - 1, 0))]
+
+
+async def _measure(
+    client: httpx.AsyncClient, send: Request, requests: int, concurrency: int, first: int = 0
+) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    # request numbers keep voters and titles unique across the warm-up and the timed run
+    counter = iter(range(first, first + requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for n in counter:
+            started = time.perf_counter()
+            response = await send(client, n)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+            # the read-your-writes cookie would route every later read past the cache
+            client.cookies.clear()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "rps": round(requests / elapsed, 1),
+    }
+
+
+def dataset() -> dict:
+    with db_module.SessionLocal() as db:
+        return {
+            "ideas": int(db.scalar(select(func.count()).select_from(Idea)) or 0),
+            "votes": int(db.scalar(select(func.count()).select_from(Vote)) or 0),
+            "max_id": int(db.scalar(select(func.max(Idea.id))) or 0),
+        }
+
+
+async def _run(requests: int, concurrency: int, only: Optional[str], seed: int) -> dict:
+    data = dataset()
+    if not data["ideas"]:
+        raise SystemExit("no ideas in DATABASE_URL; load some with python -m app.scripts.seed_bench")
+    app = create_app()
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, send in scenarios(data["max_id"], random.Random(seed)).items():
+                if only and only not in name:
+                    continue
+                # a few untimed requests warm connections and the leaderboard
+                await _measure(client, send, min(requests, 10), 1, first=requests)
+                results[name] = await _measure(client, send, requests, concurrency)
+    settings = get_settings()
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "database": db_module.engine.dialect.name,
+            "ideas": data["ideas"],
+            "votes": data["votes"],
+            "requests": requests,
+            "concurrency": concurrency,
+            "settings": {
+                "DB_MODE": settings.DB_MODE,
+                "STORAGE_PROFILE": settings.STORAGE_PROFILE,
+                "FAST_WRITES": settings.FAST_WRITES,
+                "RESPONSE_CACHE_BACKEND": settings.RESPONSE_CACHE_BACKEND,
+                "LEADERBOARD_ENABLED": settings.LEADERBOARD_ENABLED,
+            },
+        },
+        "results": results,
+    }
+
+
+def run(*, requests: int = 200, concurrency: int = 4, only: Optional[str] = None, seed: int = 1) -> dict:
+    return asyncio.run(_run(requests, concurrency, only, seed))
+
+
+def compare(current: dict, baseline: dict, *, tolerance: float, p99_tolerance: float) -> list[dict]:
+    """One row per scenario and metric present in both runs; ``regressed`` marks drifts past tolerance."""
+    rows = []
+    for name, now in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        for metric, limit, higher_is_better in (
+            ("p50_ms", tolerance, False),
+            ("p99_ms", p99_tolerance, False),
+            ("rps", tolerance, True),
+        ):
+            before, after = base[metric], now[metric]
+            change = (after - before) / before if before else 0.0
+            regressed = change < -limit / (1 + limit) if higher_is_better else change > limit
+            rows.append(
+                {
+                    "scenario": name,
+                    "metric": metric,
+                    "baseline": before,
+                    "current": after,
+                    "change": change,
+                    "regressed": regressed,
+                }
+            )
+    return rows
+
+
+def _print_results(results: dict) -> None:
+    print(f"{'scenario':<46} {'p50 ms':>8} {'p99 ms':>8} {'req/s':>8} {'errors':>6}")
+    for name, r in results.items():
+        print(f"{name:<46} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['rps']:>8.1f} {r['errors']:>6}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the API in process against DATABASE_URL")
+    parser.add_argument("--requests", type=int, default=200, help="timed requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=4, help="concurrent in-process clients")
+    parser.add_argument("--only", help="run the scenarios whose name contains this text")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cache", action="store_true", help="keep the configured response cache on")
+    parser.add_argument("--save", type=Path, help="write the results to this JSON baseline")
+    parser.add_argument("--compare", type=Path, help="flag regressions against this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p50 / throughput drift (0.25 = 25%%)")
+    parser.add_argument("--p99-tolerance", type=float, default=0.5)
+    args = parser.parse_args(argv)
+    if not args.cache:
+        os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+        get_settings.cache_clear()  # type: ignore[attr-defined]
+
+    result = run(requests=args.requests, concurrency=args.concurrency, only=args.only, seed=args.seed)
+    meta = result["meta"]
+    print(f"{meta['database']}: {meta['ideas']:,} ideas, {meta['votes']:,} votes, concurrency {meta['concurrency']}")
+    _print_results(result["results"])
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(result, indent=2) + "\n")
+        print(f"saved {args.save}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        rows = compare(result, baseline, tolerance=args.tolerance, p99_tolerance=args.p99_tolerance)
+        regressions = [row for row in rows if row["regressed"]]
+        for row in regressions:
+            change = f"{row['change']:+.0%}"
+            print(f"REGRESSION {row['scenario']} {row['metric']}: {row['baseline']} -> {row['current']} ({change})")
+        print(f"{len(regressions)} regression(s) against {args.compare}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
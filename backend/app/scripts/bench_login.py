@@ -0,0 +1,124 @@
+"""Sustained logins per second, and idea-list latency while logins run.
+
+Usage, from the backend directory:
+
+    python -m app.scripts.bench_login                    # inline vs. process-pool hashing
+    python -m app.scripts.bench_login --workers 4 --login-threads 16 --seconds 10
+
+Each scenario runs the real app in process against a scratch SQLite file. Login threads
+hit POST /users/login back to back while one probe thread times GET /ideas. The numbers
+in the README were produced with the defaults.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..core import db as db_module
+from ..core.db import Base, _create_engine
+from ..core.settings import get_settings
+from ..main import create_app
+from ..services.passwords import password_hasher
+
+
+@contextmanager
+def _scratch_app(workers: int) -> Iterator[TestClient]:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    saved = {k: os.environ.get(k) for k in ("DATABASE_URL", "PASSWORD_HASH_WORKERS", "LEADERBOARD_ENABLED")}
+    os.environ.update(DATABASE_URL=f"sqlite:///{path}", PASSWORD_HASH_WORKERS=str(workers), LEADERBOARD_ENABLED="false")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    engine = _create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    original = db_module.engine, db_module.SessionLocal
+    db_module.engine = engine
+    db_module.SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False, class_=Session)
+    try:
+        with TestClient(create_app()) as client:
+            yield client
+    finally:
+        password_hasher.shutdown()
+        db_module.engine, db_module.SessionLocal = original
+        engine.dispose()
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        get_settings.cache_clear()  # type: ignore[attr-defined]
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+
+def run_scenario(*, workers: Optional[int], login_threads: int, seconds: float) -> dict:
+    """workers=None measures list latency with no logins at all (the baseline)."""
+    with _scratch_app(workers or 0) as client:
+        for n in range(200):
+            client.post("/api/v1/ideas", json={"title": f"Idea {n}", "description": "bench"})
+        client.post("/api/v1/users", json={"username": "bench", "password": "correct horse"})
+
+        stop = threading.Event()
+        logins = [0] * login_threads
+        latencies: list[float] = []
+
+        def log_in(slot: int) -> None:
+            while not stop.is_set():
+                res = client.post("/api/v1/users/login", json={"username": "bench", "password": "correct horse"})
+                assert res.status_code == 200, res.text
+                logins[slot] += 1
+
+        def probe() -> None:
+            while not stop.is_set():
+                started = time.perf_counter()
+                client.get("/api/v1/ideas", params={"size": 20})
+                latencies.append(time.perf_counter() - started)
+                time.sleep(0.01)
+
+        threads = [threading.Thread(target=probe)]
+        if workers is not None:
+            threads += [threading.Thread(target=log_in, args=(n,)) for n in range(login_threads)]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "hashing": "none" if workers is None else ("inline" if workers == 0 else f"pool({workers})"),
+        "logins_per_s": round(sum(logins) / elapsed, 1),
+        "list_p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "list_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark password hashing against idea-list latency")
+    parser.add_argument("--workers", type=int, default=get_settings().PASSWORD_HASH_WORKERS)
+    parser.add_argument("--login-threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    print(f"{'hashing':<10} {'logins/s':>9} {'list p50 ms':>12} {'list p95 ms':>12}")
+    for workers in (None, 0, args.workers):
+        r = run_scenario(workers=workers, login_threads=args.login_threads, seconds=args.seconds)
+        print(f"{r['hashing']:<10} {r['logins_per_s']:>9} {r['list_p50_ms']:>12} {r['list_p95_ms']:>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Compare the old and new serialization of a GET /ideas page.
+
+Usage, from the backend directory:
+
+    python -m app.scripts.bench_serialization               # 100-item pages
+    python -m app.scripts.bench_serialization --size 20 --rounds 2000
+
+"pydantic" is the path the route used before: IdeaRead.model_validate per row, then
+FastAPI's response_model validation and serialization of PaginatedIdeas, then stdlib JSON.
+"fast" is what the route does now: list_response dicts encoded by json_response. Both
+run on ORM rows fresh from the database and on cached snapshots.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..api.v1.ideas import list_response
+from ..api.v1.serialization import json_response
+from ..core.db import Base, _create_engine
+from ..main import create_app  # noqa: F401  registers every model before create_all
+from ..repositories.ideas import IdeaRepository
+from ..schemas import IdeaRead, PaginatedIdeas
+from ..services.cache import snapshot
+from ..services.ideas import IdeaService
+
+_page_adapter = TypeAdapter(PaginatedIdeas)
+
+
+def pydantic_body(rows, size: int) -> bytes:
+    content = {
+        "items": [IdeaRead.model_validate(r) for r in rows],
+        "total": len(rows),
+        "total_is_estimate": False,
+        "page": 1,
+        "size": size,
+        "next_cursor": None,
+    }
+    # what FastAPI's serialize_response does with response_model=PaginatedIdeas
+    value = _page_adapter.dump_python(_page_adapter.validate_python(content, from_attributes=True), mode="json")
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def fast_body(rows, size: int) -> bytes:
+    body = list_response(rows, len(rows), False, page=1, size=size, next_cursor=None)
+    return json_response(body, Response()).body
+
+
+def _time(fn, rows, size: int, rounds: int) -> float:
+    fn(rows, size)  # warm up
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn(rows, size)
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def run(*, size: int, rounds: int) -> list[dict]:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = _create_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(engine)
+        factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False, class_=Session)
+        with factory() as db:
+            service = IdeaService(db)
+            for n in range(size):
+                service.create_idea(title=f"Idea number {n}", description="Some words about it. " * 5)
+        with factory() as db:
+            rows, _, _ = IdeaRepository(db).list_paginated(
+                page=1, size=size, q=None, sort="created_at", order="desc", with_total=False
+            )
+            snapshots = [snapshot(r) for r in rows]
+            assert json.loads(pydantic_body(rows, size)) == json.loads(fast_body(rows, size))
+            results = []
+            for source, items in (("ORM rows", rows), ("cached", snapshots)):
+                old = _time(pydantic_body, items, size, rounds)
+                new = _time(fast_body, items, size, rounds)
+                results.append({"source": source, "pydantic_ms": old, "fast_ms": new, "speedup": old / new})
+            return results
+    finally:
+        engine.dispose()
+        os.unlink(path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark idea list serialization")
+    parser.add_argument("--size", type=int, default=100, help="items per page")
+    parser.add_argument("--rounds", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    print(f"{'source':<10} {'pydantic ms':>12} {'fast ms':>8} {'speedup':>8}")
+    for r in run(size=args.size, rounds=args.rounds):
+        print(f"{r['source']:<10} {r['pydantic_ms']:>12.3f} {r['fast_ms']:>8.3f} {r['speedup']:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
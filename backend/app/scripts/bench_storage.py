@@ -0,0 +1,100 @@
+"""Compare storage profiles on a concurrent vote workload against a scratch SQLite file.
+
+Usage, from the backend directory:
+
+    python -m app.scripts.bench_storage                      # all profiles
+    python -m app.scripts.bench_storage --profile balanced --threads 16 --votes 500
+
+Each worker thread casts single votes, one commit each, through IdeaService, and
+then reads the idea list. The numbers in the README were produced with the defaults.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..core.db import Base, _create_engine
+from ..core.settings import STORAGE_PROFILES
+from ..services.ideas import IdeaService
+
+
+def run_profile(name: str, *, threads: int, votes: int) -> dict:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = _create_engine(f"sqlite:///{path}", STORAGE_PROFILES[name])
+    try:
+        Base.metadata.create_all(engine)
+        factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False, class_=Session)
+        with factory() as db:
+            idea_ids = [IdeaService(db).create_idea(title=f"Idea {n}", description="").id for n in range(50)]
+
+        latencies: list[float] = []
+        errors = 0
+        lock = threading.Lock()
+
+        def worker(n: int) -> None:
+            nonlocal errors
+            local, failed = [], 0
+            with factory() as db:
+                service = IdeaService(db)
+                for i in range(votes):
+                    started = time.perf_counter()
+                    try:
+                        service.vote(idea_ids[i % len(idea_ids)], voter=f"w{n}-{i}")
+                    except OperationalError:
+                        db.rollback()
+                        failed += 1
+                    local.append(time.perf_counter() - started)
+                for _ in range(votes // 10):
+                    service.list_ideas(page=1, size=20, q=None, sort="votes", order="desc")
+            with lock:
+                latencies.extend(local)
+                errors += failed
+
+        started = time.perf_counter()
+        pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+    latencies.sort()
+    return {
+        "profile": name,
+        "votes_per_s": round(threads * votes / elapsed),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        "locked_errors": errors,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark storage profiles on a scratch SQLite database")
+    parser.add_argument("--profile", choices=sorted(STORAGE_PROFILES), action="append")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--votes", type=int, default=250, help="votes per thread")
+    args = parser.parse_args(argv)
+
+    print(f"{'profile':<12} {'votes/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'locked':>7}")
+    for name in args.profile or list(STORAGE_PROFILES):
+        r = run_profile(name, threads=args.threads, votes=args.votes)
+        print(f"{r['profile']:<12} {r['votes_per_s']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['locked_errors']:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
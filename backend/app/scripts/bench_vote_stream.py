@@ -0,0 +1,138 @@
+"""Many idle live-count subscribers on one worker: memory, fan-out latency and SQL reads.
+
+Usage, from the backend directory:
+
+    python -m app.scripts.bench_vote_stream                       # 10000 subscribers
+    python -m app.scripts.bench_vote_stream --subscribers 50000 --ideas 100 --bursts 5
+
+Subscribers are spread over --ideas ideas. Each one is a coroutine consuming
+Subscription.changes(), the loop behind the SSE and WebSocket routes, without any
+sockets. Each burst casts one vote on every idea from a request thread; latency runs
+from the last commit until the last subscriber has seen its new count, so it includes
+the rest of the VOTE_STREAM_INTERVAL_MS coalescing window. The numbers in
+the README were produced with the defaults.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from ..core import db as db_module
+from ..core.db import Base, _create_engine
+from ..main import create_app  # noqa: F401  registers every model before create_all
+from ..services import vote_stream as vote_stream_module
+from ..services.ideas import IdeaService
+from ..services.vote_stream import vote_stream
+
+
+async def _run(idea_ids: list[int], subscribers: int, bursts: int) -> dict:
+    loads = 0
+    real_load = vote_stream_module.load_counts
+
+    def counting_load(ids):
+        nonlocal loads
+        loads += 1
+        return real_load(ids)
+
+    vote_stream_module.load_counts = counting_load
+    try:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        subs = [await vote_stream.subscribe(idea_ids[n % len(idea_ids)]) for n in range(subscribers)]
+        subscribe_s = time.perf_counter() - started
+        done = asyncio.Event()
+        expected, remaining = 0, 0
+
+        async def client(n: int) -> None:
+            nonlocal remaining
+            async for count in subs[n].changes():
+                if count == expected:
+                    remaining -= 1
+                    if remaining == 0:
+                        done.set()
+
+        tasks = [asyncio.create_task(client(n)) for n in range(subscribers)]
+        await asyncio.sleep(0)
+        per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / subscribers
+        tracemalloc.stop()
+
+        latencies = []
+        loads = 0
+        for burst in range(1, bursts + 1):
+            expected, remaining, done = burst, subscribers, asyncio.Event()
+            await run_in_threadpool(_vote_all, idea_ids, burst)
+            started = time.perf_counter()
+            await done.wait()
+            latencies.append(time.perf_counter() - started)
+        for task in tasks:
+            task.cancel()
+        for sub in subs:
+            vote_stream.unsubscribe(sub)
+        return {
+            "subscribers": subscribers,
+            "subscribe_ms": subscribe_s * 1000,
+            "bytes_per_subscriber": per_subscriber,
+            "fanout_ms": statistics.median(latencies) * 1000,
+            "sql_reads_per_burst": loads / bursts,
+        }
+    finally:
+        vote_stream_module.load_counts = real_load
+        vote_stream.stop()
+
+
+def _vote_all(idea_ids: list[int], burst: int) -> None:
+    with db_module.SessionLocal() as db:
+        service = IdeaService(db)
+        for idea_id in idea_ids:
+            service.vote(idea_id, voter=f"burst-{burst}")
+
+
+def run(*, subscribers: int, ideas: int, bursts: int) -> dict:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = _create_engine(f"sqlite:///{path}")
+    original = db_module.engine, db_module.SessionLocal
+    db_module.engine = engine
+    db_module.SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False, class_=Session)
+    try:
+        Base.metadata.create_all(engine)
+        with db_module.SessionLocal() as db:
+            service = IdeaService(db)
+            idea_ids = [service.create_idea(title=f"Idea {n}", description="").id for n in range(ideas)]
+        return asyncio.run(_run(idea_ids, subscribers, bursts))
+    finally:
+        db_module.engine, db_module.SessionLocal = original
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark live vote-count fan-out to idle subscribers")
+    parser.add_argument("--subscribers", type=int, default=10_000)
+    parser.add_argument("--ideas", type=int, default=20)
+    parser.add_argument("--bursts", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    r = run(subscribers=args.subscribers, ideas=args.ideas, bursts=args.bursts)
+    print(f"subscribers          {r['subscribers']}")
+    print(f"subscribe all (ms)   {r['subscribe_ms']:.0f}")
+    print(f"memory / subscriber  {r['bytes_per_subscriber']:.0f} B")
+    print(f"fan-out p50 (ms)     {r['fanout_ms']:.1f}")
+    print(f"SQL reads / burst    {r['sql_reads_per_burst']:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
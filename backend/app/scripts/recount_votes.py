@@ -0,0 +1,40 @@
+"""Check (and optionally repair) the denormalized ideas.votes_count column.
+
+Usage, from the backend directory:
+
+    python -m app.scripts.recount_votes           # report drift, exit 1 if any
+    python -m app.scripts.recount_votes --repair  # recount drifted ideas from `votes`
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+
+from ..core.db import SessionLocal
+from ..repositories.ideas import IdeaRepository
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Verify ideas.votes_count against the votes table")
+    parser.add_argument("--repair", action="store_true", help="rewrite drifted counts from the votes table")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        repo = IdeaRepository(db)
+        drift = repo.find_votes_count_drift()
+        for idea_id, stored, actual in drift:
+            print(f"idea {idea_id}: stored={stored} actual={actual}")
+        if not drift:
+            print("votes_count is consistent")
+            return 0
+        if not args.repair:
+            print(f"{len(drift)} idea(s) drifted; re-run with --repair to fix")
+            return 1
+        fixed = repo.repair_votes_count()
+        db.commit()
+        print(f"repaired {fixed} idea(s)")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Rebuild recent hourly vote rollups from `votes` and prune old ones.
+
+Vote writes keep vote_rollups current on their own; run this after bulk imports or
+direct edits to `votes`, or periodically to drop buckets trending no longer reads.
+
+Usage, from the backend directory:
+
+    python -m app.scripts.rollup_votes                       # rebuild the trending window
+    python -m app.scripts.rollup_votes --rebuild-hours 720   # rebuild the last 30 days
+    python -m app.scripts.rollup_votes --rebuild-hours 0 --prune-hours 168  # only prune
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+
+from ..core.db import SessionLocal
+from ..core.settings import get_settings
+from ..repositories.rollups import VoteRollupRepository, current_hour
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain the hourly vote_rollups table")
+    parser.add_argument(
+        "--rebuild-hours",
+        type=int,
+        default=get_settings().TRENDING_WINDOW_HOURS,
+        help="recount this many recent hours from the votes table (0 skips the rebuild)",
+    )
+    parser.add_argument("--prune-hours", type=int, default=None, help="delete buckets older than this many hours")
+    args = parser.parse_args(argv)
+
+    now = current_hour()
+    with SessionLocal() as db:
+        repo = VoteRollupRepository(db)
+        if args.rebuild_hours > 0:
+            written = repo.rebuild(now - args.rebuild_hours + 1)
+            print(f"rebuilt {written} bucket(s) covering the last {args.rebuild_hours} hour(s)")
+        if args.prune_hours is not None:
+            pruned = repo.prune(now - args.prune_hours + 1)
+            print(f"pruned {pruned} bucket(s) older than {args.prune_hours} hour(s)")
+        db.commit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""Bulk-load a large synthetic dataset for the API benchmarks (app.scripts.bench_api).
+
+Usage, from the backend directory:
+
+    DATABASE_URL=sqlite:///./bench.db python -m app.scripts.seed_bench                  # 100k ideas, 2M votes
+    DATABASE_URL=sqlite:///./bench.db python -m app.scripts.seed_bench --ideas 1000000 --votes 50000000
+
+Rows go in through Core ``executemany`` in chunks, one transaction per chunk, with no ORM
+objects. Votes per idea follow a Zipf-like curve, so `sort=votes` and `/top` see a long
+tail. ideas.votes_count, ideas.voted_at and the recent vote_rollups buckets are computed
+while generating, so the loaded database is consistent without a recount. The same
+--seed always produces the same rows, apart from timestamps relative to now.
+The target database must not contain ideas yet.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Iterator
+
+from sqlalchemy import Engine, bindparam, func, insert, select, update
+
+from ..core import db as db_module
+from ..core.db import Base
+from ..main import create_app  # noqa: F401  registers every model before create_all
+from ..models import Idea, Vote, VoteRollup
+from ..repositories.rollups import current_hour
+
+# Vote buckets this recent are written to vote_rollups, like the 0007 migration's backfill.
+ROLLUP_HOURS = 30 * 24
+
+_WORDS = (
+    "garden solar bike library market music river school coffee park bridge tram night "
+    "forest repair share kitchen studio festival map clinic bakery ferry rooftop compost"
+).split()
+
+
+def _vote_counts(rng: random.Random, ideas: int, votes: int) -> list[int]:
+    # Zipf-like with exponent 1, shuffled so popularity does not follow id order
+    weights = [1.0 / rank for rank in range(1, ideas + 1)]
+    scale = votes / sum(weights)
+    counts = [int(w * scale) for w in weights]
+    for i in range(votes - sum(counts)):
+        counts[i % ideas] += 1
+    rng.shuffle(counts)
+    return counts
+
+
+def _utc(ts: float) -> datetime:
+    # created_at columns hold naive UTC
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+
+
+def _ideas(rng: random.Random, counts: list[int], created: list[float]) -> Iterator[dict]:
+    for n, (count, ts) in enumerate(zip(counts, created), start=1):
+        words = rng.sample(_WORDS, 3)
+        yield {
+            "id": n,
+            "title": f"{' '.join(words).capitalize()} {n}",
+            "description": " ".join(rng.choices(_WORDS, k=rng.randint(5, 60))),
+            "created_at": _utc(ts),
+            "updated_at": _utc(ts),
+            "votes_count": count,
+        }
+
+
+def _chunks(rows: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    chunk: list[dict] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def seed(engine: Engine, *, ideas: int, votes: int, days: int = 365, seed: int = 1, chunk: int = 20_000) -> dict:
+    """Create the schema if needed and load the dataset; returns row counts and timings."""
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        if conn.scalar(select(func.count()).select_from(Idea)):
+            raise SystemExit("refusing to seed: the database already has ideas")
+
+    rng = random.Random(seed)
+    counts = _vote_counts(rng, ideas, votes)
+    now = time.time()
+    span = days * 86400
+    created = [now - span * (ideas - n) / ideas for n in range(1, ideas + 1)]
+    timings = {}
+
+    started = time.perf_counter()
+    for rows in _chunks(_ideas(rng, counts, created), chunk):
+        with engine.begin() as conn:
+            conn.execute(insert(Idea), rows)
+    timings["ideas_s"] = time.perf_counter() - started
+
+    rollups: Counter = Counter()
+    rollup_from = current_hour() - ROLLUP_HOURS + 1
+    voted_at: list[dict] = []
+
+    def vote_rows() -> Iterator[dict]:
+        for idea_id, (count, start) in enumerate(zip(counts, created), start=1):
+            if not count:
+                continue
+            stamps = sorted(start + rng.random() * (now - start) for _ in range(count))
+            for k, stamp in enumerate(stamps):
+                hour = int(stamp // 3600)
+                if hour >= rollup_from:
+                    rollups[(idea_id, hour)] += 1
+                yield {"idea_id": idea_id, "voter": f"u{k}", "created_at": _utc(stamp)}
+            voted_at.append({"b_id": idea_id, "b_voted_at": _utc(stamps[-1])})
+
+    started = time.perf_counter()
+    loaded = 0
+    for rows in _chunks(vote_rows(), chunk):
+        with engine.begin() as conn:
+            conn.execute(insert(Vote), rows)
+        loaded += len(rows)
+        if loaded % (chunk * 50) < chunk:
+            print(f"  {loaded:,} votes", file=sys.stderr)
+    timings["votes_s"] = time.perf_counter() - started
+
+    ideas_table = Idea.__table__
+    set_voted_at = (
+        update(ideas_table).where(ideas_table.c.id == bindparam("b_id")).values(voted_at=bindparam("b_voted_at"))
+    )
+    rollup_rows = [{"idea_id": i, "hour": h, "votes": v} for (i, h), v in rollups.items()]
+    for rows in _chunks(iter(voted_at), chunk):
+        with engine.begin() as conn:
+            conn.execute(set_voted_at, rows)
+    for rows in _chunks(iter(rollup_rows), chunk):
+        with engine.begin() as conn:
+            conn.execute(insert(VoteRollup), rows)
+    return {"ideas": ideas, "votes": votes, "rollups": len(rollup_rows), **timings}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Seed DATABASE_URL with a large synthetic dataset")
+    parser.add_argument("--ideas", type=int, default=100_000)
+    parser.add_argument("--votes", type=int, default=2_000_000)
+    parser.add_argument("--days", type=int, default=365, help="spread idea creation over this many days")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--chunk", type=int, default=20_000, help="rows per executemany / transaction")
+    args = parser.parse_args(argv)
+
+    r = seed(db_module.engine, ideas=args.ideas, votes=args.votes, days=args.days, seed=args.seed, chunk=args.chunk)
+    print(f"ideas    {r['ideas']:,} in {r['ideas_s']:.1f} s")
+    print(f"votes    {r['votes']:,} in {r['votes_s']:.1f} s ({r['votes'] / max(r['votes_s'], 1e-9):,.0f}/s)")
+    print(f"rollups  {r['rollups']:,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
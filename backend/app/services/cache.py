@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import importlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Optional, Protocol
+
+from ..core.settings import get_settings
+from ..schemas import IdeaRead
+from .events import IdeaCreated, IdeaDeleted, IdeaUpdated, VotesChanged, idea_events
+
+
+class CacheBackend(Protocol):
+    """Storage for ResponseCache.
+
+    Counters version whole namespaces: ``incr`` must be atomic and counters must never be
+    evicted. Implement this over an external store (e.g. Redis GET/SET EX/DEL, and
+    INCR/GET on persistent keys) and point RESPONSE_CACHE_BACKEND at a ``module:factory``
+    that builds it from the settings.
+    """
+
+    def get(self, key: str) -> Optional[Any]: ...
+
+    def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def counter(self, key: str) -> int: ...
+
+    def incr(self, key: str) -> int: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict[str, int]: ...
+
+
+class LRUTTLCache:
+    """In-process backend: least-recently-used eviction at ``max_entries``, per-entry TTL."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max(max_entries, 1)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._counters: dict[str, int] = {}
+        self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+            self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+
+class CachedIdea(IdeaRead):
+    """Immutable snapshot of an idea as cached; voted_at keeps conditional GETs exact."""
+
+    voted_at: Optional[datetime] = None
+
+
+def snapshot(idea: Any) -> CachedIdea:
+    return idea if isinstance(idea, CachedIdea) else CachedIdea.model_validate(idea)
+
+
+# Namespaces whose entries are all dropped by any write (one version counter each).
+LISTS = "list"
+TOP = "top"
+
+
+class ResponseCache:
+    """Read-through cache for IdeaService reads, invalidated by idea events.
+
+    Detail entries are keyed per idea and deleted when that idea changes. List and top pages
+    depend on many ideas, so their keys embed a namespace version that every write bumps;
+    superseded entries are never read again and age out through LRU/TTL.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._backend: Optional[CacheBackend] = None
+        self._configured = False
+
+    @property
+    def backend(self) -> Optional[CacheBackend]:
+        with self._lock:
+            if not self._configured:
+                self._backend = _build_backend()
+                self._configured = True
+            return self._backend
+
+    def reset(self) -> None:
+        with self._lock:
+            backend, self._backend, self._configured = self._backend, None, False
+        if backend is not None:
+            backend.clear()
+
+    def _get_or_load(self, backend: CacheBackend, key: str, load: Callable[[], Any], fill: bool) -> Any:
+        value = backend.get(key)
+        if value is None:
+            value = load()
+            if value is not None and fill:
+                backend.set(key, value, get_settings().RESPONSE_CACHE_TTL_SECONDS)
+        return value
+
+    def idea(self, idea_id: int, load: Callable[[], Any], *, fill: bool = True) -> Any:
+        """The cached idea, else ``load()``; the loaded value is stored only when ``fill``."""
+        backend = self.backend
+        if backend is None:
+            return load()
+        key = f"idea:{idea_id}"
+        value = backend.get(key)
+        if value is None:
+            writes = backend.counter("v:idea")
+            value = load()
+            # skip the fill if an idea changed meanwhile: the loaded row may predate it
+            if value is not None and fill and backend.counter("v:idea") == writes:
+                backend.set(key, value, get_settings().RESPONSE_CACHE_TTL_SECONDS)
+        return value
+
+    def page(self, namespace: str, params: tuple, load: Callable[[], Any], *, fill: bool = True) -> Any:
+        backend = self.backend
+        if backend is None:
+            return load()
+        version = backend.counter(f"v:{namespace}")
+        return self._get_or_load(backend, f"{namespace}:{version}:" + "|".join(map(str, params)), load, fill)
+
+    def invalidate_idea(self, idea_id: int) -> None:
+        backend = self.backend
+        if backend is not None:
+            backend.incr("v:idea")
+            backend.delete(f"idea:{idea_id}")
+
+    def invalidate_collections(self) -> None:
+        backend = self.backend
+        if backend is not None:
+            for namespace in (LISTS, TOP):
+                backend.incr(f"v:{namespace}")
+
+    def stats(self) -> dict[str, int]:
+        backend = self.backend
+        return backend.stats() if backend is not None else {}
+
+
+def _build_backend() -> Optional[CacheBackend]:
+    settings = get_settings()
+    name = settings.RESPONSE_CACHE_BACKEND
+    if name == "none" or settings.RESPONSE_CACHE_TTL_SECONDS <= 0:
+        return None
+    if name == "memory":
+        return LRUTTLCache(settings.RESPONSE_CACHE_MAX_ENTRIES)
+    module, _, factory = name.partition(":")
+    return getattr(importlib.import_module(module), factory)(settings)
+
+
+response_cache = ResponseCache()
+
+
+def _on_idea_changed(event: IdeaCreated | IdeaUpdated | IdeaDeleted) -> None:
+    response_cache.invalidate_idea(event.idea_id)
+    response_cache.invalidate_collections()
+
+
+def _on_votes_changed(event: VotesChanged) -> None:
+    for idea_id in event.idea_ids:
+        response_cache.invalidate_idea(idea_id)
+    response_cache.invalidate_collections()
+
+
+for _event_type in (IdeaCreated, IdeaUpdated, IdeaDeleted):
+    idea_events.subscribe(_event_type, _on_idea_changed)
+idea_events.subscribe(VotesChanged, _on_votes_changed)
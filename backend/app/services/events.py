@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IdeaCreated:
+    idea_id: int
+
+
+@dataclass(frozen=True)
+class IdeaUpdated:
+    idea_id: int
+
+
+@dataclass(frozen=True)
+class IdeaDeleted:
+    idea_id: int
+
+
+@dataclass(frozen=True)
+class VotesChanged:
+    idea_ids: frozenset[int]
+
+
+E = TypeVar("E")
+
+
+class EventBus:
+    """Synchronous in-process publish/subscribe for committed idea writes.
+
+    IdeaService publishes after each commit; caches and other derived state subscribe to
+    the event types they depend on instead of being called from every write path. Handlers
+    run on the publishing thread and must be quick; a failing handler is logged and does
+    not affect the write or the other handlers.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._handlers: dict[type, list[Callable]] = defaultdict(list)
+
+    def subscribe(self, event_type: type[E], handler: Callable[[E], None]) -> None:
+        with self._lock:
+            self._handlers[event_type].append(handler)
+
+    def unsubscribe(self, event_type: type[E], handler: Callable[[E], None]) -> None:
+        with self._lock:
+            if handler in self._handlers[event_type]:
+                self._handlers[event_type].remove(handler)
+
+    def publish(self, event: object) -> None:
+        with self._lock:
+            handlers = list(self._handlers[type(event)])
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception:
+                logger.exception("handler for %s failed", type(event).__name__)
+
+
+idea_events = EventBus()
@@ -1,12 +1,24 @@
 from __future__ import annotations
 
+from collections import Counter
 from typing import Optional, Tuple
 
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from ..core import db as db_module
+from ..core.query_budget import QueryBudget
+from ..core.settings import get_settings
 from ..models import Idea
-from ..repositories.ideas import IdeaRepository, VoteRepository
+from ..repositories.ideas import IdeaRepository, VoteRepository, supports_fast_writes
+from ..repositories.rollups import VoteRollupRepository, hour_of
+from ..schemas import IdeaRead
+from .leaderboard import leaderboard
+from .cache import LISTS, TOP, response_cache, snapshot
+from .events import IdeaCreated, IdeaDeleted, IdeaUpdated, VotesChanged, idea_events
+from .totals import totals_cache
+from .versions import may_lag  # importing versions subscribes the collection version to idea events
+from .vote_buffer import VoteBuffer
 
 
 class IdeaAlreadyExistsError(Exception):
@@ -21,68 +33,308 @@ class IdeaNotFoundError(Exception):
     pass
 
 
+class VoteNotFoundError(Exception):
+    pass
+
+
+# Per-vote outcomes of batched ingestion
+VOTE_CREATED = "created"
+VOTE_DUPLICATE = "duplicate"
+VOTE_NOT_FOUND = "not_found"
+
+
 class IdeaService:
     def __init__(self, db: Session):
         self.db = db
         self.ideas = IdeaRepository(db)
         self.votes = VoteRepository(db)
+        self.rollups = VoteRollupRepository(db)
+
+    def _cached(self) -> bool:
+        # recent writers read from the primary (read-your-writes); don't serve them cache entries
+        return not self.db.info.get("read_your_writes")
+
+    def _fills_cache(self) -> bool:
+        # a lagging replica's rows would be cached under the post-write namespace version
+        return not may_lag(self.db)
+
+    def _fast_writes(self) -> bool:
+        # single-statement writes that lean on the unique constraints instead of pre-checks
+        return get_settings().FAST_WRITES and supports_fast_writes(self.db)
 
     def create_idea(self, *, title: str, description: str) -> Idea:
-        if self.ideas.get_by_title(title):
-            raise IdeaAlreadyExistsError
-        idea = self.ideas.create(title=title, description=description)
-        self.db.commit()
-        self.db.refresh(idea)
+        if self._fast_writes():
+            idea = self.ideas.insert_returning(title=title, description=description)
+            if idea is None:
+                self.db.rollback()
+                raise IdeaAlreadyExistsError
+            self.db.commit()
+        else:
+            if self.ideas.get_by_title(title):
+                raise IdeaAlreadyExistsError
+            idea = self.ideas.create(title=title, description=description)
+            self.db.commit()
+            self.db.refresh(idea)
+        idea_events.publish(IdeaCreated(idea.id))
+        leaderboard.add(IdeaRead.model_validate(idea))
         return idea
 
     def update_idea(self, idea_id: int, *, title: Optional[str], description: Optional[str]) -> Idea:
-        idea = self.ideas.get(idea_id)
-        if not idea:
-            raise IdeaNotFoundError
-        if title and self.ideas.get_by_title(title) and idea.title != title:
-            raise IdeaAlreadyExistsError
-        self.ideas.update(idea, title=title, description=description)
-        self.db.commit()
-        self.db.refresh(idea)
+        if self._fast_writes():
+            try:
+                idea = self.ideas.update_returning(idea_id, title=title, description=description)
+            except IntegrityError:
+                self.db.rollback()
+                raise IdeaAlreadyExistsError
+            if idea is None:
+                raise IdeaNotFoundError
+            self.db.commit()
+        else:
+            idea = self.ideas.get(idea_id)
+            if not idea:
+                raise IdeaNotFoundError
+            if title and self.ideas.get_by_title(title) and idea.title != title:
+                raise IdeaAlreadyExistsError
+            self.ideas.update(idea, title=title, description=description)
+            self.db.commit()
+            self.db.refresh(idea)
+        idea_events.publish(IdeaUpdated(idea.id))
+        leaderboard.refresh(IdeaRead.model_validate(idea))
         return idea
 
     def delete_idea(self, idea_id: int) -> None:
-        idea = self.ideas.get(idea_id)
-        if not idea:
-            raise IdeaNotFoundError
-        self.ideas.delete(idea)
+        if self._fast_writes():
+            if not self.ideas.delete_by_id(idea_id):
+                self.db.rollback()
+                raise IdeaNotFoundError
+        else:
+            idea = self.ideas.get(idea_id)
+            if not idea:
+                raise IdeaNotFoundError
+            self.ideas.delete(idea)
+        self.rollups.delete_for_idea(idea_id)
         self.db.commit()
+        idea_events.publish(IdeaDeleted(idea_id))
+        leaderboard.remove(idea_id)
 
-    def list_ideas(self, *, page: int, size: int, q: Optional[str], sort: str, order: str):
-        return self.ideas.list_paginated(page=page, size=size, q=q, sort=sort, order=order)
+    def list_ideas(
+        self,
+        *,
+        page: int,
+        size: int,
+        q: Optional[str],
+        sort: str,
+        order: str,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact",
+        fields: Optional[tuple[str, ...]] = None,
+    ):
+        """Return (items, total, next_cursor, total_is_estimate).
 
-    def get_idea(self, idea_id: int) -> Idea:
-        idea = self.ideas.get(idea_id)
+        total_mode is "exact" (cached per q), "estimated" (cheap table estimate when unfiltered,
+        else the cached exact count) or "none" (skip counting; total is None). With ``fields``
+        only those columns are loaded and the items are rows carrying just those attributes.
+        """
+        if self._cached():
+            params = (page, size, totals_cache.key(q), sort, order, cursor, total_mode, fields)
+            return response_cache.page(
+                LISTS,
+                params,
+                lambda: self._list_ideas(page, size, q, sort, order, cursor, total_mode, fields),
+                fill=self._fills_cache(),
+            )
+        return self._list_ideas(page, size, q, sort, order, cursor, total_mode, fields)
+
+    def _list_ideas(self, page, size, q, sort, order, cursor, total_mode, fields):
+        items, _, next_cursor = self.ideas.list_paginated(
+            page=page, size=size, q=q, sort=sort, order=order, cursor=cursor, with_total=False, columns=fields
+        )
+        if fields is None:
+            items = [snapshot(i) for i in items]
+        if total_mode == "none":
+            return items, None, next_cursor, False
+        if total_mode == "estimated" and not totals_cache.key(q):
+            estimate = self.ideas.estimate_count()
+            if estimate is not None:
+                return items, estimate, next_cursor, True
+        return items, self.count_ideas(q), next_cursor, False
+
+    def count_ideas(self, q: Optional[str] = None) -> int:
+        total = totals_cache.get(q)
+        if total is None:
+            total = self.ideas.count_matching(q)
+            if self._fills_cache():
+                totals_cache.set(q, total)
+        return total
+
+    def get_idea(self, idea_id: int):
+        """The idea as an ORM row, or as a cached snapshot with the same attributes."""
+        if self._cached():
+            idea = response_cache.idea(idea_id, lambda: self._load_snapshot(idea_id), fill=self._fills_cache())
+        else:
+            idea = self.ideas.get(idea_id)
         if not idea:
             raise IdeaNotFoundError
-        # attach votes_count for response convenience
-        setattr(idea, "votes_count", self.ideas.votes_count(idea_id))
         return idea
 
+    def _load_snapshot(self, idea_id: int):
+        idea = self.ideas.get(idea_id)
+        return snapshot(idea) if idea is not None else None
+
+    def get_ideas(self, idea_ids: list[int]) -> list[Optional[Idea]]:
+        """One IN query; results follow the request order, with None for unknown ids."""
+        found = {idea.id: idea for idea in self.ideas.get_many(idea_ids)}
+        return [found.get(idea_id) for idea_id in idea_ids]
+
     def vote(self, idea_id: int, *, voter: Optional[str]) -> None:
+        if get_settings().VOTE_BUFFER_ENABLED:
+            status = vote_buffer.submit(idea_id, voter).result()
+            if status == VOTE_NOT_FOUND:
+                raise IdeaNotFoundError
+            if status == VOTE_DUPLICATE:
+                raise DuplicateVoteError
+            return
+        if self._fast_writes():
+            # bump the counter first: no row means no idea, and a conflicting insert rolls it back
+            idea = self.ideas.adjust_votes_count(idea_id, 1)
+            if idea is None:
+                self.db.rollback()
+                raise IdeaNotFoundError
+            if not self.votes.insert_ignoring_duplicate(idea_id, voter):
+                self.db.rollback()
+                raise DuplicateVoteError
+            self.rollups.record({idea_id: 1})
+            self.db.commit()
+            self._voted(idea)
+            return
         if not self.ideas.get(idea_id):
             raise IdeaNotFoundError
-        if voter:
+        if voter is not None:
             if self.votes.exists_for_voter(idea_id, voter):
                 raise DuplicateVoteError
-        self.votes.create(idea_id=idea_id, voter=voter)
         try:
+            self.votes.create(idea_id=idea_id, voter=voter)
+            idea = self.ideas.adjust_votes_count(idea_id, 1)
+            self.rollups.record({idea_id: 1})
             self.db.commit()
         except IntegrityError:
             self.db.rollback()
             # fallback if DB constraint triggered
             raise DuplicateVoteError
+        self._voted(idea)
 
-    def votes_count(self, idea_id: int) -> int:
+    def remove_vote(self, idea_id: int, *, voter: str) -> None:
         if not self.ideas.get(idea_id):
             raise IdeaNotFoundError
-        return self.ideas.votes_count(idea_id)
+        voted_at = self.votes.delete_for_voter(idea_id, voter)
+        if voted_at is None:
+            raise VoteNotFoundError
+        idea = self.ideas.adjust_votes_count(idea_id, -1)
+        # take the vote back out of the bucket it was counted in, as a rebuild would
+        self.rollups.record({idea_id: -1}, hour=hour_of(voted_at))
+        self.db.commit()
+        self._voted(idea)
+
+    def vote_batch(self, pairs: list[tuple[int, Optional[str]]]) -> list[str]:
+        """Ingest a large batch of votes, committing once per VOTE_BATCH_CHUNK_SIZE chunk."""
+        chunk = max(get_settings().VOTE_BATCH_CHUNK_SIZE, 1)
+        statuses: list[str] = []
+        for start in range(0, len(pairs), chunk):
+            # two lookups, three writes (up to five without upserts) and a re-read for the leaderboard
+            with QueryBudget(8, name="IdeaService.vote_batch chunk"):
+                statuses += self.ingest_votes(pairs[start : start + chunk])
+        return statuses
+
+    def ingest_votes(self, pairs: list[tuple[int, Optional[str]]]) -> list[str]:
+        """Record many (idea_id, voter) votes in one transaction; returns a status per pair.
+
+        Unknown ideas and already-cast votes are found with two set-based queries, new votes go
+        in with a single executemany and counters with one more. A unique-constraint race with
+        a concurrent writer rolls back and re-checks.
+        """
+        attempts = 3
+        for attempt in range(attempts):
+            try:
+                statuses, deltas = self._ingest_votes(pairs)
+                self.db.commit()
+                break
+            except IntegrityError:
+                self.db.rollback()
+                if attempt == attempts - 1:
+                    raise
+        if deltas:
+            idea_events.publish(VotesChanged(frozenset(deltas)))
+            for idea in self.ideas.get_many(deltas):
+                leaderboard.record_vote(IdeaRead.model_validate(idea), idea.votes_version)
+        return statuses
+
+    def _ingest_votes(self, pairs: list[tuple[int, Optional[str]]]) -> tuple[list[str], Counter]:
+        known = self.ideas.existing_ids(idea_id for idea_id, _ in pairs)
+        # "" is a named voter like any other: only None (anonymous) may vote twice
+        cast = self.votes.existing_pairs((i, v) for i, v in pairs if v is not None and i in known)
+        statuses: list[str] = []
+        rows: list[dict] = []
+        deltas: Counter = Counter()
+        for idea_id, voter in pairs:
+            if idea_id not in known:
+                statuses.append(VOTE_NOT_FOUND)
+                continue
+            if voter is not None:
+                if (idea_id, voter) in cast:
+                    statuses.append(VOTE_DUPLICATE)
+                    continue
+                # later duplicates within the same batch
+                cast.add((idea_id, voter))
+            rows.append({"idea_id": idea_id, "voter": voter})
+            deltas[idea_id] += 1
+            statuses.append(VOTE_CREATED)
+        self.votes.create_many(rows)
+        self.ideas.adjust_votes_counts(deltas)
+        self.rollups.record(deltas)
+        return statuses, deltas
+
+    def _voted(self, idea: Idea) -> None:
+        # propagate a committed vote change to the in-memory read structures
+        idea_events.publish(VotesChanged(frozenset([idea.id])))
+        leaderboard.record_vote(IdeaRead.model_validate(idea), idea.votes_version)
+
+    def votes_count(self, idea_id: int) -> int:
+        return self.get_idea(idea_id).votes_count
+
+    def top_ideas(
+        self, *, page: int, size: int, cursor: Optional[str] = None, fields: Optional[tuple[str, ...]] = None
+    ):
+        """Serve from the in-memory leaderboard when it covers the page, else from SQL.
+
+        ``fields`` narrows the SQL fallback to those columns; leaderboard pages are already
+        in memory and are returned whole.
+        """
+        if get_settings().LEADERBOARD_ENABLED:
+            # the leaderboard is shared state too: never load it from a lagging replica
+            if not leaderboard.loaded and self._fills_cache():
+                leaderboard.load(self.db)
+            served = leaderboard.page(page=page, size=size, cursor=cursor)
+            if served is not None:
+                return served
+        if self._cached():
+            return response_cache.page(
+                TOP,
+                (page, size, cursor, fields),
+                lambda: self._top_from_sql(page, size, cursor, fields),
+                fill=self._fills_cache(),
+            )
+        return self._top_from_sql(page, size, cursor, fields)
+
+    def _top_from_sql(self, page: int, size: int, cursor: Optional[str], fields: Optional[tuple[str, ...]]):
+        items, next_cursor = self.ideas.top(page=page, size=size, cursor=cursor, columns=fields)
+        if fields is None:
+            items = [snapshot(i) for i in items]
+        return items, next_cursor
+
+
+def _flush_buffered_votes(pairs: list[tuple[int, Optional[str]]]) -> list[str]:
+    with db_module.SessionLocal() as db:
+        return IdeaService(db).ingest_votes(pairs)
 
-    def top_ideas(self, *, page: int, size: int):
-        return self.ideas.top(page=page, size=size)
 
+vote_buffer = VoteBuffer(_flush_buffered_votes)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.settings import get_settings
+from ..models import Idea
+from .ideas import (
+    VOTE_DUPLICATE,
+    VOTE_NOT_FOUND,
+    DuplicateVoteError,
+    IdeaNotFoundError,
+    IdeaService,
+    vote_buffer,
+)
+
+
+class AsyncIdeaService:
+    """IdeaService for async routes.
+
+    Business logic is shared with IdeaService: each method runs it inside
+    ``AsyncSession.run_sync``, so database I/O is awaited on the event loop instead of
+    holding a threadpool slot. Buffered votes await the flush without blocking the loop.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _run(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        return await self.db.run_sync(lambda session: getattr(IdeaService(session), method)(*args, **kwargs))
+
+    async def create_idea(self, *, title: str, description: str) -> Idea:
+        return await self._run("create_idea", title=title, description=description)
+
+    async def update_idea(self, idea_id: int, *, title: Optional[str], description: Optional[str]) -> Idea:
+        return await self._run("update_idea", idea_id, title=title, description=description)
+
+    async def delete_idea(self, idea_id: int) -> None:
+        await self._run("delete_idea", idea_id)
+
+    async def list_ideas(self, **kwargs: Any):
+        return await self._run("list_ideas", **kwargs)
+
+    async def count_ideas(self, q: Optional[str] = None) -> int:
+        return await self._run("count_ideas", q)
+
+    async def get_idea(self, idea_id: int) -> Idea:
+        return await self._run("get_idea", idea_id)
+
+    async def get_ideas(self, idea_ids: list[int]) -> list[Optional[Idea]]:
+        return await self._run("get_ideas", idea_ids)
+
+    async def vote(self, idea_id: int, *, voter: Optional[str]) -> None:
+        if get_settings().VOTE_BUFFER_ENABLED:
+            status = await asyncio.wrap_future(vote_buffer.submit(idea_id, voter))
+            if status == VOTE_NOT_FOUND:
+                raise IdeaNotFoundError
+            if status == VOTE_DUPLICATE:
+                raise DuplicateVoteError
+            return
+        await self._run("vote", idea_id, voter=voter)
+
+    async def remove_vote(self, idea_id: int, *, voter: str) -> None:
+        await self._run("remove_vote", idea_id, voter=voter)
+
+    async def vote_batch(self, pairs: list[tuple[int, Optional[str]]]) -> list[str]:
+        return await self._run("vote_batch", pairs)
+
+    async def votes_count(self, idea_id: int) -> int:
+        return await self._run("votes_count", idea_id)
+
+    async def top_ideas(
+        self, *, page: int, size: int, cursor: Optional[str] = None, fields: Optional[tuple[str, ...]] = None
+    ):
+        return await self._run("top_ideas", page=page, size=size, cursor=cursor, fields=fields)
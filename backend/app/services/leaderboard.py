@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import sys
+import threading
+from typing import Optional
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from ..core import db as db_module
+from ..core.settings import get_settings
+from ..repositories.ideas import IdeaRepository
+from ..repositories.pagination import Cursor, decode_cursor, encode_cursor
+from ..schemas import IdeaRead
+
+logger = logging.getLogger(__name__)
+
+# Sort key with the best idea first: most votes, then newest id.
+Key = tuple[int, int]
+
+
+# votes_version recorded for deleted ideas; newer than any real snapshot
+_DELETED = sys.maxsize
+
+
+def _key(votes_count: int, idea_id: int) -> Key:
+    return (-votes_count, -idea_id)
+
+
+class Leaderboard:
+    """In-memory top-N of ideas by (votes_count, id), maintained as writes commit.
+
+    Holds up to LEADERBOARD_SIZE snapshots in sorted order. ``_floor`` is the best key any
+    untracked idea can have (None when every idea is tracked); entries are only admitted
+    when they beat it, so the tracked entries are always exactly the true top of the table.
+    Pages that reach past the tracked prefix return None and the caller falls back to SQL.
+
+    Vote callbacks carry the committed count with its ``votes_version``, which every
+    count change bumps in the same UPDATE. A snapshot replaces what is held only when its
+    version is newer, so commits applied in any order converge on the latest count.
+    Versions are remembered per idea until the next ``load`` (deleted ideas get
+    ``_DELETED``, so a late vote callback cannot bring them back).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._keys: list[Key] = []
+        self._ideas: dict[int, IdeaRead] = {}
+        self._versions: dict[int, int] = {}
+        self._floor: Optional[Key] = None
+        self._loaded = False
+        # callbacks seen while a load's query runs, replayed over its result
+        self._pending: Optional[dict[int, tuple[Optional[IdeaRead], int]]] = None
+        self._loading = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def load(self, db: Session) -> None:
+        """(Re)build from the database; also used for periodic reconciliation."""
+        capacity = max(get_settings().LEADERBOARD_SIZE, 1)
+        with self._lock:
+            self._loading += 1
+            if self._pending is None:
+                self._pending = {}
+        try:
+            # one extra row tells us whether anything is left untracked
+            rows = IdeaRepository(db).top_n(capacity + 1)
+            snapshots = [(IdeaRead.model_validate(r), r.votes_version) for r in rows]
+        finally:
+            with self._lock:
+                pending = self._pending or {}
+                self._loading -= 1
+                if not self._loading:
+                    self._pending = None
+        with self._lock:
+            self._floor = None
+            if len(snapshots) > capacity:
+                extra = snapshots[capacity][0]
+                self._floor = _key(extra.votes_count, extra.id)
+                snapshots = snapshots[:capacity]
+            self._keys = [_key(s.votes_count, s.id) for s, _ in snapshots]
+            self._ideas = {s.id: s for s, _ in snapshots}
+            self._versions = {s.id: version for s, version in snapshots}
+            self._loaded = True
+            for idea_id, (snapshot, version) in pending.items():
+                if snapshot is None:
+                    self._delete(idea_id)
+                else:
+                    self._apply(snapshot, version)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._keys, self._ideas, self._versions, self._floor, self._loaded = [], {}, {}, None, False
+            self._pending, self._loading = None, 0
+
+    def page(
+        self, *, page: int, size: int, cursor: Optional[str] = None
+    ) -> Optional[tuple[list[IdeaRead], Optional[str]]]:
+        """Serve a /ideas/top page from memory, or None if it is not fully covered."""
+        with self._lock:
+            if not self._loaded:
+                return None
+            if cursor is not None:
+                after = decode_cursor(cursor, sort="votes", order="desc")
+                start = bisect.bisect_right(self._keys, _key(after.value, after.id))
+            else:
+                start = (page - 1) * size
+            end = start + size
+            if end > len(self._keys) and self._floor is not None:
+                return None
+            items = [self._ideas[-k[1]] for k in self._keys[start:end]]
+            has_more = end < len(self._keys) or self._floor is not None
+        next_cursor = None
+        if items and has_more:
+            last = items[-1]
+            next_cursor = encode_cursor(Cursor(sort="votes", order="desc", value=last.votes_count, id=last.id))
+        return items, next_cursor
+
+    def _admit(self, snapshot: IdeaRead) -> None:
+        # caller holds the lock and has already removed any previous entry for this id
+        key = _key(snapshot.votes_count, snapshot.id)
+        if self._floor is not None and key >= self._floor:
+            # an untracked idea might outrank it; leave it to SQL
+            return
+        bisect.insort(self._keys, key)
+        self._ideas[snapshot.id] = snapshot
+        capacity = max(get_settings().LEADERBOARD_SIZE, 1)
+        while len(self._keys) > capacity:
+            evicted = self._keys.pop()
+            del self._ideas[-evicted[1]]
+            self._floor = evicted if self._floor is None else min(self._floor, evicted)
+
+    def _discard(self, idea_id: int) -> Optional[IdeaRead]:
+        current = self._ideas.pop(idea_id, None)
+        if current is not None:
+            key = _key(current.votes_count, current.id)
+            del self._keys[bisect.bisect_left(self._keys, key)]
+        return current
+
+    def _apply(self, snapshot: IdeaRead, version: int) -> None:
+        # caller holds the lock; snapshots older than the one already applied are dropped
+        if version <= self._versions.get(snapshot.id, -1):
+            return
+        self._versions[snapshot.id] = version
+        current = self._discard(snapshot.id)
+        if current is not None and current.updated_at > snapshot.updated_at:
+            # a text edit newer than this snapshot has already been refreshed in
+            snapshot = current.model_copy(update={"votes_count": snapshot.votes_count})
+        self._admit(snapshot)
+
+    def _delete(self, idea_id: int) -> None:
+        self._versions[idea_id] = _DELETED
+        self._discard(idea_id)
+
+    def add(self, snapshot: IdeaRead) -> None:
+        """A newly created idea (votes_version 0)."""
+        with self._lock:
+            # SQLite can hand a deleted idea's id to a new one; forget the old versions
+            self._versions.pop(snapshot.id, None)
+            if self._pending is not None:
+                self._pending[snapshot.id] = (snapshot, 0)
+            if self._loaded:
+                self._apply(snapshot, 0)
+
+    def refresh(self, snapshot: IdeaRead) -> None:
+        """An idea's text changed; keep its tracked position and count."""
+        with self._lock:
+            current = self._ideas.get(snapshot.id)
+            if current is not None:
+                self._ideas[snapshot.id] = snapshot.model_copy(update={"votes_count": current.votes_count})
+
+    def record_vote(self, snapshot: IdeaRead, version: int) -> None:
+        """A committed vote or unvote: the idea as committed, with its votes_version."""
+        with self._lock:
+            if self._pending is not None and version > self._pending.get(snapshot.id, (None, -1))[1]:
+                self._pending[snapshot.id] = (snapshot, version)
+            if self._loaded:
+                self._apply(snapshot, version)
+
+    def remove(self, idea_id: int) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending[idea_id] = (None, _DELETED)
+            self._delete(idea_id)
+
+
+leaderboard = Leaderboard()
+
+
+def reload_leaderboard() -> None:
+    with db_module.SessionLocal() as db:
+        leaderboard.load(db)
+
+
+async def refresh_leaderboard() -> None:
+    try:
+        await run_in_threadpool(reload_leaderboard)
+    except Exception:  # keep serving /ideas/top from SQL if the database is unavailable
+        logger.exception("leaderboard reload failed")
+
+
+async def run_reconciler(interval: float) -> None:
+    """Periodically rebuild the leaderboard so it converges with writes from other workers."""
+    while True:
+        await asyncio.sleep(interval)
+        await refresh_leaderboard()
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import secrets
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from ..core.security import ScryptParams, hash_password, needs_rehash, verify_password
+from ..core.settings import get_settings
+
+
+def current_params() -> ScryptParams:
+    settings = get_settings()
+    return ScryptParams(settings.PASSWORD_SCRYPT_N, settings.PASSWORD_SCRYPT_R, settings.PASSWORD_SCRYPT_P)
+
+
+class PasswordHasher:
+    """Runs scrypt in a bounded process pool so KDF bursts never occupy request threads.
+
+    PASSWORD_HASH_WORKERS caps how many hashes run at once (and the CPU/memory they use);
+    further requests queue for a worker. 0 hashes inline on the calling thread.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pool: Optional[Executor] = None
+        self._dummies: dict[ScryptParams, str] = {}
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        workers = get_settings().PASSWORD_HASH_WORKERS
+        if workers <= 0:
+            future: Future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=workers)
+            return self._pool.submit(fn, *args)
+
+    def hash(self, password: str) -> str:
+        return self._submit(hash_password, password, current_params()).result()
+
+    def verify(self, password: str, stored: str) -> bool:
+        return self._submit(verify_password, password, stored).result()
+
+    async def _run_async(self, fn: Callable, *args):
+        if get_settings().PASSWORD_HASH_WORKERS <= 0:
+            # "inline" means the request's thread, never the event loop
+            return await run_in_threadpool(fn, *args)
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async(hash_password, password, current_params())
+
+    async def verify_async(self, password: str, stored: Optional[str]) -> bool:
+        """Check password against stored; None (no such account) checks a dummy hash.
+
+        The dummy has the current cost parameters, so a login for an unknown username
+        takes as long as one for a real account and timing does not reveal which exist.
+        """
+        if stored is None:
+            await self._run_async(verify_password, password, await self._dummy_hash())
+            return False
+        return await self._run_async(verify_password, password, stored)
+
+    async def _dummy_hash(self) -> str:
+        params = current_params()
+        stored = self._dummies.get(params)
+        if stored is None:
+            stored = self._dummies[params] = await self.hash_async(secrets.token_urlsafe(16))
+        return stored
+
+    def needs_rehash(self, stored: str) -> bool:
+        return needs_rehash(stored, current_params())
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional
+
+from ..core.settings import get_settings
+from .events import IdeaCreated, IdeaDeleted, IdeaUpdated, idea_events
+
+
+class TotalsCache:
+    """Per-process cache of exact list totals keyed by the search string.
+
+    Entries are dropped when ideas are created or deleted (and search entries when an idea's
+    text changes); the TTL bounds staleness from writes made by other worker processes.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: dict[Optional[str], tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(q: Optional[str]) -> Optional[str]:
+        q = (q or "").strip().lower()
+        return q or None
+
+    def get(self, q: Optional[str]) -> Optional[int]:
+        key = self.key(q)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            total, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return total
+
+    def set(self, q: Optional[str], total: int) -> None:
+        ttl = get_settings().TOTALS_CACHE_TTL_SECONDS
+        if ttl <= 0:
+            return
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[self.key(q)] = (total, time.monotonic() + ttl)
+
+    def invalidate(self, *, searches_only: bool = False) -> None:
+        with self._lock:
+            if searches_only:
+                self._entries = {k: v for k, v in self._entries.items() if k is None}
+            else:
+                self._entries.clear()
+
+    def clear(self) -> None:
+        self.invalidate()
+
+
+totals_cache = TotalsCache()
+
+
+def _on_count_changed(event: IdeaCreated | IdeaDeleted) -> None:
+    totals_cache.invalidate()
+
+
+def _on_idea_updated(event: IdeaUpdated) -> None:
+    # an edit can move the idea in or out of search results, but not change the overall count
+    totals_cache.invalidate(searches_only=True)
+
+
+idea_events.subscribe(IdeaCreated, _on_count_changed)
+idea_events.subscribe(IdeaDeleted, _on_count_changed)
+idea_events.subscribe(IdeaUpdated, _on_idea_updated)
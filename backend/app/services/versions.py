@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from ..core.settings import get_settings
+from .events import IdeaCreated, IdeaDeleted, IdeaUpdated, VotesChanged, idea_events
+
+
+class CollectionVersion:
+    """Per-process version of the idea collection, bumped on every committed write.
+
+    List and top ETags are built from it, so conditional GETs can answer 304 before running
+    any query. The epoch keeps tags from different processes (or restarts) apart; the version
+    also rolls over every COLLECTION_VERSION_TTL_SECONDS, which bounds how long writes made by
+    other workers can go unnoticed.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._epoch = uuid.uuid4().hex[:8]
+        self._version = 0
+        self._changed_at = time.time()
+        self._written_at = 0.0
+
+    def bump(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._changed_at = self._written_at = time.time()
+
+    def quiet_for(self, seconds: float) -> bool:
+        """Whether this process has seen no write for ``seconds`` (TTL rollovers aside)."""
+        with self._lock:
+            return time.time() - self._written_at >= seconds
+
+    def current(self) -> tuple[str, datetime]:
+        """(opaque token, time of the last change) for the collection as this process sees it."""
+        ttl = get_settings().COLLECTION_VERSION_TTL_SECONDS
+        with self._lock:
+            if ttl > 0 and time.time() - self._changed_at >= ttl:
+                self._version += 1
+                self._changed_at = time.time()
+            return f"{self._epoch}.{self._version}", datetime.fromtimestamp(self._changed_at, timezone.utc)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._epoch = uuid.uuid4().hex[:8]
+            self._version = 0
+            self._changed_at = time.time()
+            self._written_at = 0.0
+
+
+collection_version = CollectionVersion()
+
+
+def may_lag(db) -> bool:
+    """Whether a read on db may predate this process's latest write.
+
+    True for replica sessions within READ_YOUR_WRITES_SECONDS (the replica lag budget) of
+    that write. Such reads must not fill shared caches or carry the current collection
+    ETag, which would serve a lagging body as current until the entry or tag expires.
+    """
+    if not db.info.get("replica"):
+        return False
+    return not collection_version.quiet_for(get_settings().READ_YOUR_WRITES_SECONDS)
+
+
+def _on_write(event: object) -> None:
+    collection_version.bump()
+
+
+for _event_type in (IdeaCreated, IdeaUpdated, IdeaDeleted, VotesChanged):
+    idea_events.subscribe(_event_type, _on_write)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+from ..core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+Pair = tuple[int, Optional[str]]
+
+
+class VoteBuffer:
+    """Write-behind queue that turns concurrent single votes into batched commits.
+
+    Request threads ``submit`` a vote and wait on the returned future. A background thread
+    collects votes until VOTE_BUFFER_MAX_BATCH are queued or VOTE_BUFFER_MAX_DELAY_MS has
+    passed since the first one (the durability window), then hands the batch to ``flush``,
+    which must return one status per vote. Each caller gets its own vote's status back.
+    If a batch fails as a whole, its votes are flushed again one at a time, so one bad vote
+    fails only its own caller.
+    """
+
+    def __init__(self, flush: Callable[[list[Pair]], list[str]]):
+        self._flush = flush
+        self._cond = threading.Condition()
+        self._pending: list[tuple[Pair, Future]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def submit(self, idea_id: int, voter: Optional[str]) -> Future:
+        future: Future = Future()
+        with self._cond:
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="vote-buffer", daemon=True)
+                self._thread.start()
+            self._pending.append(((idea_id, voter), future))
+            self._cond.notify()
+        return future
+
+    def stop(self) -> None:
+        """Flush everything still queued and stop the background thread."""
+        with self._cond:
+            thread = self._thread
+            self._stopping = True
+            self._cond.notify()
+        if thread is not None:
+            thread.join()
+
+    def _take_batch(self) -> list[tuple[Pair, Future]]:
+        settings = get_settings()
+        max_batch = max(settings.VOTE_BUFFER_MAX_BATCH, 1)
+        with self._cond:
+            while not self._pending and not self._stopping:
+                self._cond.wait()
+            if self._pending and not self._stopping:
+                deadline = time.monotonic() + settings.VOTE_BUFFER_MAX_DELAY_MS / 1000
+                while len(self._pending) < max_batch and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            batch, self._pending = self._pending[:max_batch], self._pending[max_batch:]
+            if not batch:
+                # the worker exits; clearing it under the lock makes a later submit start a new one
+                self._thread = None
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return  # stopping and drained
+            try:
+                statuses = self._flush([pair for pair, _ in batch])
+            except Exception as exc:
+                if len(batch) == 1:
+                    logger.exception("vote buffer flush failed")
+                    batch[0][1].set_exception(exc)
+                    continue
+                logger.warning("vote buffer flush of %d votes failed, retrying one by one", len(batch), exc_info=True)
+                for pair, future in batch:
+                    self._flush_one(pair, future)
+            else:
+                for (_, future), status in zip(batch, statuses):
+                    future.set_result(status)
+
+    def _flush_one(self, pair: Pair, future: Future) -> None:
+        try:
+            status = self._flush([pair])[0]
+        except Exception as exc:
+            logger.exception("vote buffer flush failed for idea %s", pair[0])
+            future.set_exception(exc)
+        else:
+            future.set_result(status)
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import AsyncIterator, Iterable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from ..core import db as db_module
+from ..core.settings import get_settings
+from ..repositories.ideas import IdeaRepository
+from .events import IdeaDeleted, VotesChanged, idea_events
+
+logger = logging.getLogger(__name__)
+
+
+def load_counts(idea_ids: Iterable[int]) -> dict[int, int]:
+    # the primary, not the read replica: a push must not show a count older than the vote behind it
+    with db_module.SessionLocal() as db:
+        return IdeaRepository(db).votes_counts(idea_ids)
+
+
+class _Channel:
+    """Shared state of one watched idea; every subscriber of the idea waits on its event."""
+
+    __slots__ = ("count", "version", "deleted", "closed", "subscribers", "_event")
+
+    def __init__(self) -> None:
+        self.count: Optional[int] = None  # None until the first read
+        self.version = 0
+        self.deleted = False
+        self.closed = False
+        self.subscribers = 0
+        self._event = asyncio.Event()
+
+    def notify(self) -> None:
+        # wake the current waiters; later waits go to a fresh event. Call on the loop thread.
+        event, self._event = self._event, asyncio.Event()
+        event.set()
+
+    async def wait(self) -> None:
+        await self._event.wait()
+
+
+class Subscription:
+    """One streaming client of an idea.
+
+    Holds no event, timer or queue of its own: it waits on the idea's shared channel and
+    compares versions, so an idle client costs little more than its coroutine, and a slow
+    one simply sees the newest count when it wakes.
+    """
+
+    __slots__ = ("idea_id", "_channel", "_seen")
+
+    def __init__(self, idea_id: int, channel: _Channel) -> None:
+        self.idea_id = idea_id
+        self._channel = channel
+        self._seen = channel.version
+
+    @property
+    def count(self) -> int:
+        return self._channel.count or 0
+
+    @property
+    def deleted(self) -> bool:
+        return self._channel.deleted
+
+    async def changes(self) -> AsyncIterator[Optional[int]]:
+        """Yield each new count, or None on a heartbeat (every VOTE_STREAM_HEARTBEAT_SECONDS).
+
+        Ends when the idea is deleted (``deleted`` is then set) or the stream is stopped.
+        """
+        channel = self._channel
+        while True:
+            # checked before waiting too: a client busy sending may have slept through a wake-up
+            if channel.closed or channel.deleted:
+                return
+            if channel.version != self._seen:
+                self._seen = channel.version
+                yield channel.count
+                continue
+            await channel.wait()
+            if channel.version == self._seen and not (channel.closed or channel.deleted):
+                yield None
+
+
+class VoteStream:
+    """Pushes committed vote-count changes to streaming clients of this worker.
+
+    VotesChanged/IdeaDeleted events (published by IdeaService on any thread) only mark the
+    idea dirty. A single task on the event loop wakes up, waits VOTE_STREAM_INTERVAL_MS so
+    bursts coalesce, reads every dirty watched count in one IN query and wakes the
+    subscribers of the ideas whose count changed. Every VOTE_STREAM_RESYNC_SECONDS it
+    re-reads all watched counts, which picks up votes handled by other worker processes;
+    a second task wakes everyone for the heartbeat.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._channels: dict[int, _Channel] = {}
+        self._dirty: set[int] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._tasks: list[asyncio.Task] = []
+
+    def subscriber_count(self, idea_id: Optional[int] = None) -> int:
+        with self._lock:
+            if idea_id is not None:
+                channel = self._channels.get(idea_id)
+                return channel.subscribers if channel is not None else 0
+            return sum(channel.subscribers for channel in self._channels.values())
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and all(not task.done() for task in self._tasks):
+            return
+        with self._lock:
+            if self._loop is not loop:
+                # channels left over from an event loop that is gone
+                self._channels = {}
+            self._loop, self._wake = loop, asyncio.Event()
+            wake = self._wake
+        self._tasks = [loop.create_task(self._refresh(wake)), loop.create_task(self._heartbeat())]
+
+    async def subscribe(self, idea_id: int) -> Optional[Subscription]:
+        """Start watching an idea; None if it does not exist."""
+        self._ensure_running()
+        with self._lock:
+            # registered before the first read so that votes committed meanwhile are not missed
+            channel = self._channels.setdefault(idea_id, _Channel())
+            channel.subscribers += 1
+        sub = Subscription(idea_id, channel)
+        if channel.count is None:
+            loaded = await run_in_threadpool(load_counts, [idea_id])
+            if idea_id not in loaded:
+                self.unsubscribe(sub)
+                return None
+            if channel.count is None:
+                channel.count = loaded[idea_id]
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            channel = self._channels.get(sub.idea_id)
+            if channel is not sub._channel:
+                return
+            channel.subscribers -= 1
+            if channel.subscribers <= 0:
+                del self._channels[sub.idea_id]
+
+    def mark_dirty(self, idea_ids: Iterable[int]) -> None:
+        with self._lock:
+            watched = [i for i in idea_ids if i in self._channels]
+            if not watched:
+                return
+            self._dirty.update(watched)
+            loop, wake = self._loop, self._wake
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:  # the loop has been closed
+            pass
+
+    async def _refresh(self, wake: asyncio.Event) -> None:
+        settings = get_settings()
+        while True:
+            try:
+                async with asyncio.timeout(settings.VOTE_STREAM_RESYNC_SECONDS):
+                    await wake.wait()
+            except TimeoutError:
+                with self._lock:
+                    self._dirty.update(self._channels)
+            wake.clear()
+            await asyncio.sleep(settings.VOTE_STREAM_INTERVAL_MS / 1000)
+            with self._lock:
+                dirty, self._dirty = self._dirty, set()
+                watched = [i for i in dirty if i in self._channels]
+            if not watched:
+                continue
+            try:
+                counts = await run_in_threadpool(load_counts, watched)
+            except Exception:  # keep the streams open; the next write or resync retries
+                logger.exception("vote stream refresh failed")
+                continue
+            self._fan_out(watched, counts)
+
+    def _fan_out(self, idea_ids: list[int], counts: dict[int, int]) -> None:
+        with self._lock:
+            channels = [(self._channels.get(i), counts.get(i)) for i in idea_ids]
+        for channel, count in channels:
+            if channel is None or (count is not None and count == channel.count):
+                continue
+            if count is None:
+                channel.deleted = True
+            else:
+                channel.count, channel.version = count, channel.version + 1
+            channel.notify()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(get_settings().VOTE_STREAM_HEARTBEAT_SECONDS)
+            with self._lock:
+                channels = list(self._channels.values())
+            for channel in channels:
+                channel.notify()
+
+    def stop(self) -> None:
+        """Cancel the background tasks and end every open stream."""
+        with self._lock:
+            loop, tasks, channels = self._loop, self._tasks, list(self._channels.values())
+            self._channels, self._dirty, self._tasks = {}, set(), []
+            self._loop = self._wake = None
+        if loop is None:
+            return
+
+        def shutdown() -> None:
+            for task in tasks:
+                task.cancel()
+            for channel in channels:
+                channel.closed = True
+                channel.notify()
+
+        try:
+            loop.call_soon_threadsafe(shutdown)
+        except RuntimeError:
+            pass
+
+
+vote_stream = VoteStream()
+
+
+def _on_votes_changed(event: VotesChanged) -> None:
+    vote_stream.mark_dirty(event.idea_ids)
+
+
+def _on_idea_deleted(event: IdeaDeleted) -> None:
+    vote_stream.mark_dirty([event.idea_id])
+
+
+idea_events.subscribe(VotesChanged, _on_votes_changed)
+idea_events.subscribe(IdeaDeleted, _on_idea_deleted)
@@ -1,11 +1,14 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from app.models.Responsemodels import User
+from sqlalchemy.exc import IntegrityError
 from app.core.db import SessionLocal, get_db
+from app.services.passwords import password_hasher
 from fastapi import APIRouter, Depends, HTTPException
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
-import app.api.v1.APIENDPOINTS
 from app.models.CrowdAPIModels import createUser
+from app.repositories.users import UserProfileRepository
 class UserRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -14,43 +17,82 @@ class UserRepository:
         stmt = select(User).where(User.username == username)
         return self.db.scalar(stmt)
 
-    def create(self, username: str, password: str) -> User:
-        new_user = User(username=username, password=password)
+    def create(self, username: str, password_hash: str) -> User:
+        # flushed, not committed: signup commits the account and its profile together
+        new_user = User(username=username, password=password_hash)
         self.db.add(new_user)
-        self.db.commit()
-        self.db.refresh(new_user)
-
-
+        self.db.flush()
         return new_user
 
+    def set_password_hash(self, user: User, password_hash: str) -> None:
+        user.password = password_hash
+
 router = APIRouter(prefix="/users", tags=["users"])
 
 class UserCreate(BaseModel):
     username: str
     password: str
 
-@router.post("", name="create_user")
-def create_user(user_data: UserCreate, db: Session = Depends(get_db)):
+class UserLogin(BaseModel):
+    username: str
+    password: str
+
+class UserPublic(BaseModel):
+    # never echo the password hash back
+    id: int
+    username: str
+
+    model_config = {"from_attributes": True}
+
+def _create_account(db: Session, username: str, password_hash: str) -> User:
+    # the account and its stock profile in one transaction (one commit)
+    new_user = UserRepository(db).create(username, password_hash)
+    stockUser = createUser(
+        user_id=str(new_user.id)
+    )
+    profiles = UserProfileRepository(db)
+    # a profile left behind for this id (e.g. by the old two-database signup) is adopted
+    if profiles.get_by_user_id(stockUser.user_id) is None:
+        profiles.create(stockUser.user_id, **stockUser.model_dump(exclude={"user_id"}))
+    db.commit()
+    return new_user
+
+# Signup and login are async so that waiting on scrypt (in the password process pool)
+# holds no threadpool thread; only the short database work runs on the threadpool.
+@router.post("", name="create_user", response_model=UserPublic)
+async def create_user(user_data: UserCreate, db: Session = Depends(get_db)):
     repo = UserRepository(db)
     # Check if user already exists
-    existing_user = repo.get_by_username(user_data.username)
+    existing_user = await run_in_threadpool(repo.get_by_username, user_data.username)
     if existing_user:
         raise HTTPException(status_code=400, detail="Username already exists")
-    
-    # Create new user
+
+    password_hash = await password_hasher.hash_async(user_data.password)
     try:
-        new_user = repo.create(user_data.username, user_data.password)
-        stockUser = createUser(
-            user_id=str(new_user.id)
-        )
-        app.api.v1.APIENDPOINTS.create_user(stockUser)
-    except Exception as e:
-        print(e)
-        raise HTTPException(status_code=500, detail="Error creating user")
+        return await run_in_threadpool(_create_account, db, user_data.username, password_hash)
+    except IntegrityError:
+        await run_in_threadpool(db.rollback)
+        raise HTTPException(status_code=400, detail="Username already exists")
 
-    return new_user
+def _store_rehash(db: Session, user: User, password_hash: str) -> None:
+    UserRepository(db).set_password_hash(user, password_hash)
+    db.commit()
 
-@router.get("/{username}", name="get_user")
+@router.post("/login", name="login", response_model=UserPublic)
+async def login(credentials: UserLogin, db: Session = Depends(get_db)):
+    repo = UserRepository(db)
+    user = await run_in_threadpool(repo.get_by_username, credentials.username)
+    # an unknown username is verified against a dummy hash, so it takes as long as a real one
+    verified = await password_hasher.verify_async(credentials.password, user.password if user else None)
+    if user is None or not verified:
+        raise HTTPException(status_code=401, detail="Invalid username or password")
+    # upgrade plaintext rows and hashes made with older cost settings
+    if password_hasher.needs_rehash(user.password):
+        password_hash = await password_hasher.hash_async(credentials.password)
+        await run_in_threadpool(_store_rehash, db, user, password_hash)
+    return user
+
+@router.get("/{username}", name="get_user", response_model=UserPublic)
 def get_user_by_username(username: str, db: Session = Depends(get_db)):
     repo = UserRepository(db)
     user = repo.get_by_username(username)
@@ -65,4 +107,3 @@ if __name__ == "__main__":
     
     with SessionLocal() as db:
         repo = UserRepository(db)
-
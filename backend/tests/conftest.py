@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import os
+import tempfile
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core import db as db_module
+from app.core.db import Base, _create_engine
+from app.core.metrics import metrics
+from app.core.settings import get_settings
+from app.services.cache import response_cache
+from app.services.leaderboard import leaderboard
+from app.services.totals import totals_cache
+from app.services.versions import collection_version
+from app.services.vote_stream import vote_stream
+
+
+@pytest.fixture(autouse=True)
+def temp_db(monkeypatch):
+    # use a temp sqlite file to avoid threading issues with in-memory db + TestClient
+    tmp = tempfile.NamedTemporaryFile(delete=False)
+    tmp.close()
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp.name}")
+    # a route that runs more statements than its @query_budget fails the test
+    monkeypatch.setenv("QUERY_BUDGET_MODE", "raise")
+    # refresh settings cache
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    # point the app's engine/session factory at the temp file so tests never touch app.db
+    engine = _create_engine(f"sqlite:///{tmp.name}")
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(db_module, "engine", engine)
+    monkeypatch.setattr(
+        db_module,
+        "SessionLocal",
+        sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False, class_=Session),
+    )
+    monkeypatch.setattr(db_module, "read_engine", None)
+    monkeypatch.setattr(db_module, "ReadSessionLocal", None)
+    # the async engines are built lazily from the settings on first use
+    for name in ("async_engine", "AsyncSessionLocal", "async_read_engine", "AsyncReadSessionLocal"):
+        monkeypatch.setattr(db_module, name, None)
+    totals_cache.clear()
+    leaderboard.reset()
+    collection_version.reset()
+    response_cache.reset()
+    vote_stream.stop()
+    metrics.reset()
+    yield
+    engine.dispose()
+    os.unlink(tmp.name)
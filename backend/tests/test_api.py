@@ -8,21 +8,10 @@ import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.core import db as db_module
 from app.core.settings import get_settings, Settings
 
 
-@pytest.fixture(autouse=True)
-def temp_db(monkeypatch):
-    # use a temp sqlite file to avoid threading issues with in-memory db + TestClient
-    tmp = tempfile.NamedTemporaryFile(delete=False)
-    tmp.close()
-    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp.name}")
-    # refresh settings cache
-    get_settings.cache_clear()  # type: ignore[attr-defined]
-    yield
-    os.unlink(tmp.name)
-
-
 def test_health():
     client = TestClient(app)
     res = client.get("/api/v1/health")
@@ -74,3 +63,258 @@ def test_crud_and_vote_flow():
     res = client.get(f"/api/v1/ideas/{idea['id']}")
     assert res.status_code == 404
 
+
+
+def test_votes_count_is_maintained_and_sorts():
+    client = TestClient(app)
+    a = client.post("/api/v1/ideas", json={"title": "Alpha", "description": ""}).json()
+    b = client.post("/api/v1/ideas", json={"title": "Bravo", "description": ""}).json()
+
+    for voter in ("u1", "u2"):
+        assert client.post(f"/api/v1/ideas/{b['id']}/vote", json={"voter": voter}).status_code == 204
+    assert client.post(f"/api/v1/ideas/{a['id']}/vote", json={"voter": "u1"}).status_code == 204
+
+    res = client.get("/api/v1/ideas", params={"sort": "votes", "order": "desc"})
+    assert [(i["title"], i["votes_count"]) for i in res.json()["items"]] == [("Bravo", 2), ("Alpha", 1)]
+    res = client.get("/api/v1/ideas/top")
+    assert [i["id"] for i in res.json()] == [b["id"], a["id"]]
+
+    # removing a vote decrements the stored count and leaves updated_at alone
+    before = client.get(f"/api/v1/ideas/{b['id']}").json()
+    assert client.delete(f"/api/v1/ideas/{b['id']}/vote", params={"voter": "u2"}).status_code == 204
+    after = client.get(f"/api/v1/ideas/{b['id']}").json()
+    assert after["votes_count"] == 1
+    assert after["updated_at"] == before["updated_at"]
+    assert client.delete(f"/api/v1/ideas/{b['id']}/vote", params={"voter": "u2"}).status_code == 404
+    assert client.delete("/api/v1/ideas/999/vote", params={"voter": "u2"}).status_code == 404
+
+
+def test_recount_votes_detects_and_repairs_drift(capsys):
+    from sqlalchemy import update
+
+    from app.models import Idea
+    from app.scripts import recount_votes
+
+    client = TestClient(app)
+    idea = client.post("/api/v1/ideas", json={"title": "Drifty", "description": ""}).json()
+    client.post(f"/api/v1/ideas/{idea['id']}/vote", json={"voter": "x"})
+    assert recount_votes.main([]) == 0
+
+    with db_module.SessionLocal() as db:
+        db.execute(update(Idea).values(votes_count=7))
+        db.commit()
+
+    assert recount_votes.main([]) == 1
+    assert f"idea {idea['id']}: stored=7 actual=1" in capsys.readouterr().out
+    assert recount_votes.main(["--repair"]) == 0
+    assert client.get(f"/api/v1/ideas/{idea['id']}").json()["votes_count"] == 1
+
+
+def test_cursor_pagination_walks_every_idea_once():
+    client = TestClient(app)
+    ids = [client.post("/api/v1/ideas", json={"title": f"Idea {n:02d}"}).json()["id"] for n in range(7)]
+    for idea_id in ids[:3]:
+        client.post(f"/api/v1/ideas/{idea_id}/vote", json={"voter": "v"})
+
+    for sort, order in (("created_at", "desc"), ("created_at", "asc"), ("votes", "desc"), ("votes", "asc")):
+        seen, cursor = [], None
+        while True:
+            params = {"size": 3, "sort": sort, "order": order}
+            if cursor:
+                params["cursor"] = cursor
+            body = client.get("/api/v1/ideas", params=params).json()
+            seen += [i["id"] for i in body["items"]]
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+        assert sorted(seen) == sorted(ids), (sort, order)
+        # offset pages and keyset pages agree
+        offset_ids = [
+            i["id"]
+            for page in (1, 2, 3)
+            for i in client.get("/api/v1/ideas", params={"size": 3, "page": page, "sort": sort, "order": order}).json()["items"]
+        ]
+        assert seen == offset_ids, (sort, order)
+
+    res = client.get("/api/v1/ideas/top", params={"size": 4})
+    first = [i["id"] for i in res.json()]
+    res = client.get("/api/v1/ideas/top", params={"size": 4, "cursor": res.headers["x-next-cursor"]})
+    assert "x-next-cursor" not in res.headers
+    assert sorted(first + [i["id"] for i in res.json()]) == sorted(ids)
+
+    assert client.get("/api/v1/ideas", params={"cursor": "garbage"}).status_code == 400
+    # a cursor minted for another ordering is rejected rather than silently misapplied
+    votes_cursor = client.get("/api/v1/ideas", params={"size": 1, "sort": "votes"}).json()["next_cursor"]
+    assert client.get("/api/v1/ideas", params={"cursor": votes_cursor}).status_code == 400
+
+
+def test_full_text_search_tracks_writes_and_ranks():
+    client = TestClient(app)
+    dark = client.post("/api/v1/ideas", json={"title": "Dark mode", "description": "A darker theme"}).json()
+    client.post("/api/v1/ideas", json={"title": "Export CSV", "description": "Dark corners of reporting"})
+    client.post("/api/v1/ideas", json={"title": "Offline sync", "description": "Works on planes"})
+
+    def titles(**params):
+        return [i["title"] for i in client.get("/api/v1/ideas", params=params).json()["items"]]
+
+    assert sorted(titles(q="dark")) == ["Dark mode", "Export CSV"]
+    # prefix matching, case-insensitive, punctuation ignored
+    assert titles(q="PLANE!") == ["Offline sync"]
+    assert titles(q="%%") == []
+    assert client.get("/api/v1/ideas", params={"q": "dark"}).json()["total"] == 2
+    # title + description hits outrank a single description hit
+    assert titles(q="dark", sort="relevance")[0] == "Dark mode"
+    assert titles(q="dark", sort="relevance", order="asc") == ["Export CSV", "Dark mode"]
+
+    # index follows updates and deletes
+    client.put(f"/api/v1/ideas/{dark['id']}", json={"title": "Light mode", "description": "Brighter"})
+    assert titles(q="dark") == ["Export CSV"]
+    assert titles(q="brighter") == ["Light mode"]
+    client.delete(f"/api/v1/ideas/{dark['id']}")
+    assert titles(q="light") == []
+
+    # relevance without q falls back to recency; cursors are not offered for relevance
+    assert titles(sort="relevance")[0] == "Offline sync"
+    assert client.get("/api/v1/ideas", params={"q": "dark", "sort": "relevance", "cursor": "x"}).status_code == 400
+
+
+def test_search_vote_boost(monkeypatch):
+    client = TestClient(app)
+    client.post("/api/v1/ideas", json={"title": "Rocket rocket", "description": "rocket"})
+    quiet = client.post("/api/v1/ideas", json={"title": "Rocket", "description": ""}).json()
+    for voter in ("a", "b", "c"):
+        client.post(f"/api/v1/ideas/{quiet['id']}/vote", json={"voter": voter})
+
+    def top_hit():
+        return client.get("/api/v1/ideas", params={"q": "rocket", "sort": "relevance"}).json()["items"][0]["title"]
+
+    assert top_hit() == "Rocket rocket"
+    monkeypatch.setenv("SEARCH_VOTE_BOOST", "10")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    assert top_hit() == "Rocket"
+
+
+def test_list_totals_can_be_skipped_cached_or_estimated():
+    client = TestClient(app)
+    ids = [client.post("/api/v1/ideas", json={"title": f"Total {n}"}).json()["id"] for n in range(3)]
+
+    body = client.get("/api/v1/ideas", params={"include_total": "false"}).json()
+    assert body["total"] is None and len(body["items"]) == 3
+
+    assert client.get("/api/v1/ideas").json()["total"] == 3
+    assert client.get("/api/v1/ideas", params={"q": "total"}).json()["total"] == 3
+    # cached totals are dropped on create and delete
+    client.post("/api/v1/ideas", json={"title": "Total 3"})
+    assert client.get("/api/v1/ideas").json()["total"] == 4
+    client.delete(f"/api/v1/ideas/{ids[0]}")
+    assert client.get("/api/v1/ideas", params={"q": "total"}).json()["total"] == 3
+    # edits only drop search totals
+    client.put(f"/api/v1/ideas/{ids[1]}", json={"title": "Renamed"})
+    assert client.get("/api/v1/ideas", params={"q": "total"}).json()["total"] == 2
+
+    # sqlite estimates from the highest rowid, so the deleted idea still counts
+    body = client.get("/api/v1/ideas", params={"total_mode": "estimated"}).json()
+    assert body["total"] == 4 and body["total_is_estimate"] is True
+    body = client.get("/api/v1/ideas", params={"total_mode": "estimated", "q": "total"}).json()
+    assert body["total"] == 2 and body["total_is_estimate"] is False
+
+
+def test_vote_batch_reports_each_item(monkeypatch):
+    monkeypatch.setenv("VOTE_BATCH_CHUNK_SIZE", "2")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    client = TestClient(app)
+    a = client.post("/api/v1/ideas", json={"title": "Batch A"}).json()["id"]
+    b = client.post("/api/v1/ideas", json={"title": "Batch B"}).json()["id"]
+    client.post(f"/api/v1/ideas/{a}/vote", json={"voter": "old"})
+
+    votes = [
+        {"idea_id": a, "voter": "old"},
+        {"idea_id": a, "voter": "new"},
+        {"idea_id": b, "voter": "new"},
+        {"idea_id": b, "voter": "new"},  # duplicate across chunks
+        {"idea_id": 999, "voter": "x"},
+        {"idea_id": b},
+    ]
+    res = client.post("/api/v1/ideas/votes:batch", json={"votes": votes})
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert [r["status"] for r in body["results"]] == [
+        "duplicate", "created", "created", "duplicate", "not_found", "created"
+    ]
+    assert (body["created"], body["duplicate"], body["not_found"]) == (3, 2, 1)
+    assert client.get(f"/api/v1/ideas/{a}").json()["votes_count"] == 2
+    assert client.get(f"/api/v1/ideas/{b}").json()["votes_count"] == 2
+    assert client.post("/api/v1/ideas/votes:batch", json={"votes": []}).status_code == 422
+
+    # an empty-string voter is deduplicated like any named voter, not treated as anonymous
+    assert client.post(f"/api/v1/ideas/{a}/vote", json={"voter": ""}).status_code == 204
+    assert client.post(f"/api/v1/ideas/{a}/vote", json={"voter": ""}).status_code == 409
+    votes = [{"idea_id": a, "voter": ""}, {"idea_id": b, "voter": ""}, {"idea_id": b, "voter": ""}, {"idea_id": b, "voter": "z"}]
+    res = client.post("/api/v1/ideas/votes:batch", json={"votes": votes})
+    assert res.status_code == 200, res.text
+    assert [r["status"] for r in res.json()["results"]] == ["duplicate", "created", "duplicate", "created"]
+    assert client.get(f"/api/v1/ideas/{b}").json()["votes_count"] == 4
+
+
+def test_fast_writes_use_one_statement_per_mutation(monkeypatch):
+    from sqlalchemy import event
+
+    monkeypatch.setenv("FAST_WRITES", "true")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    client = TestClient(app)
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        if statement.split()[0] in ("INSERT", "UPDATE", "DELETE", "SELECT"):
+            statements.append(statement.split()[0])
+
+    event.listen(db_module.engine, "before_cursor_execute", record)
+    try:
+        res = client.post("/api/v1/ideas", json={"title": "Fast", "description": "one shot"})
+        assert res.status_code == 201 and res.json()["votes_count"] == 0
+        idea_id = res.json()["id"]
+        assert statements == ["INSERT"]
+        assert client.post("/api/v1/ideas", json={"title": "Fast"}).status_code == 409
+
+        statements.clear()
+        res = client.put(f"/api/v1/ideas/{idea_id}", json={"description": "edited"})
+        assert res.status_code == 200 and res.json()["description"] == "edited"
+        assert statements == ["UPDATE"]
+
+        statements.clear()
+        assert client.post(f"/api/v1/ideas/{idea_id}/vote", json={"voter": "a"}).status_code == 204
+        # counter bump, vote row, hourly rollup upsert
+        assert statements == ["UPDATE", "INSERT", "INSERT"]
+    finally:
+        event.remove(db_module.engine, "before_cursor_execute", record)
+
+    assert client.post(f"/api/v1/ideas/{idea_id}/vote", json={"voter": "a"}).status_code == 409
+    assert client.post(f"/api/v1/ideas/{idea_id}/vote", json={}).status_code == 204
+    assert client.post("/api/v1/ideas/999/vote", json={"voter": "a"}).status_code == 404
+    assert client.get(f"/api/v1/ideas/{idea_id}").json()["votes_count"] == 2
+
+    other = client.post("/api/v1/ideas", json={"title": "Other"}).json()
+    assert client.put(f"/api/v1/ideas/{other['id']}", json={"title": "Fast"}).status_code == 409
+    assert client.put("/api/v1/ideas/999", json={"title": "Nope"}).status_code == 404
+    assert client.put(f"/api/v1/ideas/{idea_id}", json={}).status_code == 200
+
+    assert client.delete(f"/api/v1/ideas/{idea_id}").status_code == 204
+    assert client.delete(f"/api/v1/ideas/{idea_id}").status_code == 404
+    assert client.get(f"/api/v1/ideas/{idea_id}").status_code == 404
+
+
+def test_ideas_batch_returns_request_order_with_misses():
+    client = TestClient(app)
+    a = client.post("/api/v1/ideas", json={"title": "Batch A"}).json()
+    b = client.post("/api/v1/ideas", json={"title": "Batch B"}).json()
+    client.post(f"/api/v1/ideas/{b['id']}/vote", json={"voter": "x"})
+
+    res = client.get("/api/v1/ideas:batch", params={"ids": f"{b['id']},999,{a['id']}"})
+    assert res.status_code == 200
+    body = res.json()
+    assert [i and (i["id"], i["votes_count"]) for i in body["items"]] == [(b["id"], 1), None, (a["id"], 0)]
+    assert body["missing"] == [999]
+    # repeated params work too
+    assert len(client.get("/api/v1/ideas:batch", params=[("ids", a["id"]), ("ids", a["id"])]).json()["items"]) == 2
+    assert client.get("/api/v1/ideas:batch", params={"ids": "1,x"}).status_code == 422
+    assert client.get("/api/v1/ideas:batch", params={"ids": ",".join(["1"] * 501)}).status_code == 422
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.core import db as db_module
+from app.core.settings import get_settings
+from app.main import create_app
+
+
+def _async_app(monkeypatch):
+    monkeypatch.setenv("DB_MODE", "async")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    return create_app()
+
+
+def test_async_url_maps_drivers():
+    assert db_module.async_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert db_module.async_url("postgresql://u:p@h/db") == "postgresql+psycopg://u:p@h/db"
+
+
+def test_async_routes_cover_the_idea_flow(monkeypatch):
+    app = _async_app(monkeypatch)
+    endpoint = next(r.endpoint for r in app.routes if getattr(r, "path", "") == "/api/v1/ideas/{idea_id}")
+    assert endpoint.__module__.endswith("ideas_async")
+
+    with TestClient(app) as client:
+        a = client.post("/api/v1/ideas", json={"title": "Async A", "description": "d"}).json()
+        b = client.post("/api/v1/ideas", json={"title": "Async B"}).json()
+        assert client.post("/api/v1/ideas", json={"title": "Async A"}).status_code == 409
+
+        assert client.post(f"/api/v1/ideas/{a['id']}/vote", json={"voter": "x"}).status_code == 204
+        assert client.post(f"/api/v1/ideas/{a['id']}/vote", json={"voter": "x"}).status_code == 409
+        assert client.post("/api/v1/ideas/999/vote", json={"voter": "x"}).status_code == 404
+        batch = client.post(
+            "/api/v1/ideas/votes:batch", json={"votes": [{"idea_id": b["id"], "voter": "y"}, {"idea_id": 999}]}
+        ).json()
+        assert (batch["created"], batch["not_found"]) == (1, 1)
+        assert client.get(f"/api/v1/ideas/{a['id']}/votes_count").json()["votes_count"] == 1
+
+        listed = client.get("/api/v1/ideas", params={"sort": "votes"}).json()
+        assert listed["total"] == 2 and [i["id"] for i in listed["items"]] == [b["id"], a["id"]]
+        assert client.get("/api/v1/ideas", params={"cursor": "bogus"}).status_code == 400
+        assert [i["id"] for i in client.get("/api/v1/ideas/top").json()] == [b["id"], a["id"]]
+        assert client.get("/api/v1/ideas:batch", params={"ids": f"{a['id']},999"}).json()["missing"] == [999]
+
+        etag = client.get(f"/api/v1/ideas/{a['id']}").headers["etag"]
+        assert client.get(f"/api/v1/ideas/{a['id']}", headers={"If-None-Match": etag}).status_code == 304
+        assert client.put(f"/api/v1/ideas/{a['id']}", json={"title": "Async A2"}).json()["title"] == "Async A2"
+        assert client.delete(f"/api/v1/ideas/{a['id']}/vote", params={"voter": "x"}).status_code == 204
+        assert client.delete(f"/api/v1/ideas/{a['id']}").status_code == 204
+        assert client.get(f"/api/v1/ideas/{a['id']}").status_code == 404
+
+    # shutdown disposes the engine so the next startup binds a fresh pool to its own loop
+    assert db_module.async_engine is None
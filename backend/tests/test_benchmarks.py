@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import select
+
+from app.core import db as db_module
+from app.models import Idea
+from app.repositories.ideas import IdeaRepository
+from app.scripts import bench_api, seed_bench
+
+
+def test_seed_loads_a_consistent_dataset_and_bench_runs_every_scenario():
+    loaded = seed_bench.seed(db_module.engine, ideas=50, votes=400, chunk=64)
+    assert loaded["ideas"] == 50 and loaded["votes"] == 400
+    with db_module.SessionLocal() as db:
+        assert IdeaRepository(db).find_votes_count_drift() == []
+        assert db.scalar(select(Idea.votes_count).order_by(Idea.votes_count.desc()).limit(1)) > 400 / 50
+    with pytest.raises(SystemExit):
+        seed_bench.seed(db_module.engine, ideas=1, votes=0)
+
+    result = bench_api.run(requests=4, concurrency=2)
+    assert set(result["results"]) == set(bench_api.scenarios(1, None))
+    assert all(r["errors"] == 0 and r["rps"] > 0 for r in result["results"].values())
+    assert result["meta"]["ideas"] == 50
+    assert bench_api.dataset()["ideas"] == 50 + 4 + 4  # create_idea: warm-up plus timed requests
+
+
+def test_compare_flags_only_drifts_past_tolerance():
+    baseline = {"results": {"top": {"p50_ms": 10.0, "p99_ms": 20.0, "rps": 100.0}}}
+    current = {"results": {"top": {"p50_ms": 12.0, "p99_ms": 40.0, "rps": 70.0}, "new": {}}}
+    rows = bench_api.compare(current, baseline, tolerance=0.25, p99_tolerance=0.5)
+    assert {row["metric"]: row["regressed"] for row in rows} == {"p50_ms": False, "p99_ms": True, "rps": True}
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.settings import get_settings
+from app.main import app
+from app.repositories.ideas import IdeaRepository
+from app.schemas import IdeaRead
+
+
+def _forbid(monkeypatch, target, name):
+    def fail(*args, **kwargs):  # pragma: no cover - must not be reached
+        raise AssertionError(f"{name} should not run for a 304")
+
+    monkeypatch.setattr(target, name, fail)
+
+
+def test_idea_etag_and_last_modified(monkeypatch):
+    client = TestClient(app)
+    idea = client.post("/api/v1/ideas", json={"title": "Cached"}).json()
+    url = f"/api/v1/ideas/{idea['id']}"
+    first = client.get(url)
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+    assert etag.startswith('"') and first.headers["cache-control"] == "no-cache"
+
+    with monkeypatch.context() as m:
+        _forbid(m, IdeaRead, "model_validate")
+        not_modified = client.get(url, headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304 and not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+        assert client.get(url, headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+        assert client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    # a vote changes the representation, so the tag changes even though updated_at does not
+    client.post(f"{url}/vote", json={"voter": "a"})
+    voted = client.get(url, headers={"If-None-Match": etag})
+    assert voted.status_code == 200 and voted.json()["votes_count"] == 1
+    assert voted.headers["etag"] != etag
+
+    client.put(url, json={"description": "edited"})
+    assert client.get(url, headers={"If-None-Match": voted.headers["etag"]}).status_code == 200
+    # If-None-Match takes precedence over If-Modified-Since
+    headers = {"If-None-Match": '"stale"', "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    assert client.get(url, headers=headers).status_code == 200
+
+
+@pytest.mark.parametrize("path", ["/api/v1/ideas?sort=votes", "/api/v1/ideas/top"])
+def test_collection_etag_skips_queries_until_a_write(monkeypatch, path):
+    client = TestClient(app)
+    idea = client.post("/api/v1/ideas", json={"title": "Listed"}).json()
+    etag = client.get(path).headers["etag"]
+
+    with monkeypatch.context() as m:
+        _forbid(m, IdeaRepository, "list_paginated")
+        _forbid(m, IdeaRepository, "top")
+        _forbid(m, IdeaRepository, "count_matching")
+        assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+
+    assert client.get(path + ("&" if "?" in path else "?") + "size=5").headers["etag"] != etag
+    client.post(f"/api/v1/ideas/{idea['id']}/vote", json={"voter": "v"})
+    assert client.get(path, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_collection_version_rolls_over_after_ttl(monkeypatch):
+    monkeypatch.setenv("COLLECTION_VERSION_TTL_SECONDS", "0.05")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    client = TestClient(app)
+    etag = client.get("/api/v1/ideas").headers["etag"]
+    assert client.get("/api/v1/ideas", headers={"If-None-Match": etag}).status_code == 304
+    time.sleep(0.06)
+    assert client.get("/api/v1/ideas", headers={"If-None-Match": etag}).status_code == 200
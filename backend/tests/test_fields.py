@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.core import db as db_module
+from app.core.settings import get_settings
+from app.main import app
+from app.models import Idea
+from app.repositories.ideas import IdeaRepository
+
+
+def _seed(client: TestClient) -> list[int]:
+    ids = [
+        client.post("/api/v1/ideas", json={"title": f"Garden idea {n}", "description": "x" * 2000}).json()["id"]
+        for n in range(5)
+    ]
+    client.post(f"/api/v1/ideas/{ids[1]}/vote", json={"voter": "a"})
+    return ids
+
+
+def test_list_returns_only_requested_fields_across_cursor_pages():
+    client = TestClient(app)
+    ids = _seed(client)
+    seen, cursor = [], None
+    while True:
+        params = {"fields": "title,votes_count", "size": 2, "sort": "votes"}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/api/v1/ideas", params=params).json()
+        assert all(set(item) == {"id", "title", "votes_count"} for item in body["items"])
+        seen += [item["id"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [ids[1], *reversed([i for i in ids if i != ids[1]])]
+    assert body["total"] == 5
+
+    searched = client.get("/api/v1/ideas", params={"q": "garden", "fields": "title", "sort": "relevance"}).json()
+    assert len(searched["items"]) == 5 and set(searched["items"][0]) == {"id", "title"}
+
+    assert client.get("/api/v1/ideas", params={"fields": "title,password"}).status_code == 422
+
+
+def test_top_projects_from_sql_and_from_the_leaderboard(monkeypatch):
+    client = TestClient(app)
+    ids = _seed(client)
+    expected = [{"id": ids[1], "votes_count": 1}, {"id": ids[4], "votes_count": 0}]
+    assert client.get("/api/v1/ideas/top", params={"fields": "votes_count", "size": 2}).json() == expected
+
+    monkeypatch.setenv("LEADERBOARD_ENABLED", "false")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    assert client.get("/api/v1/ideas/top", params={"fields": "votes_count", "size": 2}).json() == expected
+
+
+def test_projected_pages_do_not_build_idea_entities():
+    client = TestClient(app)
+    _seed(client)
+    with db_module.SessionLocal() as db:
+        rows, _, _ = IdeaRepository(db).list_paginated(page=1, size=5, columns=("id", "title"))
+        assert len(rows) == 5 and not isinstance(rows[0], Idea)
+        assert rows[0]._fields == ("id", "title", "created_at")  # plus the sort key paging needs
+        assert len(db.identity_map) == 0
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import random
+
+from fastapi.testclient import TestClient
+
+from app.core import db as db_module
+from app.core.settings import get_settings
+from app.main import app
+from app.models import Idea
+from app.repositories.ideas import IdeaRepository
+from app.schemas import IdeaRead
+from app.services.ideas import DuplicateVoteError, IdeaService, VoteNotFoundError
+from app.services.leaderboard import leaderboard
+
+
+def _expected_top(db) -> list[tuple[int, int]]:
+    return [(i.id, i.votes_count) for i in IdeaRepository(db).top_n(10_000)]
+
+
+def _served_top(service: IdeaService, size: int) -> list[tuple[int, int]]:
+    served, cursor = [], None
+    while True:
+        items, cursor = service.top_ideas(page=1, size=size, cursor=cursor)
+        served += [(i.id, i.votes_count) for i in items]
+        if cursor is None:
+            return served
+
+
+def test_bounded_leaderboard_matches_sql_under_random_writes(monkeypatch):
+    monkeypatch.setenv("LEADERBOARD_SIZE", "5")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    rng = random.Random(7)
+
+    with db_module.SessionLocal() as db:
+        service = IdeaService(db)
+        ids = [service.create_idea(title=f"Idea {n}", description="").id for n in range(12)]
+        leaderboard.load(db)
+        assert len(leaderboard) == 5
+
+        for step in range(300):
+            op = rng.random()
+            if op < 0.6:
+                try:
+                    service.vote(rng.choice(ids), voter=f"v{rng.randrange(6)}")
+                except DuplicateVoteError:
+                    pass
+            elif op < 0.85:
+                try:
+                    service.remove_vote(rng.choice(ids), voter=f"v{rng.randrange(6)}")
+                except VoteNotFoundError:
+                    pass
+            elif op < 0.93 and len(ids) > 3:
+                service.delete_idea(ids.pop(rng.randrange(len(ids))))
+            else:
+                ids.append(service.create_idea(title=f"Idea {100 + step}", description="").id)
+
+            # every tracked entry is exactly the true top of the table
+            expected = _expected_top(db)
+            assert _served_top(service, size=3) == expected
+            if len(leaderboard):
+                first = leaderboard.page(page=1, size=len(leaderboard))
+                assert [(i.id, i.votes_count) for i in first[0]] == expected[: len(leaderboard)]
+
+
+def test_top_pages_come_from_memory_once_loaded(monkeypatch):
+    client = TestClient(app)
+    a = client.post("/api/v1/ideas", json={"title": "Alpha"}).json()
+    b = client.post("/api/v1/ideas", json={"title": "Bravo"}).json()
+    client.post(f"/api/v1/ideas/{a['id']}/vote", json={"voter": "x"})
+    assert [i["id"] for i in client.get("/api/v1/ideas/top").json()] == [a["id"], b["id"]]
+
+    def no_sql(*args, **kwargs):  # pragma: no cover - must not be reached
+        raise AssertionError("top page should be served from the leaderboard")
+
+    monkeypatch.setattr(IdeaRepository, "top", no_sql)
+    client.put(f"/api/v1/ideas/{b['id']}", json={"title": "Bravo two"})
+    client.post(f"/api/v1/ideas/{b['id']}/vote", json={"voter": "x"})
+    client.post(f"/api/v1/ideas/{b['id']}/vote", json={"voter": "y"})
+    body = client.get("/api/v1/ideas/top").json()
+    assert [(i["title"], i["votes_count"]) for i in body] == [("Bravo two", 2), ("Alpha", 1)]
+
+
+def test_lifespan_loads_leaderboard():
+    with db_module.SessionLocal() as db:
+        IdeaService(db).create_idea(title="Preloaded", description="")
+    with TestClient(app) as client:
+        assert leaderboard.loaded
+        assert client.get("/api/v1/ideas/top").json()[0]["title"] == "Preloaded"
+
+
+def _tracked() -> dict[int, int]:
+    return {i.id: i.votes_count for i in leaderboard.page(page=1, size=len(leaderboard))[0]}
+
+
+def test_vote_callbacks_converge_in_any_order(monkeypatch):
+    monkeypatch.setenv("LEADERBOARD_SIZE", "2")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    with db_module.SessionLocal() as db:
+        service = IdeaService(db)
+        ids = [service.create_idea(title=f"Idea {n}", description="").id for n in range(3)]
+        for idea_id, votes in zip(ids, (3, 2, 1)):
+            for n in range(votes):
+                service.vote(idea_id, voter=f"v{n}")
+        leaderboard.load(db)
+        untracked = ids[2]
+
+        # two concurrent votes take the untracked idea from 1 to 3; commit B's callback
+        # (count 3) arrives before commit A's (count 2), which must not add on top of it
+        snapshot = IdeaRead.model_validate(db.get(Idea, untracked))
+        version = db.get(Idea, untracked).votes_version
+        leaderboard.record_vote(snapshot.model_copy(update={"votes_count": 3}), version + 2)
+        leaderboard.record_vote(snapshot.model_copy(update={"votes_count": 2}), version + 1)
+        assert _tracked() == {ids[0]: 3, untracked: 3}
+
+        # a tracked idea's stale snapshot is ignored as well
+        leader = IdeaRead.model_validate(db.get(Idea, ids[0]))
+        leaderboard.record_vote(leader.model_copy(update={"votes_count": 2}), 1)
+        assert _tracked()[ids[0]] == 3
+
+        # a callback landing while a reconcile reads the table is replayed over its result
+        top_n = IdeaRepository.top_n
+
+        def top_n_racing_a_vote(self, limit):
+            rows = top_n(self, limit)
+            leaderboard.record_vote(leader.model_copy(update={"votes_count": 9}), 99)
+            return rows
+
+        monkeypatch.setattr(IdeaRepository, "top_n", top_n_racing_a_vote)
+        leaderboard.load(db)
+        assert _tracked()[ids[0]] == 9
+
+        # deleted ideas are not brought back by a late vote callback
+        service.delete_idea(ids[1])
+        leaderboard.record_vote(IdeaRead.model_validate({**leader.model_dump(), "id": ids[1]}), 100)
+        assert ids[1] not in _tracked()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core import db as db_module
+from app.core.metrics import metrics
+from app.core.settings import get_settings
+from app.main import app, create_app
+from app.services.ideas import IdeaService
+
+ROUTE = 'method="GET",route="/api/v1/ideas/{idea_id}"'
+
+
+def _scrape(client: TestClient) -> dict[str, float]:
+    res = client.get("/api/v1/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = {}
+    for line in res.text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_requests_are_recorded_per_route_template_with_their_sql():
+    client = TestClient(app)
+    idea_id = client.post("/api/v1/ideas", json={"title": "Measured"}).json()["id"]
+    client.cookies.clear()
+    for _ in range(3):
+        assert client.get(f"/api/v1/ideas/{idea_id}").status_code == 200
+    assert client.get("/api/v1/ideas/999").status_code == 404
+    assert client.get("/nowhere/42").status_code == 404
+
+    samples = _scrape(client)
+    assert samples[f'http_requests_total{{{ROUTE},status="200"}}'] == 3
+    assert samples[f'http_requests_total{{{ROUTE},status="404"}}'] == 1
+    assert samples['http_requests_total{method="GET",route="unmatched",status="404"}'] == 1
+    assert not any("/42" in name or "/999" in name for name in samples)
+
+    # cumulative buckets ending in the request count
+    buckets = [v for k, v in samples.items() if k.startswith(f"http_request_duration_seconds_bucket{{{ROUTE}")]
+    assert buckets == sorted(buckets) and buckets[-1] == 4
+    assert samples[f"http_request_duration_seconds_count{{{ROUTE}}}"] == 4
+    assert samples[f"http_request_duration_seconds_sum{{{ROUTE}}}"] > 0
+
+    # the cached reads ran no SQL; the miss and the 404 did
+    assert samples[f"db_queries_total{{{ROUTE}}}"] == 2
+    assert samples[f"db_query_seconds_total{{{ROUTE}}}"] > 0
+    assert samples['db_queries_total{method="POST",route="/api/v1/ideas"}'] >= 1
+    assert samples["http_requests_in_flight"] == 1  # the scrape itself
+    assert samples["response_cache_hits_total"] == 2
+    assert samples["vote_stream_subscribers"] == 0
+
+
+def test_sql_outside_requests_and_failed_statements():
+    client = TestClient(app)
+    with db_module.SessionLocal() as db:
+        IdeaService(db).create_idea(title="Background", description="")
+    samples = _scrape(client)
+    assert samples['db_queries_total{method="",route="none"}'] >= 1
+
+    # a failing statement leaves the connection's timing stack balanced
+    with db_module.engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+        assert conn.info["query_started"] == []
+    metrics.reset()
+    assert "http_requests_total{" not in "\n".join(metrics.render())
+
+
+def test_async_mode_attributes_sql_to_the_request(monkeypatch):
+    monkeypatch.setenv("DB_MODE", "async")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    with TestClient(create_app()) as client:
+        assert client.post("/api/v1/ideas", json={"title": "Async measured"}).status_code == 201
+        samples = _scrape(client)
+    # run_sync's greenlet still sees the request's context
+    assert samples['db_queries_total{method="POST",route="/api/v1/ideas"}'] >= 1
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core import db as db_module
+from app.core.security import ScryptParams, hash_params, hash_password, needs_rehash, verify_password
+from app.core.settings import get_settings
+from app.main import app
+from app.scripts import bench_login
+from app.models import User
+from app.services.passwords import password_hasher
+
+FAST = ScryptParams(2**10, 8, 1)
+
+
+def _stored_password(username: str) -> str:
+    with db_module.SessionLocal() as db:
+        return db.scalar(select(User.password).where(User.username == username))
+
+
+def test_scrypt_roundtrip_and_legacy_plaintext():
+    stored = hash_password("hunter2", FAST)
+    assert hash_params(stored) == FAST
+    assert verify_password("hunter2", stored)
+    assert not verify_password("hunter3", stored)
+    assert hash_password("hunter2", FAST) != stored  # salted
+    assert not needs_rehash(stored, FAST) and needs_rehash(stored, ScryptParams(2**11, 8, 1))
+
+    assert verify_password("plain", "plain") and not verify_password("plain", "other")
+    assert needs_rehash("plain", FAST)
+
+
+def test_signup_hashes_and_login_verifies_in_pool():
+    client = TestClient(app)
+    created = client.post("/api/v1/users", json={"username": "dana", "password": "s3cret"})
+    assert created.status_code == 200 and "password" not in created.json()
+    assert hash_params(_stored_password("dana")) is not None
+
+    login = client.post("/api/v1/users/login", json={"username": "dana", "password": "s3cret"})
+    assert login.json()["username"] == "dana"
+    assert client.post("/api/v1/users/login", json={"username": "dana", "password": "nope"}).status_code == 401
+    assert client.post("/api/v1/users/login", json={"username": "ghost", "password": "x"}).status_code == 401
+    assert asyncio.run(password_hasher.verify_async("s3cret", _stored_password("dana")))
+    password_hasher.shutdown()
+
+
+def test_login_rehashes_when_cost_changes(monkeypatch):
+    monkeypatch.setenv("PASSWORD_HASH_WORKERS", "0")
+    monkeypatch.setenv("PASSWORD_SCRYPT_N", str(2**10))
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    with db_module.SessionLocal() as db:
+        db.add(User(username="legacy", password="plain-old"))
+        db.commit()
+    client = TestClient(app)
+
+    assert client.post("/api/v1/users/login", json={"username": "legacy", "password": "plain-old"}).status_code == 200
+    assert hash_params(_stored_password("legacy")) == ScryptParams(2**10, 8, 1)
+
+    monkeypatch.setenv("PASSWORD_SCRYPT_N", str(2**11))
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    assert client.post("/api/v1/users/login", json={"username": "legacy", "password": "plain-old"}).status_code == 200
+    assert hash_params(_stored_password("legacy")).n == 2**11
+
+
+def test_bench_login_smoke(monkeypatch):
+    monkeypatch.setenv("PASSWORD_SCRYPT_N", str(2**10))
+    result = bench_login.run_scenario(workers=0, login_threads=1, seconds=0.2)
+    assert result["hashing"] == "inline" and result["logins_per_s"] > 0
+
+
+def test_unknown_username_still_runs_a_verify(monkeypatch):
+    monkeypatch.setenv("PASSWORD_HASH_WORKERS", "0")
+    monkeypatch.setenv("PASSWORD_SCRYPT_N", str(2**10))
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    verified: list[str] = []
+    monkeypatch.setattr(
+        "app.services.passwords.verify_password",
+        lambda password, stored: verified.append(stored) or verify_password(password, stored),
+    )
+    client = TestClient(app)
+    assert client.post("/api/v1/users/login", json={"username": "ghost", "password": "x"}).status_code == 401
+    assert client.post("/api/v1/users/login", json={"username": "ghoul", "password": "y"}).status_code == 401
+    # both checked one fixed dummy hash made with the current cost parameters
+    assert len(verified) == 2 and verified[0] == verified[1]
+    assert hash_params(verified[0]) == ScryptParams(2**10, 8, 1)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core import db as db_module
+from app.core.query_budget import QueryBudget, QueryBudgetExceeded, query_budget
+from app.core.settings import get_settings
+from app.main import app
+from app.models import Idea, Vote, VoteRollup
+from app.repositories import rollups as rollups_module
+from app.repositories.rollups import VoteRollupRepository, current_hour
+
+
+def _budgeted_app() -> FastAPI:
+    router = APIRouter()
+
+    @router.get("/ideas/{count}")
+    @query_budget(2)
+    def one_by_one(count: int, missing: bool = False):
+        with db_module.SessionLocal() as db:
+            for idea_id in range(1, count + 1):
+                db.get(Idea, idea_id)
+        if missing:
+            raise HTTPException(status_code=404, detail="Not found")
+        return {"loaded": count}
+
+    @router.get("/async/{count}")
+    @query_budget(1)
+    async def in_one_query(count: int):
+        with db_module.SessionLocal() as db:
+            db.scalars(select(Idea).where(Idea.id.in_(range(1, count + 1)))).all()
+        return {"loaded": count}
+
+    budgeted = FastAPI()
+    budgeted.include_router(router)
+    return budgeted
+
+
+def test_statements_over_budget_or_in_a_loop_fail_the_request():
+    client = TestClient(_budgeted_app())
+    assert client.get("/ideas/1").json() == {"loaded": 1}
+    assert client.get("/async/50").json() == {"loaded": 50}
+
+    # within the count, but the same statement twice
+    with pytest.raises(QueryBudgetExceeded, match=r"one_by_one: 2x SELECT ideas\.id"):
+        client.get("/ideas/2")
+    with pytest.raises(QueryBudgetExceeded, match="3 statements, budget 2; 3x SELECT"):
+        client.get("/ideas/3")
+    # error responses are held to the budget too
+    assert client.get("/ideas/1", params={"missing": True}).status_code == 404
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/ideas/2", params={"missing": True})
+
+
+def test_log_mode_serves_the_request_and_warns(monkeypatch, caplog):
+    monkeypatch.setenv("QUERY_BUDGET_MODE", "log")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    client = TestClient(_budgeted_app())
+    with caplog.at_level(logging.WARNING, logger="app.core.query_budget"):
+        assert client.get("/ideas/3").status_code == 200
+    assert "query budget exceeded in" in caplog.text and "3 statements, budget 2" in caplog.text
+
+    monkeypatch.setenv("QUERY_BUDGET_MODE", "off")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    caplog.clear()
+    with QueryBudget(0) as budget, db_module.SessionLocal() as db:
+        db.get(Idea, 1)
+    assert budget.statements == [] and not caplog.text
+
+
+def test_nested_budgets_and_constant_statement_writes(monkeypatch):
+    client = TestClient(app)
+    ids = [client.post("/api/v1/ideas", json={"title": f"Idea {n}"}).json()["id"] for n in range(3)]
+    client.post("/api/v1/ideas/votes:batch", json={"votes": [{"idea_id": ids[0], "voter": f"v{n}"} for n in range(30)]})
+
+    # the delete route removes the votes with one statement, within its budget of 4
+    assert client.delete(f"/api/v1/ideas/{ids[0]}").status_code == 204
+    with db_module.SessionLocal() as db:
+        assert db.scalars(select(Vote).where(Vote.idea_id == ids[0])).all() == []
+
+    # without upserts, rollups take a lookup and one executemany per kind of write
+    monkeypatch.setattr(rollups_module, "supports_fast_writes", lambda db: False)
+    hour = current_hour()
+    with QueryBudget(5, max_repeats=2) as outer:
+        with db_module.SessionLocal() as db:
+            repo = VoteRollupRepository(db)
+            with QueryBudget(2, name="first"):
+                repo.record({ids[1]: 1}, hour)
+            with QueryBudget(3, name="second"):
+                repo.record({ids[1]: 2, ids[2]: 1}, hour)
+            db.commit()
+    assert len(outer.statements) == 5
+    with db_module.SessionLocal() as db:
+        assert {(r.idea_id, r.votes) for r in db.scalars(select(VoteRollup))} == {(ids[1], 3), (ids[2], 1)}
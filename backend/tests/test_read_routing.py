@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core import db as db_module
+from app.core.db import READ_PRIMARY_COOKIE, Base, _create_engine
+from app.core.settings import get_settings
+from app.main import app, create_app
+from app.models import Idea
+from app.services.cache import response_cache
+from app.services.leaderboard import leaderboard
+
+
+@pytest.fixture
+def lagging_replica(tmp_path, monkeypatch):
+    """A read engine on a separate, empty database: a replica that has not caught up yet."""
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    Base.metadata.create_all(_create_engine(url))
+    engine = _create_engine(url, read_only=True)
+    monkeypatch.setattr(db_module, "read_engine", engine)
+    monkeypatch.setattr(db_module, "ReadSessionLocal", sessionmaker(bind=engine, class_=Session))
+    monkeypatch.setenv("DATABASE_READ_URL", url)
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    yield engine
+    engine.dispose()
+
+
+def test_reads_go_to_replica_unless_client_just_wrote(lagging_replica):
+    writer = TestClient(app)
+    created = writer.post("/api/v1/ideas", json={"title": "Fresh"})
+    assert READ_PRIMARY_COOKIE in created.cookies
+    idea_id = created.json()["id"]
+
+    # the writer reads its own write from the primary...
+    assert writer.get(f"/api/v1/ideas/{idea_id}").status_code == 200
+    assert writer.get("/api/v1/ideas").json()["total"] == 1
+    # ...while everyone else is served by the (lagging) replica
+    reader = TestClient(app)
+    assert reader.get(f"/api/v1/ideas/{idea_id}").status_code == 404
+    assert reader.get("/api/v1/ideas").json()["items"] == []
+    writer.cookies.clear()
+    assert writer.get(f"/api/v1/ideas/{idea_id}/votes_count").status_code == 404
+
+
+def test_lagging_replica_reads_are_not_cached_or_tagged(lagging_replica, monkeypatch):
+    writer = TestClient(app)
+    writer.post("/api/v1/ideas", json={"title": "Fresh"})
+    reader = TestClient(app)
+    stale = reader.get("/api/v1/ideas")
+    assert stale.json()["items"] == [] and "etag" not in stale.headers
+    assert reader.get("/api/v1/ideas/top").json() == [] and not leaderboard.loaded
+    assert response_cache.stats()["size"] == 0
+
+    # the replica catches up; nothing stale was kept in front of it
+    with Session(_create_engine(str(lagging_replica.url))) as db:
+        db.add(Idea(title="Fresh", description=""))
+        db.commit()
+    assert [i["title"] for i in reader.get("/api/v1/ideas").json()["items"]] == ["Fresh"]
+
+    # past the lag budget, replica reads are cached and tagged again
+    monkeypatch.setenv("READ_YOUR_WRITES_SECONDS", "0")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    fresh = reader.get("/api/v1/ideas")
+    assert "etag" in fresh.headers and response_cache.stats()["size"] == 1
+    assert reader.get("/api/v1/ideas", headers={"If-None-Match": fresh.headers["etag"]}).status_code == 304
+
+
+def test_read_engine_is_query_only(lagging_replica):
+    with lagging_replica.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("INSERT INTO ideas (title, description) VALUES ('x', '')"))
+
+
+def test_async_mode_routes_reads_to_replica(lagging_replica, monkeypatch):
+    monkeypatch.setenv("DB_MODE", "async")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    with TestClient(create_app()) as writer:
+        idea_id = writer.post("/api/v1/ideas", json={"title": "Async fresh"}).json()["id"]
+        assert writer.get(f"/api/v1/ideas/{idea_id}").status_code == 200
+        writer.cookies.clear()
+        assert writer.get(f"/api/v1/ideas/{idea_id}").status_code == 404
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import sqlite3
+
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import make_url
+
+from app.core import db as db_module
+from app.core.settings import get_settings
+from app.main import app, create_app
+
+
+def _configure(monkeypatch, **env: str) -> None:
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+
+
+def test_ready_reports_probe_timings_and_pool_usage():
+    client = TestClient(app)
+    res = client.get("/api/v1/health/ready")
+    assert res.status_code == 200
+    body = res.json()
+    assert body["status"] == "ok" and body["failed"] == []
+    assert body["probe_ms"] >= 0 and body["lock_wait_ms"] >= 0
+    # counted before the probe took its own connection
+    assert body["pool"] == {"size": 5, "max_overflow": 10, "checked_out": 0, "overflow": 0}
+
+
+def test_ready_is_503_when_locked_slow_or_saturated(monkeypatch):
+    client = TestClient(app)
+    _configure(monkeypatch, READY_MAX_LOCK_WAIT_MS="50")
+    holder = sqlite3.connect(make_url(get_settings().DATABASE_URL).database, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    try:
+        res = client.get("/api/v1/health/ready")
+        assert res.status_code == 503
+        assert res.json()["status"] == "unavailable"
+        assert res.json()["failed"] == ["write lock not acquired"]
+        assert 40 <= res.json()["lock_wait_ms"] < 1000
+    finally:
+        holder.execute("ROLLBACK")
+        holder.close()
+    # the probe put the pooled connection's busy_timeout back
+    with db_module.engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+    assert client.get("/api/v1/health/ready").status_code == 200
+
+    _configure(monkeypatch, READY_MAX_PROBE_MS="0")
+    assert client.get("/api/v1/health/ready").json()["failed"] == ["probe took over 0 ms"]
+
+    _configure(monkeypatch, READY_MAX_PROBE_MS="250", READY_MAX_POOL_USAGE="0.2")
+    held = [db_module.engine.connect() for _ in range(3)]
+    try:
+        res = client.get("/api/v1/health/ready")
+        assert res.status_code == 503
+        body = res.json()
+        assert body["failed"] == ["connection pool saturated"] and body["probe_ms"] is None
+        assert body["pool"]["checked_out"] == 3
+    finally:
+        for conn in held:
+            conn.close()
+
+
+def test_ready_probes_the_async_engine(monkeypatch):
+    _configure(monkeypatch, DB_MODE="async")
+    with TestClient(create_app()) as client:
+        res = client.get("/api/v1/health/ready")
+    assert res.status_code == 200
+    assert res.json()["lock_wait_ms"] >= 0 and res.json()["pool"]["size"] == 5
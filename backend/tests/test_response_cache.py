@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.settings import get_settings
+from app.main import app
+from app.repositories.ideas import IdeaRepository
+from app.services.cache import LRUTTLCache, response_cache
+
+
+def no_sql(*args, **kwargs):  # pragma: no cover - must not be reached
+    raise AssertionError("read should be served from the response cache")
+
+
+def custom_backend(settings):
+    return LRUTTLCache(max_entries=2)
+
+
+def test_repeated_reads_skip_sql_until_a_write(monkeypatch):
+    client = TestClient(app)
+    idea = client.post("/api/v1/ideas", json={"title": "Cached"}).json()
+    client.cookies.clear()  # read as another client, outside the read-your-writes window
+    first_list = client.get("/api/v1/ideas", params={"q": "cache"}).json()
+    first_idea = client.get(f"/api/v1/ideas/{idea['id']}").json()
+
+    with monkeypatch.context() as m:
+        m.setattr(IdeaRepository, "get", no_sql)
+        m.setattr(IdeaRepository, "list_paginated", no_sql)
+        assert client.get("/api/v1/ideas", params={"q": "cache"}).json() == first_list
+        assert client.get(f"/api/v1/ideas/{idea['id']}").json() == first_idea
+        assert client.get(f"/api/v1/ideas/{idea['id']}/votes_count").json()["votes_count"] == 0
+    assert client.get("/api/v1/health/cache").json()["hits"] >= 3
+
+    client.post(f"/api/v1/ideas/{idea['id']}/vote", json={"voter": "a"})
+    client.put(f"/api/v1/ideas/{idea['id']}", json={"title": "Cached two"})
+    client.cookies.clear()
+    assert client.get(f"/api/v1/ideas/{idea['id']}").json()["votes_count"] == 1
+    body = client.get("/api/v1/ideas", params={"q": "cache"}).json()
+    assert [(i["title"], i["votes_count"]) for i in body["items"]] == [("Cached two", 1)]
+
+    client.delete(f"/api/v1/ideas/{idea['id']}")
+    client.cookies.clear()
+    assert client.get(f"/api/v1/ideas/{idea['id']}").status_code == 404
+    assert client.get("/api/v1/ideas", params={"q": "cache"}).json()["items"] == []
+
+
+def test_recent_writers_bypass_the_cache(monkeypatch):
+    client = TestClient(app)
+    idea = client.post("/api/v1/ideas", json={"title": "Mine"}).json()  # sets the read-primary cookie
+    client.get(f"/api/v1/ideas/{idea['id']}")
+    assert response_cache.stats()["size"] == 0
+
+
+def test_lru_eviction_and_ttl_expiry():
+    cache = LRUTTLCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") is None
+    cache.set("d", 4, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("d") is None
+    cache.incr("v:list")
+    assert cache.counter("v:list") == 1  # counters are never evicted
+    assert cache.stats() == {
+        "size": 1, "max_entries": 2, "hits": 1, "misses": 2, "evictions": 2, "expirations": 1,
+    }
+
+
+def test_backend_is_pluggable_and_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("RESPONSE_CACHE_BACKEND", "tests.test_response_cache:custom_backend")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    response_cache.reset()
+    assert response_cache.stats()["max_entries"] == 2
+
+    monkeypatch.setenv("RESPONSE_CACHE_BACKEND", "none")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    response_cache.reset()
+    assert response_cache.page("list", (1,), lambda: "loaded") == "loaded"
+    assert response_cache.stats() == {}
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.core import db as db_module
+from app.main import app
+from app.schemas import IdeaBatchResponse, IdeaRead, PaginatedIdeas
+from app.services.ideas import IdeaService
+
+
+def test_fast_responses_match_the_response_models():
+    client = TestClient(app)
+    ids = [
+        client.post("/api/v1/ideas", json={"title": f"Idea {n}", "description": "é ✓"}).json()["id"]
+        for n in range(3)
+    ]
+    client.post(f"/api/v1/ideas/{ids[0]}/vote", json={"voter": "a"})
+    with db_module.SessionLocal() as db:
+        rows = IdeaService(db).get_ideas(ids)
+        expected = [IdeaRead.model_validate(r).model_dump(mode="json") for r in rows]
+
+    page = client.get("/api/v1/ideas", params={"size": 2, "sort": "votes"})
+    assert page.headers["content-type"] == "application/json"
+    assert page.headers["etag"]
+    body = PaginatedIdeas.model_validate(page.json()).model_dump(mode="json")
+    assert body == page.json()
+    assert body["items"] == [expected[0], expected[2]]
+
+    top = client.get("/api/v1/ideas/top", params={"size": 1})
+    assert top.json() == [expected[0]]
+    assert top.headers["x-next-cursor"]
+
+    assert client.get(f"/api/v1/ideas/{ids[1]}").json() == expected[1]
+    batch = client.get("/api/v1/ideas:batch", params={"ids": f"{ids[1]},999"}).json()
+    assert batch == IdeaBatchResponse.model_validate(batch).model_dump(mode="json")
+    assert batch == {"items": [expected[1], None], "missing": [999]}
+
+
+def test_openapi_still_describes_the_response_models():
+    paths = app.openapi()["paths"]
+    schema = paths["/api/v1/ideas"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert {"$ref": "#/components/schemas/PaginatedIdeas"} in schema["anyOf"]
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+
+from app.core.db import _create_engine
+from app.core.settings import STORAGE_PROFILES, get_settings
+from app.scripts import bench_storage
+
+
+def test_profile_pragmas_and_pool_are_applied(tmp_path):
+    profile = STORAGE_PROFILES["durable"]
+    engine = _create_engine(f"sqlite:///{tmp_path / 'p.db'}", profile)
+    try:
+        with engine.connect() as conn:
+            pragma = lambda name: conn.execute(text(f"PRAGMA {name}")).scalar()  # noqa: E731
+            assert pragma("journal_mode") == "wal"
+            assert pragma("synchronous") == 2  # FULL
+            assert pragma("busy_timeout") == profile.busy_timeout_ms
+            assert pragma("cache_size") == profile.cache_size
+        assert engine.pool.size() == profile.pool_size
+    finally:
+        engine.dispose()
+
+
+def test_profile_is_selected_by_setting(monkeypatch):
+    monkeypatch.setenv("STORAGE_PROFILE", "throughput")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    assert get_settings().storage_profile is STORAGE_PROFILES["throughput"]
+    # in-memory databases keep SQLite's singleton pool
+    engine = _create_engine("sqlite://")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 0  # OFF
+    engine.dispose()
+
+
+def test_bench_storage_smoke():
+    result = bench_storage.run_profile("balanced", threads=2, votes=10)
+    assert result["locked_errors"] == 0 and result["votes_per_s"] > 0
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select, update
+
+from app.core import db as db_module
+from app.core.settings import get_settings
+from app.main import app, create_app
+from app.models import Vote, VoteRollup
+from app.repositories.rollups import VoteRollupRepository, current_hour, hour_start
+from app.services.cache import response_cache
+from app.services.totals import totals_cache
+
+
+def _rollups() -> dict[tuple[int, int], int]:
+    with db_module.SessionLocal() as db:
+        return {(r.idea_id, r.hour): r.votes for r in db.scalars(select(VoteRollup))}
+
+
+def test_vote_writes_keep_hourly_rollups_in_step():
+    client = TestClient(app)
+    a = client.post("/api/v1/ideas", json={"title": "Idea A"}).json()["id"]
+    b = client.post("/api/v1/ideas", json={"title": "Idea B"}).json()["id"]
+    client.post(f"/api/v1/ideas/{a}/vote", json={"voter": "x"})
+    client.post(f"/api/v1/ideas/{a}/vote", json={"voter": "y"})
+    client.post(f"/api/v1/ideas/{a}/vote", json={"voter": "x"})  # duplicate: no change
+    client.delete(f"/api/v1/ideas/{a}/vote", params={"voter": "y"})
+    client.post("/api/v1/ideas/votes:batch", json={"votes": [{"idea_id": b, "voter": "x"}, {"idea_id": b, "voter": "y"}]})
+    hour = current_hour()
+    assert _rollups() == {(a, hour): 1, (b, hour): 2}
+
+    # a rebuild from `votes` lands on the same buckets
+    with db_module.SessionLocal() as db:
+        VoteRollupRepository(db).rebuild(hour - 48)
+        db.commit()
+    assert _rollups() == {(a, hour): 1, (b, hour): 2}
+
+    client.delete(f"/api/v1/ideas/{b}")
+    assert _rollups() == {(a, hour): 1}
+
+
+def test_unvote_comes_out_of_the_votes_own_hour():
+    client = TestClient(app)
+    idea_id = client.post("/api/v1/ideas", json={"title": "Unvoted"}).json()["id"]
+    client.post(f"/api/v1/ideas/{idea_id}/vote", json={"voter": "early"})
+    client.post(f"/api/v1/ideas/{idea_id}/vote", json={"voter": "late"})
+    now = current_hour()
+    with db_module.SessionLocal() as db:
+        db.execute(update(Vote).where(Vote.voter == "early").values(created_at=hour_start(now - 30)))
+        VoteRollupRepository(db).rebuild(now - 48)
+        db.commit()
+
+    assert client.delete(f"/api/v1/ideas/{idea_id}/vote", params={"voter": "early"}).status_code == 204
+    counted = {key: votes for key, votes in _rollups().items() if votes}
+    assert counted == {(idea_id, now): 1}
+    with db_module.SessionLocal() as db:
+        VoteRollupRepository(db).rebuild(now - 48)
+        db.commit()
+    assert _rollups() == counted
+
+
+def test_trending_decays_older_buckets_and_ignores_votes_outside_the_window():
+    client = TestClient(app)
+    old, fresh, quiet, ancient = (
+        client.post("/api/v1/ideas", json={"title": t}).json()["id"] for t in ("Old", "Fresh", "Quiet", "Ancient")
+    )
+    now = current_hour()
+    with db_module.SessionLocal() as db:
+        rollups = VoteRollupRepository(db)
+        rollups.record({old: 10}, hour=now - 24)  # 4 half-lives: worth 0.625
+        rollups.record({fresh: 2}, hour=now)
+        rollups.record({ancient: 1000}, hour=now - 100)
+        db.commit()
+
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db_module.engine, "before_cursor_execute", capture)
+    try:
+        body = client.get("/api/v1/ideas", params={"sort": "trending"}).json()
+    finally:
+        event.remove(db_module.engine, "before_cursor_execute", capture)
+    # ties (no recent votes) fall back to newest first
+    assert [item["id"] for item in body["items"]] == [fresh, old, ancient, quiet]
+    assert body["next_cursor"] is None
+    assert not any("FROM votes" in s for s in statements)
+
+    # pages that start in, straddle and follow the scored ideas
+    pages = [
+        [item["id"] for item in client.get("/api/v1/ideas", params={"sort": "trending", **p}).json()["items"]]
+        for p in ({"size": 1, "page": 2}, {"size": 3, "page": 1}, {"size": 2, "page": 2}, {"size": 3, "page": 2})
+    ]
+    assert pages == [[old], [fresh, old, ancient], [ancient, quiet], [quiet]]
+    searched = client.get("/api/v1/ideas", params={"sort": "trending", "q": "old", "fields": "title"}).json()
+    assert searched["items"] == [{"id": old, "title": "Old"}]
+    assert client.get("/api/v1/ideas", params={"sort": "trending", "cursor": "abc"}).status_code == 400
+
+
+def test_trending_page_past_the_scored_ideas_fits_the_list_budget(monkeypatch):
+    client = TestClient(app)
+    ids = [client.post("/api/v1/ideas", json={"title": f"Idea {n}"}).json()["id"] for n in range(10)]
+    for idea_id in ids[:5]:
+        client.post(f"/api/v1/ideas/{idea_id}/vote", json={"voter": "x"})
+    unscored = sorted(ids[5:], reverse=True)
+
+    # cold total: count, scored page (empty), scored count, unscored page under QUERY_BUDGET_MODE=raise
+    body = client.get("/api/v1/ideas", params={"sort": "trending", "size": 3, "page": 3}).json()
+    assert [item["id"] for item in body["items"]] == unscored[1:4]
+    assert body["total"] == 10
+
+    # the async router has the same budget
+    totals_cache.clear()
+    response_cache.reset()
+    monkeypatch.setenv("DB_MODE", "async")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    with TestClient(create_app()) as async_client:
+        body = async_client.get("/api/v1/ideas", params={"sort": "trending", "size": 3, "page": 3}).json()
+    assert [item["id"] for item in body["items"]] == unscored[1:4]
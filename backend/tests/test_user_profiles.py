@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.exc import IntegrityError
+
+from app.core import db as db_module
+from app.core.settings import get_settings
+from app.main import app
+from app.repositories.users import UserProfileRepository
+
+
+def test_profile_endpoints_use_the_main_engine():
+    client = TestClient(app)
+    assert client.post("/api/v1/userCreate", json={"user_id": "42", "first_name": "Ada"}).status_code == 200
+    assert client.post("/api/v1/userCreate", json={"user_id": "42"}).status_code == 400
+
+    profile = client.get("/api/v1/user/42").json()
+    assert (profile["first_name"], profile["vibe"]) == ("Ada", "Stock")
+    updated = client.put("/api/v1/user/modify/42", json={"user_id": "42", "first_name": "Ada", "vibe": "Calm"})
+    assert updated.json() == {"message": "User updated successfully"}
+    assert client.get("/api/v1/user/42").json()["vibe"] == "Calm"
+
+    missing = client.put("/api/v1/user/modify/7", json={"user_id": "7"})
+    assert missing.status_code == 404 and missing.json() == {"detail": "User not found"}
+    assert client.get("/api/v1/user/7").status_code == 404
+
+    # written to the configured database, not a side file
+    with db_module.engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM user_entries")).scalar() == 1
+
+
+def test_profile_lookup_uses_the_user_id_index():
+    with db_module.engine.connect() as conn:
+        plan = conn.execute(text("EXPLAIN QUERY PLAN SELECT * FROM user_entries WHERE user_id = '42'")).all()
+    assert "ux_user_entries_user_id" in " ".join(str(row[-1]) for row in plan)
+
+
+def test_users_batch_returns_request_order_with_misses():
+    client = TestClient(app)
+    for user_id in ("1", "2"):
+        client.post("/api/v1/userCreate", json={"user_id": user_id, "first_name": f"U{user_id}"})
+    body = client.get("/api/v1/users:batch", params={"ids": "2,nobody,1"}).json()
+    assert [p and p["first_name"] for p in body["items"]] == ["U2", None, "U1"]
+    assert body["missing"] == ["nobody"]
+
+
+def test_signup_writes_account_and_profile_in_one_commit(monkeypatch):
+    monkeypatch.setenv("PASSWORD_HASH_WORKERS", "0")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    commits = []
+    event.listen(db_module.engine, "commit", lambda conn: commits.append(1))
+    client = TestClient(app)
+
+    user = client.post("/api/v1/users", json={"username": "erin", "password": "pw"}).json()
+    assert len(commits) == 1
+    assert client.get(f"/api/v1/user/{user['id']}").json()["vibe"] == "Stock"
+
+
+def test_failed_profile_write_rolls_back_the_account(monkeypatch):
+    monkeypatch.setenv("PASSWORD_HASH_WORKERS", "0")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+
+    def broken_create(self, user_id, **fields):
+        raise IntegrityError("INSERT INTO user_entries", {}, Exception("boom"))
+
+    monkeypatch.setattr(UserProfileRepository, "create", broken_create)
+    client = TestClient(app)
+    assert client.post("/api/v1/users", json={"username": "frank", "password": "pw"}).status_code == 400
+    with db_module.engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM users")).scalar() == 0
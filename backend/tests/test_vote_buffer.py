@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import db as db_module
+from app.core.settings import get_settings
+from app.main import app
+from app.services.ideas import VOTE_CREATED, VOTE_DUPLICATE, VOTE_NOT_FOUND, IdeaService, vote_buffer
+from app.services.vote_buffer import VoteBuffer
+
+
+@pytest.fixture
+def buffered(monkeypatch):
+    monkeypatch.setenv("VOTE_BUFFER_ENABLED", "true")
+    monkeypatch.setenv("VOTE_BUFFER_MAX_DELAY_MS", "50")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    yield
+    vote_buffer.stop()
+
+
+def test_buffered_votes_report_per_caller_status(buffered):
+    client = TestClient(app)
+    idea = client.post("/api/v1/ideas", json={"title": "Buffered"}).json()
+
+    def cast(voter):
+        return client.post(f"/api/v1/ideas/{idea['id']}/vote", json={"voter": voter}).status_code
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        codes = list(pool.map(cast, ["a", "b", "c", "a", None, None, "b", "d"]))
+    assert sorted(codes) == [204] * 6 + [409] * 2
+    assert client.post("/api/v1/ideas/999/vote", json={"voter": "a"}).status_code == 404
+    assert client.get(f"/api/v1/ideas/{idea['id']}/votes_count").json()["votes_count"] == 6
+    assert client.get("/api/v1/ideas/top").json()[0]["votes_count"] == 6
+
+
+def test_buffer_batches_and_flushes_on_stop(monkeypatch):
+    monkeypatch.setenv("VOTE_BUFFER_MAX_DELAY_MS", "60000")
+    monkeypatch.setenv("VOTE_BUFFER_MAX_BATCH", "1000")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    batches = []
+
+    def flush(pairs):
+        batches.append(pairs)
+        with db_module.SessionLocal() as db:
+            return IdeaService(db).ingest_votes(pairs)
+
+    with db_module.SessionLocal() as db:
+        idea_id = IdeaService(db).create_idea(title="Stormy", description="").id
+
+    buffer = VoteBuffer(flush)
+    futures = [buffer.submit(idea_id, f"v{n}") for n in range(50)]
+    futures.append(buffer.submit(idea_id, "v0"))
+    futures.append(buffer.submit(idea_id + 1, "v0"))
+    assert not any(f.done() for f in futures)  # still inside the durability window
+    buffer.stop()
+
+    assert len(batches) == 1
+    assert [f.result() for f in futures] == [VOTE_CREATED] * 50 + [VOTE_DUPLICATE, VOTE_NOT_FOUND]
+    with db_module.SessionLocal() as db:
+        assert IdeaService(db).votes_count(idea_id) == 50
+
+
+def test_buffered_duplicate_fails_only_its_own_caller(buffered):
+    client = TestClient(app)
+    idea_id = client.post("/api/v1/ideas", json={"title": "Shared flush"}).json()["id"]
+    assert client.post(f"/api/v1/ideas/{idea_id}/vote", json={"voter": ""}).status_code == 204
+
+    def cast(voter):
+        return voter, client.post(f"/api/v1/ideas/{idea_id}/vote", json={"voter": voter}).status_code
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        codes = dict(pool.map(cast, ["", "alice", "bob"]))
+    assert codes == {"": 409, "alice": 204, "bob": 204}
+    assert client.get(f"/api/v1/ideas/{idea_id}/votes_count").json()["votes_count"] == 3
+
+
+def test_failed_batch_is_retried_vote_by_vote(monkeypatch):
+    monkeypatch.setenv("VOTE_BUFFER_MAX_DELAY_MS", "60000")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    batches = []
+
+    def flush(pairs):
+        batches.append(pairs)
+        if (1, "bad") in pairs:
+            raise RuntimeError("constraint failed")
+        return [VOTE_CREATED] * len(pairs)
+
+    buffer = VoteBuffer(flush)
+    futures = [buffer.submit(1, voter) for voter in ("a", "bad", "b")]
+    buffer.stop()
+    assert futures[0].result() == futures[2].result() == VOTE_CREATED
+    with pytest.raises(RuntimeError):
+        futures[1].result()
+    assert batches == [[(1, "a"), (1, "bad"), (1, "b")], [(1, "a")], [(1, "bad")], [(1, "b")]]
+
+
+
+def test_vote_submitted_while_stopping_is_not_stranded():
+    buffer = VoteBuffer(lambda pairs: [VOTE_CREATED] * len(pairs))
+    assert buffer.submit(1, "a").result(timeout=5) == VOTE_CREATED
+    worker, late = buffer._thread, []
+    join = worker.join
+
+    def join_then_submit(*args):
+        # a vote arriving after the worker exited, before stop() returns
+        join(*args)
+        late.append(buffer.submit(1, "b"))
+
+    worker.join = join_then_submit
+    buffer.stop()
+    buffer.stop()
+    assert late[0].result(timeout=5) == VOTE_CREATED
+
+
+def test_flush_errors_propagate_to_callers():
+    def flush(pairs):
+        raise RuntimeError("database is locked")
+
+    buffer = VoteBuffer(flush)
+    future = buffer.submit(1, "a")
+    with pytest.raises(RuntimeError):
+        future.result(timeout=5)
+    buffer.stop()
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app.core import db as db_module
+from app.core.settings import get_settings
+from app.main import app
+from app.services import vote_stream as vote_stream_module
+from app.services.ideas import IdeaService
+from app.services.vote_stream import vote_stream
+
+
+@pytest.fixture
+def fast_stream(monkeypatch):
+    monkeypatch.setenv("VOTE_STREAM_INTERVAL_MS", "100")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+
+
+def _create(title: str) -> int:
+    with db_module.SessionLocal() as db:
+        return IdeaService(db).create_idea(title=title, description="").id
+
+
+def _cast(idea_id: int, voters) -> None:
+    with db_module.SessionLocal() as db:
+        service = IdeaService(db)
+        for voter in voters:
+            service.vote(idea_id, voter=voter)
+
+
+def _delete(idea_id: int) -> None:
+    with db_module.SessionLocal() as db:
+        IdeaService(db).delete_idea(idea_id)
+
+
+def test_many_idle_subscribers_share_one_coalesced_refresh(fast_stream, monkeypatch):
+    idea_id = _create("Watched")
+    other_id = _create("Unwatched")
+    loads = []
+    real_load = vote_stream_module.load_counts
+
+    def counting_load(ids):
+        loads.append(sorted(ids))
+        return real_load(ids)
+
+    monkeypatch.setattr(vote_stream_module, "load_counts", counting_load)
+
+    async def scenario():
+        subs = [await vote_stream.subscribe(idea_id) for _ in range(5000)]
+        assert loads == [[idea_id]]  # later subscribers reuse the known count
+        assert await vote_stream.subscribe(999) is None
+        loads.clear()
+        streams = [sub.changes() for sub in subs]
+
+        # a burst of votes inside one interval, plus votes on an idea nobody watches
+        await run_in_threadpool(_cast, idea_id, [f"v{n}" for n in range(10)])
+        await run_in_threadpool(_cast, other_id, ["x"])
+        first = await asyncio.gather(*(s.__anext__() for s in streams))
+        assert first == [10] * 5000
+        assert loads == [[idea_id]]
+
+        await run_in_threadpool(_delete, idea_id)
+        for s in streams:
+            with pytest.raises(StopAsyncIteration):
+                await s.__anext__()
+        assert all(sub.deleted for sub in subs)
+        for sub in subs:
+            vote_stream.unsubscribe(sub)
+        assert vote_stream.subscriber_count() == 0
+
+    asyncio.run(scenario())
+
+
+def test_resync_picks_up_votes_from_other_workers(fast_stream, monkeypatch):
+    monkeypatch.setenv("VOTE_STREAM_RESYNC_SECONDS", "0.2")
+    monkeypatch.setenv("VOTE_STREAM_HEARTBEAT_SECONDS", "0.05")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    idea_id = _create("Elsewhere")
+
+    async def scenario():
+        sub = await vote_stream.subscribe(idea_id)
+        stream = sub.changes()
+        assert await stream.__anext__() is None  # heartbeat while idle
+        # another worker's vote: committed, but no event reaches this process
+        with db_module.SessionLocal() as db:
+            db.execute(text("UPDATE ideas SET votes_count = 3 WHERE id = :id"), {"id": idea_id})
+            db.commit()
+        updates = [u async for u in _take_until_count(stream)]
+        assert updates[-1] == 3
+
+    asyncio.run(scenario())
+
+
+async def _take_until_count(stream):
+    async for update in stream:
+        yield update
+        if update is not None:
+            return
+
+
+def test_sse_stream_pushes_counts_until_deleted(fast_stream):
+    client = TestClient(app)
+    idea_id = client.post("/api/v1/ideas", json={"title": "Streamed"}).json()["id"]
+    assert client.get("/api/v1/ideas/999/votes/stream").status_code == 404
+
+    result = {}
+    reader = threading.Thread(target=lambda: result.update(r=client.get(f"/api/v1/ideas/{idea_id}/votes/stream")))
+    reader.start()
+    _wait_for_subscriber(idea_id)
+    client.post(f"/api/v1/ideas/{idea_id}/vote", json={"voter": "a"})
+    time.sleep(0.3)
+    client.delete(f"/api/v1/ideas/{idea_id}")
+    reader.join(timeout=10)
+
+    response = result["r"]
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.split("\n\n")[:3] == [
+        f'event: votes\ndata: {{"idea_id":{idea_id},"votes_count":0}}',
+        f'event: votes\ndata: {{"idea_id":{idea_id},"votes_count":1}}',
+        f'event: deleted\ndata: {{"idea_id":{idea_id}}}',
+    ]
+    assert vote_stream.subscriber_count() == 0
+
+
+def test_websocket_pushes_counts(fast_stream):
+    client = TestClient(app)
+    idea_id = client.post("/api/v1/ideas", json={"title": "Socket"}).json()["id"]
+    with client.websocket_connect(f"/api/v1/ideas/{idea_id}/votes/ws") as ws:
+        assert ws.receive_json() == {"idea_id": idea_id, "votes_count": 0}
+        client.post(f"/api/v1/ideas/{idea_id}/vote", json={"voter": "a"})
+        client.post(f"/api/v1/ideas/{idea_id}/vote", json={"voter": "b"})
+        assert ws.receive_json()["votes_count"] in (1, 2)
+    _wait_for_subscriber(idea_id, expected=0)
+
+
+def _wait_for_subscriber(idea_id: int, expected: int = 1) -> None:
+    deadline = time.monotonic() + 5
+    while vote_stream.subscriber_count(idea_id) != expected:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
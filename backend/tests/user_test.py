@@ -4,7 +4,7 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
-from app.models.models import Base
+from app.core.db import Base
 from get_users import router
 from fastapi import FastAPI
 from app.core.db import get_db
@@ -35,7 +35,7 @@ export type Idea = {
 export type Paginated<T> = { items: T[]; total: number; page: number; size: number }
 
 export const Ideas = {
-  list(params: { page?: number; size?: number; q?: string; sort?: 'created_at' | 'votes'; order?: 'asc' | 'desc' } = {}) {
+  list(params: { page?: number; size?: number; q?: string; sort?: 'created_at' | 'votes' | 'trending'; order?: 'asc' | 'desc' } = {}) {
     const qs = new URLSearchParams()
     if (params.page) qs.set('page', String(params.page))
     if (params.size) qs.set('size', String(params.size))
@@ -51,6 +51,10 @@ export const Ideas = {
   get(id: number) {
     return fetchJson<Idea>(`/api/v1/ideas/${id}`)
   },
+  getMany(ids: number[]) {
+    // one request for many ideas; items follow `ids`, with null for ideas that do not exist
+    return fetchJson<{ items: (Idea | null)[]; missing: number[] }>(`/api/v1/ideas:batch?ids=${ids.join(',')}`)
+  },
   update(id: number, payload: Partial<{ title: string; description: string }>) {
     return fetchJson<Idea>(`/api/v1/ideas/${id}`, { method: 'PUT', body: JSON.stringify(payload) })
   },
@@ -63,6 +67,16 @@ export const Ideas = {
   votesCount(id: number) {
     return fetchJson<{ idea_id: number; votes_count: number }>(`/api/v1/ideas/${id}/votes_count`)
   },
+  // Live count over server-sent events instead of polling votesCount; returns a function that closes the stream.
+  watchVotes(id: number, onCount: (votesCount: number) => void, onDeleted?: () => void) {
+    const source = new EventSource(`${baseURL}/api/v1/ideas/${id}/votes/stream`)
+    source.addEventListener('votes', (e) => onCount(JSON.parse((e as MessageEvent).data).votes_count))
+    source.addEventListener('deleted', () => {
+      source.close()
+      onDeleted?.()
+    })
+    return () => source.close()
+  },
   top(params: { page?: number; size?: number } = {}) {
     const qs = new URLSearchParams()
     if (params.page) qs.set('page', String(params.page))
@@ -75,7 +89,6 @@ export const Ideas = {
 export type User = {
   id: number
   username: string
-  password: string
 }
 
 export type UserInfo = {
@@ -96,9 +109,23 @@ export const Users = {
   create(payload: { username: string; password: string }) {
     return fetchJson<User>(`/api/v1/users`, { method: 'POST', body: JSON.stringify(payload) })
   },
+  async login(username: string, password: string) {
+    // the server verifies the password; null means unknown username or wrong password
+    try {
+      return await fetchJson<User>(`/api/v1/users/login`, { method: 'POST', body: JSON.stringify({ username, password }) })
+    } catch (error) {
+      if (error instanceof HttpError && error.status === 401) return null
+      throw error
+    }
+  },
   getUserInfo(userId: string) {
     return fetchJson<UserInfo>(`/api/v1/user/${userId}`)
   },
+  getUserInfos(userIds: string[]) {
+    const qs = new URLSearchParams()
+    userIds.forEach((id) => qs.append('ids', id))
+    return fetchJson<{ items: (UserInfo | null)[]; missing: string[] }>(`/api/v1/users:batch?${qs.toString()}`)
+  },
   updateUser(userId: string, payload: UserInfo) {
     return fetchJson<{ message: string }>(`/api/v1/user/modify/${userId}`, { 
       method: 'PUT', 
@@ -15,7 +15,7 @@ export function App() {
   const [title, setTitle] = useState('')
   const [description, setDescription] = useState('')
   const [state, setState] = useState<State>({ status: 'loading' })
-  const [sort, setSort] = useState<'created_at' | 'votes'>('created_at')
+  const [sort, setSort] = useState<'created_at' | 'votes' | 'trending'>('created_at')
   const [order, setOrder] = useState<'asc' | 'desc'>('desc')
 
   async function load() {
@@ -128,6 +128,7 @@ export function App() {
         <select value={sort} onChange={(e) => setSort(e.target.value as any)} className="border rounded px-2 py-2">
           <option value="created_at">Newest</option>
           <option value="votes">Most voted</option>
+          <option value="trending">Trending</option>
         </select>
         <select value={order} onChange={(e) => setOrder(e.target.value as any)} className="border rounded px-2 py-2">
           <option value="desc">Desc</option>
@@ -53,9 +53,9 @@ export function SignUp() {
         e.preventDefault();
 
         try {
-            // Call backend to get user by username
-            const user = await Users.getByUsername(login_username);
-            if (user && user.password === login_password) {
+            // The backend checks the password against its stored hash
+            const user = await Users.login(login_username, login_password);
+            if (user) {
                 navigate(`/user-info?id=${user.id}`);
             } else {
                 alert('username or password not found');
@@ -10,8 +10,8 @@ import { TestWrapper } from './TestWrapper'
 // Mock the Users API
 vi.mock('../api/client', () => ({
     Users: {
-        getByUsername: vi.fn(),
-        create: vi.fn().mockResolvedValue({ username: 'test', password: 'test' })
+        login: vi.fn(),
+        create: vi.fn().mockResolvedValue({ id: 1, username: 'test' })
     }
 }))
 
@@ -40,10 +40,10 @@ describe('sign up', () => {
 
     test('can sign up and then log in to reach Crowd Ideas', async () => {
         // Mock create to return the new user
-        (Users.create as any).mockResolvedValue({ username: 'newuser', password: 'newpass' }); 
+        (Users.create as any).mockResolvedValue({ id: 1, username: 'newuser' }); 
         
-        // Mock getByUsername to return null first (user doesn't exist), then return the user after signup
-        (Users.getByUsername as any).mockResolvedValue({ username: 'newuser', password: 'newpass' })
+        // Mock login to accept the new credentials
+        (Users.login as any).mockResolvedValue({ id: 1, username: 'newuser' })
 
         const user = userEvent.setup()
 
@@ -86,8 +86,8 @@ describe('sign up', () => {
     })
 
     test('shows alert when logging in with unknown credentials', async () => {
-        // Mock getByUsername to return null (user doesn't exist)
-        (Users.getByUsername as any).mockResolvedValue(null)
+        // Mock login to reject (user doesn't exist)
+        (Users.login as any).mockResolvedValue(null)
 
         const user = userEvent.setup()
         const alertSpy = vi.spyOn(window, 'alert').mockImplementation(() => {})
@@ -119,8 +119,8 @@ describe('sign up', () => {
     })
 
     test('shows alert when logging in with wrong password', async () => {
-        // Mock getByUsername to return user with different password
-        (Users.getByUsername as any).mockResolvedValue({ username: 'existinguser', password: 'correctpass' })
+        // Mock login to reject (wrong password)
+        (Users.login as any).mockResolvedValue(null)
 
         const user = userEvent.setup()
         const alertSpy = vi.spyOn(window, 'alert').mockImplementation(() => {})